@@ -0,0 +1,139 @@
+"""Benchmark log extraction on plain and compressed copies of one generated log.
+
+For each format the line parser (parse_log_lines over decoded text) and the
+bytes parser (parse_log_file: mmap for plain logs, chunked decompression
+for .gz/.bz2/.xz) are timed, best of --repeat runs, and the bytes read from
+disk are reported. Plain logs are memory-mapped, so the bytes parser reads
+the whole file.
+
+    python scripts/bench_extract.py --rows 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import BinaryIO, Callable, List, Tuple
+
+# Allow imports from src.* when run from any folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import extract
+
+SERVICES = ["AUTO TEST"] + [f"Service {chr(65 + i)}" for i in range(23)]
+
+
+class _CountingReader(io.RawIOBase):
+    """Read-only file wrapper that counts the bytes read through it."""
+
+    def __init__(self, raw: BinaryIO) -> None:
+        self.raw = raw
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: bytearray) -> int:
+        count = self.raw.readinto(buffer)
+        self.bytes_read += count or 0
+        return count
+
+    def close(self) -> None:
+        self.raw.close()
+        super().close()
+
+
+def write_log(fp: Path, rows: int, seed: int = 1) -> None:
+    """Write a loading log with ``rows`` samples and some non-matching lines."""
+    rng = random.Random(seed)
+    with fp.open("w", encoding="utf-8", newline="\n") as fh:
+        for i in range(rows):
+            hours, rest = divmod(i // 1000 % 86_400, 3600)
+            stamp = f"{hours:02d}:{rest // 60:02d}:{rest % 60:02d}.{i % 1000:03d}"
+            if i % 10 == 0:
+                fh.write(f"{stamp}  [INFO] Session heartbeat, queue depth {rng.randint(0, 9)}\n")
+            service = SERVICES[i % len(SERVICES)]
+            fh.write(f"{stamp}  {service}  - loading_time: {rng.randint(50, 5000)} ms\n")
+
+
+def _open_counted(fp: Path) -> Tuple[BinaryIO, _CountingReader]:
+    """Open fp (decompressing it if needed) and return it with its counter."""
+    counter = _CountingReader(fp.open("rb"))
+    opener = extract.COMPRESSED_OPENERS.get(fp.suffix.lower())
+    stream = opener(counter, "rb") if opener is not None else io.BufferedReader(counter)
+    return stream, counter
+
+
+def parse_lines(fp: Path) -> Tuple[List[extract.Entry], int]:
+    stream, counter = _open_counted(fp)
+    with io.TextIOWrapper(stream, encoding="utf-8", errors="ignore") as text:
+        entries = extract.parse_log_lines(text)
+    return entries, counter.bytes_read
+
+
+def parse_bytes(fp: Path) -> Tuple[List[extract.Entry], int]:
+    if not extract.is_compressed(fp):
+        entries, _ = extract.parse_log_file(fp)
+        return entries, fp.stat().st_size
+    stream, counter = _open_counted(fp)
+    with stream:
+        entries, _ = extract._parse_log_stream(stream)
+    return entries, counter.bytes_read
+
+
+def _best_of(
+    parse: Callable[[Path], Tuple[List[extract.Entry], int]], fp: Path, repeat: int
+) -> Tuple[float, int, List[extract.Entry]]:
+    """(best wall time in s, bytes read, entries) over ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        entries, bytes_read = parse(fp)
+        best = min(best, time.perf_counter() - start)
+    return best, bytes_read, entries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark plain and compressed log extraction")
+    parser.add_argument(
+        "--rows", type=int, default=500_000, help="Samples in the log (default: 500000)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per measurement, the best is kept (default: 3)"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="spm-bench-") as tmp:
+        plain = Path(tmp) / "bench_loading.log"
+        write_log(plain, args.rows)
+        data = plain.read_bytes()
+        files = [plain]
+        for suffix, opener in extract.COMPRESSED_OPENERS.items():
+            compressed = plain.with_name(plain.name + suffix)
+            with opener(compressed, "wb") as fh:
+                fh.write(data)
+            files.append(compressed)
+
+        expected = extract.parse_log_file(plain)[0]
+        print(f"{args.rows} rows, {len(data) / 2**20:.1f} MiB plain, best of {args.repeat}")
+        print(f"{'file':<24} {'parser':<6} {'MiB read':>9} {'wall s':>7} {'rows/s':>10}")
+        for fp in files:
+            for name, parse in (("lines", parse_lines), ("bytes", parse_bytes)):
+                wall, bytes_read, entries = _best_of(parse, fp, args.repeat)
+                if entries != expected:
+                    print(f"{fp.name}: {name} parser returned different entries")
+                    return 1
+                print(
+                    f"{fp.name:<24} {name:<6} {bytes_read / 2**20:>9.1f} "
+                    f"{wall:>7.2f} {len(entries) / wall:>10,.0f}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
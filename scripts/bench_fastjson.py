@@ -0,0 +1,129 @@
+"""Benchmark the dashboard JSON responses on a generated many-version dataset.
+
+Generates --versions versions x 24 services of loading logs, runs generate
+on them and then, for /api/dashboard, /api/csv and /analytics/bardata,
+times encoding the response payload with Flask's jsonify, with
+fastjson's json module fallback and with fastjson on orjson, as well as
+the whole request with and without orjson (best of --repeat, warm model
+cache).
+
+    python scripts/bench_fastjson.py --versions 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable
+
+# Allow imports from spm and src.* when run from any folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from spm import generate_reports
+from src import fastjson, webapp
+
+SERVICES = ["AUTO TEST"] + [f"Service {chr(65 + i)}" for i in range(23)]
+URLS = {
+    "/api/dashboard": "/api/dashboard?dataset=data",
+    "/api/csv summary_stats.csv": "/api/csv?dataset=data&file=summary_stats.csv",
+    "/api/csv summary.csv, 1 service": "/api/csv?dataset=data&file=summary.csv&service=Service%20C",
+    "/analytics/bardata": "/analytics/bardata?dataset=data",
+}
+
+
+def write_data_folder(data_root: Path, versions: int, runs: int, seed: int = 2) -> None:
+    """Write one loading log per version with ``runs`` samples per service."""
+    rng = random.Random(seed)
+    for n in range(versions):
+        log_dir = data_root / f"InQuire_3.{n // 100}.{n % 100}" / "PerformanceLog"
+        log_dir.mkdir(parents=True)
+        lines = [
+            f"10:{i // 60 % 60:02d}:{i % 60:02d}.000  {service}  - "
+            f"loading_time: {rng.randint(50, 5000)} ms"
+            for i in range(runs)
+            for service in SERVICES
+        ]
+        (log_dir / "run000_loading.log").write_text("\n".join(lines), encoding="utf-8")
+
+
+def _best_ms(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the JSON API responses")
+    parser.add_argument("--versions", type=int, default=200, help="Versions (default: 200)")
+    parser.add_argument(
+        "--runs", type=int, default=200, help="Samples per service and version (default: 200)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=15,
+        help="Runs per measurement, the best is kept (default: 15)",
+    )
+    args = parser.parse_args()
+    if fastjson.orjson is None:
+        print("orjson is not installed; only the json module fallback can be measured")
+    orjson_module = fastjson.orjson
+
+    with tempfile.TemporaryDirectory(prefix="spm-bench-") as tmp:
+        data_root = Path(tmp) / "data"
+        result_base = Path(tmp) / "result"
+        write_data_folder(data_root, args.versions, args.runs)
+        with redirect_stdout(io.StringIO()):
+            stats = generate_reports(data_root, result_base / "data")
+        webapp.configure_result_dirs(result_base / "data", result_base, "data")
+        client = webapp.app.test_client()
+        print(
+            f"{args.versions} versions x {len(SERVICES)} services "
+            f"({stats['total_rows']} samples), best of {args.repeat}, times in ms"
+        )
+        print(
+            f"{'endpoint':<33} {'KB':>6} {'jsonify':>8} {'json':>7} {'orjson':>7} "
+            f"{'request json':>13} {'request orjson':>15}"
+        )
+        for name, url in URLS.items():
+            response = client.get(url)
+            if response.status_code != 200:
+                print(f"{url}: HTTP {response.status_code}")
+                return 1
+            payload = json.loads(response.data)
+            with webapp.app.app_context():
+                jsonify_ms = _best_ms(lambda: webapp.jsonify(payload).get_data(), args.repeat)
+            timings = {}
+            for label, module in (("json", None), ("orjson", orjson_module)):
+                if label == "orjson" and module is None:
+                    continue
+                fastjson.orjson = module
+                if json.loads(fastjson.dumps(payload)) != payload:
+                    print(f"{url}: {label} encoding does not round-trip")
+                    return 1
+                timings[label] = (
+                    _best_ms(lambda: fastjson.dumps(payload), args.repeat),
+                    _best_ms(lambda: client.get(url).get_data(), args.repeat),
+                )
+            fastjson.orjson = orjson_module
+            encode_orjson, request_orjson = timings.get("orjson", (float("nan"),) * 2)
+            print(
+                f"{name:<33} {len(response.data) / 1024:>6.0f} {jsonify_ms:>8.1f} "
+                f"{timings['json'][0]:>7.1f} {encode_orjson:>7.1f} "
+                f"{timings['json'][1]:>13.1f} {request_orjson:>15.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,17 +2,32 @@ from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
+import io
+import json
 import os
 import shutil
-import subprocess
 import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import redirect_stdout
 from pathlib import Path
 from typing import Dict, Iterable, List, Tuple
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
 
 BASE_DIR = Path(__file__).resolve().parent
 DEFAULT_DATA_DIR = BASE_DIR / "data"
 DEFAULT_RESULT_DIR = BASE_DIR / "result"
+DEFAULT_STORE_DIR = BASE_DIR / ".blobstore"
+
+# Mixed into every stage fingerprint; bump when stage outputs change format
+PIPELINE_VERSION = 2
 
 
 def result_root_for_data(data_root: Path) -> Path:
@@ -24,7 +39,17 @@ def result_root_for_data(data_root: Path) -> Path:
 sys.path.insert(0, str(BASE_DIR))
 
 try:
-    from src import extract
+    from src import (
+        blobstore,
+        discover,
+        distributions,
+        extract,
+        report,
+        samplearrays,
+        sampledb,
+        sketch,
+    )
+    from src.manifest import cache_root, load_manifest, save_manifest
 except ModuleNotFoundError as exc:  # pragma: no cover - import guard
     raise SystemExit(f"Failed to import project modules: {exc}") from exc
 
@@ -46,85 +71,71 @@ def clean_results(result_dir: Path) -> None:
 
 def _collect_log_dirs(data_root: Path) -> List[Tuple[str, Path]]:
     """Return list of (dataset_name, log_dir) pairs under the data root."""
-    datasets: List[Tuple[str, Path]] = []
     if not data_root.exists():
         print(f"[generate] Data folder not found: {data_root}")
         return []
-
-    for candidate in sorted(data_root.iterdir()):
-        if not candidate.is_dir():
-            continue
-        # Prefer a direct PerformanceLog folder, but fall back to any child match
-        log_dir = candidate / "PerformanceLog"
-        if log_dir.is_dir():
-            datasets.append((candidate.name, log_dir))
-            continue
-        matching = list(candidate.rglob("PerformanceLog"))
-        if matching:
-            datasets.append((candidate.name, matching[0]))
-    return datasets
-
-
-def _determine_pattern(log_dir: Path) -> str:
-    """Pick a glob pattern for log files, skipping login logs when possible."""
-    loading_logs = list(log_dir.glob("*loading.log"))
-    if loading_logs:
-        return "*loading.log"
-    return "*.log"
+    index, _ = discover.build_index(data_root)
+    return [
+        (name, discover.record_log_dir(data_root, record))
+        for name, record in index["versions"].items()
+    ]
+
+
+def _load_version_summary(csv_path: Path) -> Dict[str, array]:
+    """Read a per-version summary.csv into {service: values}."""
+    values: Dict[str, array] = {}
+    if not csv_path.exists():
+        print(f"[generate] Skipping missing summary: {csv_path}")
+        return values
+    with csv_path.open("r", encoding="utf-8", newline="") as fh:
+        reader = csv.reader(fh)
+        header = next(reader, None)
+        if not header or header[0] != "service":
+            print(f"[generate] Invalid summary header in {csv_path}")
+            return values
+        for row in reader:
+            if len(row) < 2:
+                continue
+            service = row[0].strip()
+            try:
+                value = int(row[1])
+            except (TypeError, ValueError):
+                continue
+            if service not in values:
+                values[service] = array("q")
+            values[service].append(value)
+    return values
 
 
-def _combine_summaries(summary_map: Dict[str, Path], output_path: Path) -> None:
-    """Combine per-dataset summaries into result/summary.csv."""
-    if not summary_map:
+def _combine_summaries(samples: Dict[str, Dict[str, array]], output_path: Path) -> None:
+    """Write per-version samples side by side into result/summary.csv."""
+    if not samples:
         print("[generate] No summaries to combine")
         return
 
+    datasets = sorted(samples.keys())
     service_order: List[str] = []
     seen_services: set[str] = set()
-    per_dataset_values: Dict[str, Dict[str, List[int]]] = {}
-
-    for dataset in sorted(summary_map.keys()):
-        csv_path = summary_map[dataset]
-        per_dataset_values[dataset] = {}
-        if not csv_path.exists():
-            print(f"[generate] Skipping missing summary: {csv_path}")
-            continue
-        with csv_path.open("r", encoding="utf-8", newline="") as fh:
-            reader = csv.reader(fh)
-            header = next(reader, None)
-            if not header or header[0] != "service":
-                print(f"[generate] Invalid summary header in {csv_path}")
-                continue
-            for row in reader:
-                if len(row) < 2:
-                    continue
-                service = row[0].strip()
-                try:
-                    value = int(row[1])
-                except (TypeError, ValueError):
-                    continue
-                if service not in per_dataset_values[dataset]:
-                    per_dataset_values[dataset][service] = []
-                per_dataset_values[dataset][service].append(value)
-                if service not in seen_services:
-                    service_order.append(service)
-                    seen_services.add(service)
+    for dataset in datasets:
+        for service in samples[dataset]:
+            if service not in seen_services:
+                service_order.append(service)
+                seen_services.add(service)
 
     if not service_order:
         print("[generate] No service rows collected; skip combined summary")
         return
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    datasets = sorted(per_dataset_values.keys())
 
     with output_path.open("w", encoding="utf-8", newline="") as fh:
         writer = csv.writer(fh)
         writer.writerow(["service", *datasets])
         for service in service_order:
             max_rows = 0
-            per_service_rows: List[List[int]] = []
+            per_service_rows: List[array] = []
             for dataset in datasets:
-                values = per_dataset_values[dataset].get(service, [])
+                values = samples[dataset].get(service, ())
                 per_service_rows.append(values)
                 max_rows = max(max_rows, len(values))
             for idx in range(max_rows):
@@ -136,99 +147,596 @@ def _combine_summaries(summary_map: Dict[str, Path], output_path: Path) -> None:
     print(f"[generate] Wrote combined summary to {output_path}")
 
 
-def generate_reports(data_root: Path, result_root: Path) -> None:
-    """Parse logs under data_root and produce CSV summaries in result_root."""
-    result_root.mkdir(parents=True, exist_ok=True)
+def _fingerprint(*parts: object) -> str:
+    """Return a stable hash of JSON-serialisable stage inputs."""
+    payload = json.dumps([PIPELINE_VERSION, *parts], sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
 
-    summary_marker = result_root / "summary.csv"
-    if summary_marker.exists():
+
+def _describe_input_changes(
+    files: List[Path], listing: List[List[object]], file_cache: Dict[str, Dict[str, object]]
+) -> str:
+    """Summarise how a version's log files differ from the cached parse."""
+    added = modified = 0
+    for fp, (_, size, mtime_ns) in zip(files, listing):
+        entry = file_cache.get(extract.ParseCache.key(fp))
+        if entry is None:
+            added += 1
+            continue
+        if entry.get("size") != size or entry.get("mtime_ns") != mtime_ns:
+            modified += 1
+    parts = [f"{added} added" if added else "", f"{modified} modified" if modified else ""]
+    detail = ", ".join(part for part in parts if part)
+    return f"inputs changed: {detail}" if detail else "inputs changed"
+
+
+def _stage_reason(record: Dict[str, object] | None, fingerprint: str, outputs: List[Path]) -> str | None:
+    """Return why a stage must run, or None when it is up to date."""
+    if record is None:
+        return "never built"
+    if record.get("fingerprint") != fingerprint:
+        return "inputs changed"
+    missing = [p.name for p in outputs if not p.exists()]
+    if missing:
+        return f"output missing ({', '.join(missing)})"
+    return None
+
+
+def _blob_digests(data_root: Path, listed: List[Tuple[Path, int, int]]) -> Dict[Path, str]:
+    """Return content digests of listed log files that live in the blob store."""
+    roots = [data_root]
+    overlay = discover.load_overlay(data_root)
+    if overlay:
+        roots += [Path(source) for source in overlay["sources"]]
+    digests: Dict[Path, str] = {}
+    for root in roots:
+        digests.update(blobstore.known_digests(root, listed))
+    return digests
+
+
+def store_data_folder(data_root: Path, jobs: int | None = None) -> Dict[str, int]:
+    """Move a data folder's log files into the shared blob store."""
+    index, _ = discover.build_index(data_root)
+    files: List[Path] = []
+    for record in index["versions"].values():
+        if record.get("origins"):
+            continue  # overlay layers are stored from their own folders
+        log_dir = data_root / record["log_dir"]
+        files.extend(log_dir / name for name, *_ in record["files"])
+    counts = blobstore.ingest(blobstore.BlobStore(DEFAULT_STORE_DIR), data_root, files, jobs)
+    print(
+        f"[store] {data_root.name}: {len(files)} log files "
+        f"(new={counts['stored']}, deduplicated={counts['deduplicated']}, "
+        f"saved={counts['bytes_saved']} bytes)"
+    )
+    if counts["unlinked"]:
         print(
-            f"[generate] Existing outputs detected for '{data_root.name}' at {result_root}; "
-            "reusing previous artifacts for charts"
+            f"[store] {counts['unlinked']} files could not be linked into "
+            f"{DEFAULT_STORE_DIR}; only their parse results are shared"
         )
-        return
+    return counts
+
+
+# Files written per version by the extract stage
+VERSION_OUTPUTS = ("summary.csv", extract.RUNS_FILENAME, "rollup_runs.csv", "rollup_5min.csv")
 
-    datasets = _collect_log_dirs(data_root)
-    if not datasets:
+
+def _remove_version_output(result_root: Path, dataset_name: str) -> None:
+    version_dir = result_root / dataset_name
+    for name in VERSION_OUTPUTS:
+        (version_dir / name).unlink(missing_ok=True)
+    try:
+        version_dir.rmdir()
+    except OSError:
+        pass
+
+
+def generate_reports(
+    data_root: Path,
+    result_root: Path,
+    jobs: int | None = None,
+    dry_run: bool = False,
+    sqlite: bool = False,
+) -> Dict[str, int]:
+    """Parse logs under data_root and produce CSV summaries in result_root.
+
+    Generation runs as stages (discover, extract per version, combine,
+    report). Each stage records a fingerprint of its inputs in the dataset
+    manifest and is only rebuilt when that fingerprint changes or its outputs
+    are missing. ``jobs`` is the number of log parser processes (default: CPU
+    count); ``dry_run`` only reports which stages are stale. ``sqlite`` also
+    writes the indexed samples.db, which is then kept up to date by later runs.
+
+    Returns run counters: "versions" found, log "files" and "rows" handled by
+    rebuilt versions, and "total_rows" across all versions.
+    """
+    run_stats = {"versions": 0, "files": 0, "rows": 0, "total_rows": 0}
+    prefix = "[generate] (dry run)" if dry_run else "[generate]"
+    arrays_dir = result_root / samplearrays.SAMPLE_ARRAYS_DIR
+    sketches_path = result_root / sketch.SKETCHES_FILENAME
+    combine_outputs = [result_root / "summary.csv", arrays_dir, sketches_path]
+    if report.pa is not None:
+        combine_outputs.append(result_root / report.SAMPLES_TABLE)
+    db_path = result_root / sampledb.SAMPLES_DB
+    if sqlite or db_path.exists():
+        combine_outputs.append(db_path)
+    distributions_path = result_root / distributions.DISTRIBUTIONS_FILENAME
+    report_outputs = [
+        result_root / "summary_stats.csv",
+        result_root / "service_stats.csv",
+        distributions_path,
+    ]
+    manifest = load_manifest(result_root)
+    stages: Dict[str, object] = manifest.setdefault("stages", {})
+    extract_records: Dict[str, Dict[str, object]] = stages.setdefault("extract", {})
+    file_cache: Dict[str, Dict[str, object]] = manifest.get("files", {})
+
+    # Stage 1: discover version folders and their log files
+    if not data_root.exists():
+        print(f"[generate] Data folder not found: {data_root}")
+        return run_stats
+    index, reused = discover.build_index(data_root, manifest.get("discovery"))
+    versions: Dict[str, Dict[str, object]] = index["versions"]
+    if not versions:
         print(f"[generate] No PerformanceLog folders found under {data_root}")
-        return
+        return run_stats
+    run_stats["versions"] = len(versions)
+    detail = f" ({reused} unchanged since last scan)" if reused else ""
+    print(f"{prefix} discover: {len(versions)} version folders under {data_root}{detail}")
+
+    # Stage 2: extract per version
+    plan: List[Tuple[str, Path, str, List[Path], str, str | None]] = []
+    listed: List[Tuple[Path, int, int]] = []
+    for dataset_name, version_record in versions.items():
+        log_dir, pattern, files, listing = discover.select_inputs(data_root, version_record)
+        listed.extend((fp, size, mtime_ns) for fp, (_, size, mtime_ns) in zip(files, listing))
+        fingerprint = _fingerprint("extract", pattern, listing)
+        out_path = result_root / dataset_name / "summary.csv"
+        record = extract_records.get(dataset_name)
+        outputs = (
+            [out_path.with_name(name) for name in VERSION_OUTPUTS]
+            if record and record.get("rows")
+            else []
+        )
+        reason = _stage_reason(record, fingerprint, outputs)
+        if reason == "inputs changed":
+            reason = _describe_input_changes(files, listing, file_cache)
+        plan.append((dataset_name, log_dir, pattern, files, fingerprint, reason))
+
+    current = {name for name, *_ in plan}
+    removed = sorted(name for name in extract_records if name not in current)
+
+    if dry_run:
+        for dataset_name, _, _, files, _, reason in plan:
+            state = f"stale ({reason})" if reason else "up to date"
+            print(f"{prefix} extract {dataset_name}: {state} [{len(files)} files]")
+        for dataset_name in removed:
+            print(f"{prefix} extract {dataset_name}: version removed; output will be deleted")
+        if removed or any(reason for *_, reason in plan):
+            print(f"{prefix} combine: stale (upstream stages are stale)")
+            print(f"{prefix} report: stale (upstream stages are stale)")
+            return run_stats
+        built = [name for name, *_ in plan if extract_records[name].get("rows")]
+        combine_fingerprint = _fingerprint(
+            "combine", sorted((name, extract_records[name]["fingerprint"]) for name in built)
+        )
+        for stage, fingerprint, outputs in (
+            ("combine", combine_fingerprint, combine_outputs),
+            ("report", _fingerprint("report", combine_fingerprint), report_outputs),
+        ):
+            reason = _stage_reason(stages.get(stage), fingerprint, outputs)
+            state = f"stale ({reason})" if reason else "up to date"
+            print(f"{prefix} {stage}: {state}")
+        return run_stats
 
-    summary_paths: Dict[str, Path] = {}
-    total_rows = 0
+    result_root.mkdir(parents=True, exist_ok=True)
+    parse_cache = extract.ParseCache(
+        cache_root(result_root) / "fragments",
+        file_cache,
+        shared_dir=blobstore.BlobStore(DEFAULT_STORE_DIR).parsed_dir,
+        blobs=_blob_digests(data_root, listed),
+    )
 
-    for dataset_name, log_dir in datasets:
-        if not log_dir.exists():
-            continue
-        pattern = _determine_pattern(log_dir)
+    for dataset_name in removed:
+        _remove_version_output(result_root, dataset_name)
+        del extract_records[dataset_name]
+        print(f"[generate] {dataset_name}: version removed; deleted its summary")
+
+    # Samples of rebuilt versions stay in memory for the combine/report stages
+    samples: Dict[str, Dict[str, array]] = {}
+    for dataset_name, log_dir, pattern, files, fingerprint, reason in plan:
         out_path = result_root / dataset_name / "summary.csv"
+        if reason is None:
+            # Keep cache entries of untouched versions
+            for fp in files:
+                parse_cache.record(fp, file_cache.get(extract.ParseCache.key(fp)))
+            print(f"[generate] {dataset_name}: up to date ({extract_records[dataset_name]['rows']} rows)")
+            continue
+
+        print(f"[generate] {dataset_name}: rebuilding ({reason})")
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        rows = extract.process_dir(log_dir, pattern, out_path=out_path)
+        parse_stats: Dict[str, int] = {}
+        version_samples: Dict[str, array] = {}
+        version_detail: Dict[str, Tuple[array, array]] = {}
+        shared_before = parse_cache.shared
+        rows = extract.process_dir(
+            log_dir,
+            pattern,
+            out_path=out_path,
+            jobs=jobs,
+            stats=parse_stats,
+            cache=parse_cache,
+            files=files,
+            samples=version_samples,
+            detail=version_detail,
+        )
+        if parse_stats.get("cached"):
+            print(
+                f"[generate] {dataset_name}: reused {parse_stats['cached']} of "
+                f"{parse_stats['files']} unchanged log files"
+            )
+        if parse_cache.shared > shared_before:
+            print(
+                f"[generate] {dataset_name}: reused {parse_cache.shared - shared_before} "
+                "parse results shared with other data folders"
+            )
+        if parse_stats.get("bad_lines"):
+            print(
+                f"[generate] {dataset_name}: recovered {parse_stats['bad_lines']} "
+                "lines with invalid UTF-8"
+            )
+        run_stats["files"] += parse_stats.get("files", 0)
+        run_stats["rows"] += rows
         if rows > 0:
-            summary_paths[dataset_name] = out_path
-            total_rows += rows
+            samples[dataset_name] = version_samples
+            report.write_rollups(
+                out_path.parent, version_samples, version_detail, [fp.name for fp in files]
+            )
             print(f"[generate] {dataset_name}: wrote {rows} rows to {out_path}")
         else:
+            _remove_version_output(result_root, dataset_name)
             print(f"[generate] {dataset_name}: no matches (pattern {pattern})")
+        extract_records[dataset_name] = {"fingerprint": fingerprint, "rows": rows}
+
+    parse_cache.prune()
+    manifest["files"] = parse_cache.entries
+    manifest["discovery"] = index
+    save_manifest(result_root, manifest)
+
+    summary_paths: Dict[str, Path] = {}
+    total_rows = 0
+    for dataset_name, *_ in plan:
+        record = extract_records[dataset_name]
+        if record["rows"]:
+            summary_paths[dataset_name] = result_root / dataset_name / "summary.csv"
+            total_rows += int(record["rows"])
+    run_stats["total_rows"] = total_rows
 
     if not summary_paths:
         print("[generate] No summaries generated")
-        return
+        return run_stats
 
-    combined_path = summary_marker
-    _combine_summaries(summary_paths, combined_path)
+    # Stage 3 and 4: combine per-version samples, then compute stats
+    combined_path = result_root / "summary.csv"
+    combine_fingerprint = _fingerprint(
+        "combine",
+        sorted((name, extract_records[name]["fingerprint"]) for name in summary_paths),
+    )
+    report_fingerprint = _fingerprint("report", combine_fingerprint)
+    combine_reason = _stage_reason(stages.get("combine"), combine_fingerprint, combine_outputs)
+    report_reason = _stage_reason(stages.get("report"), report_fingerprint, report_outputs)
+    if not combine_reason:
+        print(f"[generate] combine: up to date ({combined_path})")
+    if not report_reason:
+        print(f"[generate] report: up to date ({total_rows} total rows)")
+    if not combine_reason and not report_reason:
+        return run_stats
+
+    for dataset_name, csv_path in summary_paths.items():
+        if dataset_name not in samples:
+            samples[dataset_name] = _load_version_summary(csv_path)
+
+    if combine_reason:
+        _combine_summaries(samples, combined_path)
+        samplearrays.write_sample_arrays(samples, arrays_dir, sorted(samples))
+        print(f"[generate] Wrote sample arrays to {arrays_dir}")
+        count = sketch.write_sketches(samples, sketches_path, sorted(samples))
+        print(f"[generate] Wrote {count} quantile sketches to {sketches_path}")
+        table_path = result_root / report.SAMPLES_TABLE
+        if report.write_samples_table(samples, table_path, result_root.name, sorted(samples)):
+            print(f"[generate] Wrote columnar samples to {table_path}")
+        if db_path in combine_outputs:
+            sampledb.write_samples_db(samples, db_path, sorted(samples))
+            print(f"[generate] Wrote sample database to {db_path}")
+        stages["combine"] = {"fingerprint": combine_fingerprint}
+        save_manifest(result_root, manifest)
+
+    if report_reason:
+        report.main(samples, result_root, sorted(samples))
+        count = distributions.write_distributions(samples, distributions_path, sorted(samples))
+        print(f"[generate] Wrote {count} distribution summaries to {distributions_path}")
+        stages["report"] = {"fingerprint": report_fingerprint}
+        save_manifest(result_root, manifest)
+    print(f"[generate] Completed report generation ({total_rows} total rows)")
+    return run_stats
 
-    env = os.environ.copy()
-    env["SPM_RESULT_ROOT"] = str(result_root)
 
-    try:
-        subprocess.run(
-            [sys.executable, str(BASE_DIR / "src" / "report.py")],
-            check=True,
-            cwd=BASE_DIR,
-            env=env,
+def _find_data_roots(search_root: Path) -> Tuple[List[Path], Dict[str, str]]:
+    """Return folders under search_root that hold version/PerformanceLog trees.
+
+    Also returns {folder name: error message} for folders whose discovery
+    failed (e.g. a corrupt overlay.json), so one bad folder does not stop
+    the others.
+    """
+    skip = {DEFAULT_RESULT_DIR.resolve(), (BASE_DIR / "recycle").resolve()}
+    roots: List[Path] = []
+    errors: Dict[str, str] = {}
+    if not search_root.is_dir():
+        print(f"[generate] Search folder not found: {search_root}")
+        return roots, errors
+    for candidate in sorted(search_root.iterdir()):
+        if not candidate.is_dir() or candidate.name.startswith("."):
+            continue
+        if candidate.resolve() in skip:
+            continue
+        try:
+            log_dirs = _collect_log_dirs(candidate)
+        except (Exception, SystemExit) as exc:  # isolate one folder's failure
+            errors[candidate.name] = f"{type(exc).__name__}: {exc}"
+            continue
+        if log_dirs:
+            roots.append(candidate)
+    return roots, errors
+
+
+def _generate_isolated(
+    data_root: Path, result_root: Path, jobs: int | None, dry_run: bool, sqlite: bool
+) -> Tuple[Dict[str, int], str, float, str | None]:
+    """Run generate_reports for one data folder, capturing its output.
+
+    Returns (run stats, captured log, wall seconds, error message or None).
+    """
+    buffer = io.StringIO()
+    started = time.perf_counter()
+    run_stats: Dict[str, int] = {}
+    error: str | None = None
+    with redirect_stdout(buffer):
+        try:
+            run_stats = generate_reports(
+                data_root, result_root, jobs=jobs, dry_run=dry_run, sqlite=sqlite
+            )
+        except (Exception, SystemExit) as exc:  # isolate one dataset's failure
+            error = f"{type(exc).__name__}: {exc}"
+    return run_stats, buffer.getvalue(), time.perf_counter() - started, error
+
+
+def generate_all(
+    search_root: Path,
+    jobs: int | None = None,
+    workers: int | None = None,
+    dry_run: bool = False,
+    sqlite: bool = False,
+) -> int:
+    """Generate results for every data folder under search_root in parallel.
+
+    Each data folder runs in its own worker process and writes to
+    result/<name>; a failure is reported without aborting the others. The
+    ``jobs`` parser budget is split across the ``workers`` running datasets.
+    Returns the number of failed data folders.
+    """
+    started = time.perf_counter()
+    roots, discovery_errors = _find_data_roots(search_root)
+    if not roots and not discovery_errors:
+        print(f"[generate] No data folders found under {search_root}")
+        return 0
+
+    results: Dict[str, Tuple[Dict[str, int], float, str | None]] = {}
+    for name, error in discovery_errors.items():
+        print(f"[{name}] [generate] FAILED: {error}")
+        results[name] = ({}, 0.0, error)
+
+    workers = min(len(roots), extract.resolve_jobs(workers)) or 1
+    per_dataset_jobs = max(1, extract.resolve_jobs(jobs) // workers)
+    if roots:
+        print(
+            f"[generate] {len(roots)} data folders, {workers} at a time, "
+            f"{per_dataset_jobs} parser processes each"
         )
-    except subprocess.CalledProcessError as exc:
-        print(f"[generate] report.py failed: {exc}")
-        raise SystemExit(exc.returncode) from exc
 
-    print(f"[generate] Completed report generation ({total_rows} total rows)")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                _generate_isolated,
+                root,
+                result_root_for_data(root),
+                per_dataset_jobs,
+                dry_run,
+                sqlite,
+            ): root
+            for root in roots
+        }
+        for future in as_completed(futures):
+            name = futures[future].name
+            try:
+                run_stats, log, elapsed, error = future.result()
+            except Exception as exc:  # worker process died
+                run_stats, log, elapsed, error = {}, "", 0.0, f"{type(exc).__name__}: {exc}"
+            for line in log.splitlines():
+                print(f"[{name}] {line}")
+            if error:
+                print(f"[{name}] [generate] FAILED: {error}")
+            results[name] = (run_stats, elapsed, error)
+    wall = time.perf_counter() - started
+
+    failed = sum(1 for _, _, error in results.values() if error)
+    print(f"[generate] Summary: {len(results)} data folders in {wall:.1f}s ({failed} failed)")
+    for name in sorted(results):
+        run_stats, elapsed, error = results[name]
+        files = run_stats.get("files", 0)
+        rows = run_stats.get("rows", 0)
+        rate = elapsed if elapsed > 0 else float("inf")
+        status = "FAILED" if error else "ok"
+        print(
+            f"  {name:<20} {status:<6} {files:>8} files {rows:>12} rows "
+            f"{elapsed:>8.2f}s {files / rate:>10.1f} files/s {rows / rate:>12.0f} rows/s"
+        )
+    return failed
 
 
-def _merge_single_source(
-    source_dir: Path, dest_dir: Path, overwrite: bool
-) -> Tuple[int, int, int]:
-    """Copy files from one data source into destination.
+# ioctl request that clones a file's extents (Linux btrfs/xfs/...)
+FICLONE = 0x40049409
+
+MERGE_MODES = ("copy", "link", "reflink")
+MERGE_COUNTERS = ("copied", "linked", "reflinked", "identical", "skipped", "overwritten", "fallback")
+
+
+def _file_digest(path: Path) -> str:
+    with path.open("rb") as fh:
+        return hashlib.file_digest(fh, "sha1").hexdigest()
 
-    Returns (copied, skipped, overwritten).
+
+def _same_content(src_file: Path, dst_file: Path) -> bool:
+    """Return True when dst_file already holds the same bytes as src_file."""
+    try:
+        if os.path.samefile(src_file, dst_file):
+            return True
+        if src_file.stat().st_size != dst_file.stat().st_size:
+            return False
+    except OSError:
+        return False
+    return _file_digest(src_file) == _file_digest(dst_file)
+
+
+def _reflink(src_file: Path, dst_file: Path) -> bool:
+    """Clone src_file into dst_file sharing its blocks; False if unsupported."""
+    if fcntl is None:
+        return False
+    try:
+        with src_file.open("rb") as src, dst_file.open("wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        dst_file.unlink(missing_ok=True)
+        return False
+    shutil.copystat(src_file, dst_file)
+    return True
+
+
+def _place_file(src_file: Path, dst_file: Path, mode: str) -> bool:
+    """Create dst_file from src_file; False when it fell back to a copy."""
+    if mode == "link":
+        try:
+            os.link(src_file, dst_file)
+            return True
+        except OSError:
+            pass
+    elif mode == "reflink" and _reflink(src_file, dst_file):
+        return True
+    shutil.copy2(src_file, dst_file)
+    return mode == "copy"
+
+
+def _merge_file(src_file: Path, dst_file: Path, overwrite: bool, mode: str) -> Tuple[str, bool]:
+    """Merge one file; returns (outcome counter, fell back to copy)."""
+    if dst_file.exists():
+        if _same_content(src_file, dst_file):
+            return "identical", False
+        if not overwrite:
+            return "skipped", False
+        # Replace rather than write in place: dst may be a hardlink to a source
+        dst_file.unlink()
+        return "overwritten", not _place_file(src_file, dst_file, mode)
+    placed = _place_file(src_file, dst_file, mode)
+    outcome = {"copy": "copied", "link": "linked", "reflink": "reflinked"}[mode]
+    return (outcome if placed else "copied"), not placed
+
+
+def _merge_single_source(
+    source_dir: Path,
+    dest_dir: Path,
+    overwrite: bool,
+    mode: str = "copy",
+    pool: ThreadPoolExecutor | None = None,
+) -> Dict[str, int]:
+    """Merge files from one data source into destination.
+
+    Files are placed by copy, hardlink or reflink (``mode``) on the thread
+    ``pool``. Destination files with the same size and hash are counted as
+    identical and left alone. Returns counts keyed by MERGE_COUNTERS.
     """
-    copied = skipped = overwritten = 0
+    counts = dict.fromkeys(MERGE_COUNTERS, 0)
+    tasks: List[Tuple[Path, Path]] = []
     for root, _, files in os.walk(source_dir):
         root_path = Path(root)
         relative = root_path.relative_to(source_dir)
         target_root = dest_dir / relative
         target_root.mkdir(parents=True, exist_ok=True)
         for filename in files:
-            src_file = root_path / filename
-            dst_file = target_root / filename
-            if dst_file.exists():
-                if overwrite:
-                    shutil.copy2(src_file, dst_file)
-                    overwritten += 1
-                else:
-                    skipped += 1
-                continue
-            shutil.copy2(src_file, dst_file)
-            copied += 1
-    return copied, skipped, overwritten
+            tasks.append((root_path / filename, target_root / filename))
+
+    if pool is None:
+        results = (_merge_file(src, dst, overwrite, mode) for src, dst in tasks)
+    else:
+        results = pool.map(lambda task: _merge_file(*task, overwrite, mode), tasks)
+    for outcome, fell_back in results:
+        counts[outcome] += 1
+        counts["fallback"] += fell_back
+    return counts
 
 
 def merge_data_folders(
-    source_paths: Iterable[Path], dest_path: Path, overwrite: bool = False
+    source_paths: Iterable[Path],
+    dest_path: Path,
+    overwrite: bool = False,
+    mode: str = "copy",
+    jobs: int | None = None,
+    dedupe: bool = False,
 ) -> None:
-    """Merge multiple data folders into a destination data folder."""
+    """Merge multiple data folders into a destination data folder.
+
+    ``mode`` is "copy", "link" (hardlinks) or "reflink" (copy-on-write
+    clones); links fall back to copies where the filesystem refuses them.
+    Sources are merged in order with ``jobs`` file threads. ``dedupe`` then
+    moves the destination's logs into the shared blob store.
+    """
+    if mode not in MERGE_MODES:
+        raise ValueError(f"Unknown merge mode: {mode}")
     dest_path.mkdir(parents=True, exist_ok=True)
-    total_copied = total_skipped = total_overwritten = 0
+    totals = dict.fromkeys(MERGE_COUNTERS, 0)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for source in source_paths:
+            if not source.exists():
+                print(f"[merge] Skip missing source: {source}")
+                continue
+            if source.resolve() == dest_path.resolve():
+                print(f"[merge] Skip destination itself: {source}")
+                continue
+            print(f"[merge] Merging {source} -> {dest_path}")
+            counts = _merge_single_source(source, dest_path, overwrite, mode, pool)
+            for key, value in counts.items():
+                totals[key] += value
+
+    if totals["fallback"]:
+        print(f"[merge] {totals['fallback']} files were copied because {mode} is not supported")
+    summary = ", ".join(f"{key}={totals[key]}" for key in MERGE_COUNTERS if key != "fallback")
+    print(f"[merge] Done ({summary})")
+    if dedupe:
+        store_data_folder(dest_path, jobs)
+
+
+def merge_virtual(
+    source_paths: Iterable[Path],
+    dest_path: Path,
+    overwrite: bool = False,
+    dedupe: bool = False,
+) -> None:
+    """Merge data folders without copying by writing an overlay manifest.
 
+    Generation reads the sources through dest_path's overlay; on conflicting
+    log files the destination and earlier sources win, or, with ``overwrite``,
+    later sources win over earlier ones and the destination. ``dedupe`` moves each source's logs into the blob store.
+    """
+    sources: List[Path] = []
     for source in source_paths:
         if not source.exists():
             print(f"[merge] Skip missing source: {source}")
@@ -236,15 +744,23 @@ def merge_data_folders(
         if source.resolve() == dest_path.resolve():
             print(f"[merge] Skip destination itself: {source}")
             continue
-        print(f"[merge] Merging {source} -> {dest_path}")
-        copied, skipped, overwritten = _merge_single_source(source, dest_path, overwrite)
-        total_copied += copied
-        total_skipped += skipped
-        total_overwritten += overwritten
-
+        sources.append(source)
+    if not sources:
+        print("[merge] Nothing to merge")
+        return
+    if dedupe:
+        for source in sources:
+            store_data_folder(source)
+    resolution = "last" if overwrite else "first"
+    path = discover.write_overlay(dest_path, sources, resolution)
+    index, _ = discover.build_index(dest_path)
+    versions = index["versions"]
+    files = sum(len(record["files"]) for record in versions.values())
+    conflicts = sum(record.get("conflicts", 0) for record in versions.values())
+    print(f"[merge] Wrote overlay {path} ({len(index['layers']) - 1} sources)")
     print(
-        "[merge] Done "
-        f"(copied={total_copied}, skipped={total_skipped}, overwritten={total_overwritten})"
+        f"[merge] Done (versions={len(versions)}, log files={files}, "
+        f"conflicts={conflicts} resolved by {resolution} source)"
     )
 
 
@@ -294,6 +810,38 @@ def _build_parser() -> argparse.ArgumentParser:
         default=str(DEFAULT_DATA_DIR),
         help="Data folder containing version folders (default: data)",
     )
+    generate_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of log parser processes (default: CPU count)",
+    )
+    generate_parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Generate every data folder found under --root, in parallel",
+    )
+    generate_parser.add_argument(
+        "--root",
+        default=str(BASE_DIR),
+        help="Folder searched for data folders with --all (default: project root)",
+    )
+    generate_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Data folders generated at once with --all (default: CPU count)",
+    )
+    generate_parser.add_argument(
+        "--sqlite",
+        action="store_true",
+        help="Also write the indexed result/<data-folder>/samples.db",
+    )
+    generate_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show which stages are stale without building anything",
+    )
     generate_parser.set_defaults(func=cmd_generate)
 
     serve_parser = subparsers.add_parser(
@@ -323,6 +871,12 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Skip report generation before launching the web app",
     )
+    serve_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of log parser processes when building (default: CPU count)",
+    )
     serve_parser.set_defaults(func=cmd_serve)
 
     merge_parser = subparsers.add_parser(
@@ -343,6 +897,38 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Overwrite duplicate files in destination (default: skip)",
     )
+    link_group = merge_parser.add_mutually_exclusive_group()
+    link_group.add_argument(
+        "--link",
+        dest="mode",
+        action="store_const",
+        const="link",
+        default="copy",
+        help="Hardlink files instead of copying them (same filesystem only)",
+    )
+    link_group.add_argument(
+        "--reflink",
+        dest="mode",
+        action="store_const",
+        const="reflink",
+        help="Clone files copy-on-write where supported, else copy",
+    )
+    link_group.add_argument(
+        "--virtual",
+        action="store_true",
+        help="Write an overlay manifest that reads the sources in place (no copies)",
+    )
+    merge_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of file copy threads (default: Python's thread pool default)",
+    )
+    merge_parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Keep merged logs once in the shared blob store (.blobstore/)",
+    )
     merge_parser.set_defaults(func=cmd_merge)
 
     return parser
@@ -354,9 +940,23 @@ def cmd_clean(args: argparse.Namespace) -> None:
 
 
 def cmd_generate(args: argparse.Namespace) -> None:
+    if args.all:
+        search_root = _resolve_path(args.root, BASE_DIR)
+        failed = generate_all(
+            search_root,
+            jobs=args.jobs,
+            workers=args.workers,
+            dry_run=args.dry_run,
+            sqlite=args.sqlite,
+        )
+        if failed:
+            raise SystemExit(1)
+        return
     data_root = _resolve_path(args.data, DEFAULT_DATA_DIR)
     result_root = result_root_for_data(data_root)
-    generate_reports(data_root, result_root)
+    generate_reports(
+        data_root, result_root, jobs=args.jobs, dry_run=args.dry_run, sqlite=args.sqlite
+    )
 
 
 def cmd_serve(args: argparse.Namespace) -> None:
@@ -364,14 +964,24 @@ def cmd_serve(args: argparse.Namespace) -> None:
     data_root = _resolve_path(data_arg, DEFAULT_DATA_DIR)
     result_root = result_root_for_data(data_root)
     if not args.no_build:
-        generate_reports(data_root, result_root)
+        generate_reports(data_root, result_root, jobs=args.jobs)
     serve_webapp(args.host, args.port, args.debug, result_root, DEFAULT_RESULT_DIR)
 
 
 def cmd_merge(args: argparse.Namespace) -> None:
     sources = [_resolve_path(src, DEFAULT_DATA_DIR) for src in args.sources]
     dest = _resolve_path(args.into, DEFAULT_DATA_DIR)
-    merge_data_folders(sources, dest, overwrite=args.overwrite)
+    if args.virtual:
+        merge_virtual(sources, dest, overwrite=args.overwrite, dedupe=args.dedupe)
+        return
+    merge_data_folders(
+        sources,
+        dest,
+        overwrite=args.overwrite,
+        mode=args.mode,
+        jobs=args.jobs,
+        dedupe=args.dedupe,
+    )
 
 
 def main(argv: List[str] | None = None) -> int:
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+
+# Per-data-folder list of the blobs its log files reference
+REFS_FILENAME = "blobs.json"
+REFS_VERSION = 1
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 of a file's content, the key of its blob."""
+    with path.open("rb") as fh:
+        return hashlib.file_digest(fh, "sha256").hexdigest()
+
+
+class BlobStore:
+    """Content-addressed store of raw log files shared by all data folders.
+
+    A blob is kept once under objects/<aa>/<digest>; data folders reference it
+    by hardlink, so identical logs take the space of one file. File modes are
+    left alone, so a log that is still being written keeps growing; a blob
+    whose content no longer matches its digest is never linked again, and a
+    reference is only trusted while its size and mtime match (known_digests).
+    Parse results are kept per digest under parsed/ (see extract.ParseCache)
+    so a log is parsed once however many data folders contain it.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest
+
+    @property
+    def parsed_dir(self) -> Path:
+        return self.root / "parsed"
+
+    def add(self, path: Path) -> Tuple[str, str]:
+        """Store one file and link it to its blob.
+
+        Returns (digest, outcome) where outcome is "stored" (first copy),
+        "deduplicated" (replaced by a link to an existing blob), "linked"
+        (already the blob) or "unlinked" (hardlinks unavailable, for example
+        across filesystems; only the digest is recorded).
+        """
+        digest = file_digest(path)
+        blob = self.blob_path(digest)
+        if blob.exists():
+            if os.path.samefile(path, blob):
+                return digest, "linked"
+            if file_digest(blob) != digest:
+                # Written to through another link since it was stored: retire
+                # it (its other links keep their content) and store this file
+                blob.unlink(missing_ok=True)
+                return self.add(path)
+            tmp_path = path.with_name(f".{path.name}.blob")
+            try:
+                os.link(blob, tmp_path)
+            except OSError:
+                return digest, "unlinked"
+            os.replace(tmp_path, path)
+            return digest, "deduplicated"
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, blob)
+        except FileExistsError:
+            # Another thread stored the same content first
+            return self.add(path)
+        except OSError:
+            return digest, "unlinked"
+        return digest, "stored"
+
+
+def load_refs(data_root: Path) -> Dict[str, List[object]]:
+    """Return {relative path: [digest, size, mtime_ns]} for a data folder."""
+    try:
+        with (data_root / REFS_FILENAME).open("r", encoding="utf-8") as fh:
+            refs = json.load(fh)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if not isinstance(refs, dict) or refs.get("version") != REFS_VERSION:
+        return {}
+    return refs.get("files", {})
+
+
+def save_refs(data_root: Path, files: Dict[str, List[object]]) -> None:
+    path = data_root / REFS_FILENAME
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as fh:
+        json.dump({"version": REFS_VERSION, "files": files}, fh)
+    os.replace(tmp_path, path)
+
+
+def ingest(
+    store: BlobStore, data_root: Path, files: Iterable[Path], jobs: int | None = None
+) -> Dict[str, int]:
+    """Move a data folder's log files into the store and record its refs.
+
+    Files are hashed on a thread pool. Returns counts per outcome of
+    BlobStore.add plus "bytes_saved" by deduplication.
+    """
+    files = list(files)
+    refs = load_refs(data_root)
+    counts = {"stored": 0, "deduplicated": 0, "linked": 0, "unlinked": 0, "bytes_saved": 0}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for fp, (digest, outcome) in zip(files, pool.map(store.add, files)):
+            st = fp.stat()
+            counts[outcome] += 1
+            if outcome == "deduplicated":
+                counts["bytes_saved"] += st.st_size
+            refs[fp.relative_to(data_root).as_posix()] = [digest, st.st_size, st.st_mtime_ns]
+    save_refs(data_root, refs)
+    return counts
+
+
+def known_digests(data_root: Path, listed: Iterable[Tuple[Path, int, int]]) -> Dict[Path, str]:
+    """Return the digests of listed (path, size, mtime_ns) files under data_root.
+
+    Only references whose size and mtime still match are trusted.
+    """
+    refs = load_refs(data_root)
+    digests: Dict[Path, str] = {}
+    if not refs:
+        return digests
+    for fp, size, mtime_ns in listed:
+        try:
+            rel = fp.relative_to(data_root).as_posix()
+        except ValueError:
+            continue
+        ref = refs.get(rel)
+        if ref and ref[1] == size and ref[2] == mtime_ns:
+            digests[fp] = ref[0]
+    return digests
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import json
+import os
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Tuple
+
+
+LOG_DIR_NAME = "PerformanceLog"
+
+# Folder levels searched below a version folder for a nested PerformanceLog
+MAX_LOG_DIR_DEPTH = 4
+
+# Virtual merge manifest kept at the top of a data folder (see load_overlay)
+OVERLAY_FILENAME = "overlay.json"
+OVERLAY_VERSION = 1
+OVERLAY_RESOLUTIONS = ("first", "last")
+
+# Glob patterns matching each file kind; loading logs win when present
+LOADING_PATTERN = "*loading.log"
+LOG_PATTERN = "*.log"
+
+# Compressed logs are classified by the name under the compression suffix
+COMPRESSED_SUFFIXES = (".gz", ".bz2", ".xz")
+
+
+def classify_log_file(name: str) -> str | None:
+    """Return "loading", "log" or None (not a log file) for a file name.
+
+    "x_loading.log.gz" and other compressed logs count like their plain name.
+    """
+    root, ext = os.path.splitext(name)
+    if ext.lower() in COMPRESSED_SUFFIXES:
+        name = root
+    if name.endswith("loading.log"):
+        return "loading"
+    if name.endswith(".log"):
+        return "log"
+    return None
+
+
+def _scan_log_dir(log_dir: Path) -> List[List[object]]:
+    """List log files in one folder as sorted [name, kind, size, mtime_ns]."""
+    files: List[List[object]] = []
+    with os.scandir(log_dir) as it:
+        for entry in it:
+            kind = classify_log_file(entry.name)
+            if kind is None:
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append([entry.name, kind, st.st_size, st.st_mtime_ns])
+    files.sort()
+    return files
+
+
+def _restat_files(log_dir: Path, files: List[List[object]]) -> List[List[object]] | None:
+    """Refresh sizes and mtimes of known files; None if one disappeared."""
+    refreshed: List[List[object]] = []
+    for name, kind, *_ in files:
+        try:
+            st = os.stat(log_dir / name)
+        except FileNotFoundError:
+            return None
+        refreshed.append([name, kind, st.st_size, st.st_mtime_ns])
+    return refreshed
+
+
+def _find_log_dir(version_dir: Path, max_depth: int = MAX_LOG_DIR_DEPTH) -> Path | None:
+    """Breadth-first search for the shallowest PerformanceLog folder.
+
+    Siblings are visited in name order, so the choice is stable across runs.
+    """
+    queue: Deque[Tuple[Path, int]] = deque([(version_dir, 0)])
+    while queue:
+        folder, depth = queue.popleft()
+        try:
+            with os.scandir(folder) as it:
+                subdirs = sorted(entry.name for entry in it if entry.is_dir())
+        except OSError:
+            continue
+        if LOG_DIR_NAME in subdirs:
+            return folder / LOG_DIR_NAME
+        if depth + 1 < max_depth:
+            queue.extend((folder / name, depth + 1) for name in subdirs)
+    return None
+
+
+def load_overlay(data_root: Path) -> Dict[str, object] | None:
+    """Return the virtual merge overlay of a data folder, or None if absent.
+
+    The overlay lists source folders layered on top of data_root's own
+    version folders; "resolution" is "first" (earlier layers win, like a
+    merge without --overwrite) or "last" (later sources win over earlier
+    ones and data_root, like merge --overwrite).
+    """
+    path = data_root / OVERLAY_FILENAME
+    try:
+        with path.open("r", encoding="utf-8") as fh:
+            overlay = json.load(fh)
+    except FileNotFoundError:
+        return None
+    except ValueError as exc:
+        raise ValueError(f"Invalid overlay manifest {path}: {exc}") from exc
+    if (
+        not isinstance(overlay, dict)
+        or overlay.get("version") != OVERLAY_VERSION
+        or overlay.get("resolution") not in OVERLAY_RESOLUTIONS
+        or not isinstance(overlay.get("sources"), list)
+    ):
+        raise ValueError(f"Unsupported overlay manifest: {path}")
+    return overlay
+
+
+def write_overlay(data_root: Path, sources: List[Path], resolution: str) -> Path:
+    """Add sources to data_root's overlay (creating it) and return its path."""
+    overlay = load_overlay(data_root) or {"version": OVERLAY_VERSION, "sources": []}
+    known = list(overlay["sources"])
+    for source in sources:
+        key = source.resolve().as_posix()
+        if key not in known:
+            known.append(key)
+    overlay["sources"] = known
+    overlay["resolution"] = resolution
+    data_root.mkdir(parents=True, exist_ok=True)
+    path = data_root / OVERLAY_FILENAME
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as fh:
+        json.dump(overlay, fh, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _index_root(
+    data_root: Path, previous: Dict[str, object] | None
+) -> Tuple[Dict[str, object], set[str]]:
+    """Index one physical folder; returns (index, names of reused versions)."""
+    root_key = data_root.resolve().as_posix()
+    cached: Dict[str, Dict[str, object]] = {}
+    if previous and previous.get("root") == root_key:
+        cached = previous.get("versions", {})
+
+    versions: Dict[str, Dict[str, object]] = {}
+    reused: set[str] = set()
+    with os.scandir(data_root) as it:
+        candidates = sorted((entry.name, entry) for entry in it if entry.is_dir())
+    for name, entry in candidates:
+        version_mtime = entry.stat().st_mtime_ns
+        record = cached.get(name)
+        if record and record.get("mtime_ns") == version_mtime:
+            log_dir = data_root / record["log_dir"]
+            try:
+                log_mtime = os.stat(log_dir).st_mtime_ns
+            except OSError:
+                log_mtime = None
+            if log_mtime == record.get("log_mtime_ns"):
+                files = _restat_files(log_dir, record["files"])
+                if files is not None:
+                    versions[name] = {**record, "files": files}
+                    reused.add(name)
+                    continue
+
+        version_dir = data_root / name
+        log_dir = version_dir / LOG_DIR_NAME
+        if not log_dir.is_dir():
+            log_dir = _find_log_dir(version_dir)
+            if log_dir is None:
+                continue
+        try:
+            log_mtime = os.stat(log_dir).st_mtime_ns
+            files = _scan_log_dir(log_dir)
+        except OSError:
+            continue
+        versions[name] = {
+            "log_dir": log_dir.relative_to(data_root).as_posix(),
+            "mtime_ns": version_mtime,
+            "log_mtime_ns": log_mtime,
+            "files": files,
+        }
+    return {"root": root_key, "versions": versions}, reused
+
+
+def _overlay_versions(
+    layers: List[Tuple[Path, Dict[str, object]]]
+) -> Dict[str, Dict[str, object]]:
+    """Merge per-layer indexes (highest priority first) into one view.
+
+    Mirrors a physical merge: a version uses the shallowest log folder path
+    any layer has, files from layers sharing that path are combined, and a
+    file name present in several layers comes from the highest priority one.
+    """
+    names = sorted({name for _, index in layers for name in index["versions"]})
+    versions: Dict[str, Dict[str, object]] = {}
+    for name in names:
+        present = [
+            (root, index["versions"][name]) for root, index in layers if name in index["versions"]
+        ]
+        log_rel = min(
+            (record["log_dir"] for _, record in present),
+            key=lambda rel: (rel.count("/"), rel),
+        )
+        origins: List[str] = []
+        chosen: Dict[str, List[object]] = {}
+        conflicts = 0
+        for root, record in present:
+            if record["log_dir"] != log_rel:
+                continue
+            origin = len(origins)
+            origins.append((root / log_rel).as_posix())
+            for item in record["files"]:
+                if item[0] in chosen:
+                    conflicts += 1
+                    continue
+                chosen[item[0]] = [*item[:4], origin]
+        versions[name] = {
+            "log_dir": log_rel,
+            "origins": origins,
+            "files": [chosen[file_name] for file_name in sorted(chosen)],
+            "conflicts": conflicts,
+        }
+    return versions
+
+
+def build_index(
+    data_root: Path, previous: Dict[str, object] | None = None
+) -> Tuple[Dict[str, object], int]:
+    """Walk data_root once and index version -> log dir -> classified files.
+
+    Entries of ``previous`` (an index from an earlier run) are reused when the
+    version folder and its log folder keep their mtimes, so only the known
+    files are re-stat'ed instead of searching the tree again. A data folder
+    with an overlay (see load_overlay) is indexed per layer and read through
+    the merged view. Returns ({"root": ..., "versions": {name: {...}}},
+    number of reused versions); versions without a PerformanceLog folder are
+    left out.
+    """
+    overlay = load_overlay(data_root)
+    if overlay is None:
+        index, reused = _index_root(data_root, previous)
+        return index, len(reused)
+
+    sources = [Path(source) for source in overlay["sources"]]
+    if overlay["resolution"] == "last":
+        # Like merge --overwrite: later sources replace earlier ones and data_root
+        roots = [*reversed(sources), data_root]
+    else:
+        roots = [data_root, *sources]
+    previous_layers: Dict[str, Dict[str, object]] = (previous or {}).get("layers", {})
+    layers: List[Tuple[Path, Dict[str, object]]] = []
+    layer_indexes: Dict[str, Dict[str, object]] = {}
+    reused_per_layer: List[set[str]] = []
+    for root in roots:
+        if not root.is_dir():
+            print(f"[generate] Overlay source not found: {root}")
+            continue
+        key = root.resolve().as_posix()
+        index, reused = _index_root(root, previous_layers.get(key))
+        layers.append((root.resolve(), index))
+        layer_indexes[key] = index
+        reused_per_layer.append(reused)
+    versions = _overlay_versions(layers)
+    reused_versions = sum(
+        1
+        for name in versions
+        if all(
+            name in reused or name not in index["versions"]
+            for (_, index), reused in zip(layers, reused_per_layer)
+        )
+    )
+    root_key = data_root.resolve().as_posix()
+    return {"root": root_key, "layers": layer_indexes, "versions": versions}, reused_versions
+
+
+def record_log_dir(data_root: Path, record: Dict[str, object]) -> Path:
+    """Return the (first) physical log folder behind an index record."""
+    origins = record.get("origins")
+    return Path(origins[0]) if origins else data_root / record["log_dir"]
+
+
+def select_inputs(
+    data_root: Path, record: Dict[str, object]
+) -> Tuple[Path, str, List[Path], List[List[object]]]:
+    """Return (log_dir, pattern, files, [name, size, mtime_ns] listing).
+
+    Loading logs are used when the folder has any; otherwise every *.log.
+    Overlay records list each file's full path instead of its name.
+    """
+    log_dir = record_log_dir(data_root, record)
+    entries = record["files"]
+    if any(kind == "loading" for _, kind, *_ in entries):
+        pattern = LOADING_PATTERN
+        entries = [item for item in entries if item[1] == "loading"]
+    else:
+        pattern = LOG_PATTERN
+    origins = record.get("origins")
+    if origins:
+        files = [Path(origins[item[4]]) / item[0] for item in entries]
+        listing = [[fp.as_posix(), item[2], item[3]] for fp, item in zip(files, entries)]
+    else:
+        files = [log_dir / name for name, *_ in entries]
+        listing = [[name, size, mtime] for name, _, size, mtime in entries]
+    return log_dir, pattern, files, listing
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from src.report import EXCLUDED_SERVICES, iter_chunks, select_ranks
+
+
+# Per (version, service) distribution summaries, next to summary.csv
+DISTRIBUTIONS_FILENAME = "distributions.npz"
+DISTRIBUTIONS_FORMAT = 1
+
+# Box statistics of each summary, in stored column order
+BOX_COLUMNS = [
+    "count",
+    "mean",
+    "min",
+    "q1",
+    "median",
+    "q3",
+    "lowerfence",
+    "upperfence",
+    "max",
+    "outliers_low",
+    "outliers_high",
+]
+# Whiskers reach the furthest samples within this many IQRs of the box
+WHISKER_IQR = 1.5
+# Linear histogram buckets per power of two
+HISTOGRAM_SUB_BUCKETS = 8
+
+
+def histogram_edges(high: int) -> np.ndarray:
+    """Log-linear integer bucket edges covering 0..high.
+
+    Every power-of-two range [2**e, 2**(e + 1)) is split into
+    HISTOGRAM_SUB_BUCKETS equal buckets (one per ms where those would be
+    narrower), so bucket width stays within 1/HISTOGRAM_SUB_BUCKETS of its
+    values. The first bucket [0, 1) also holds values below zero.
+    """
+    top = max(int(high), 1).bit_length()
+    edges = [0]
+    for exponent in range(top):
+        base = 1 << exponent
+        edges += [
+            -(-(base * (HISTOGRAM_SUB_BUCKETS + k)) // HISTOGRAM_SUB_BUCKETS)
+            for k in range(HISTOGRAM_SUB_BUCKETS)
+        ]
+    edges.append(1 << top)
+    return np.unique(np.array(edges, dtype=np.int64))
+
+
+def summarize(
+    chunks: List[Sequence[int]], edges: np.ndarray
+) -> Tuple[List[float], np.ndarray] | None:
+    """Box statistics (BOX_COLUMNS) and histogram counts of one group of chunks.
+
+    Quartile q interpolates linearly between the ranks around
+    (n - 1) * q / 100; the ranks come from report.select_ranks, so large
+    groups are streamed rather than sorted. Returns None for an empty group.
+    """
+    count = total = 0
+    low = high = 0
+    for values in iter_chunks(chunks):
+        if not len(values):
+            continue
+        low = int(values.min()) if not count else min(low, int(values.min()))
+        high = int(values.max()) if not count else max(high, int(values.max()))
+        count += len(values)
+        total += int(values.sum())
+    if not count:
+        return None
+
+    last = count - 1
+    positions = {q: last * q / 100 for q in (25, 75)}
+    ranks = {last // 2, count // 2}
+    for pos in positions.values():
+        ranks.update((int(pos), min(int(pos) + 1, last)))
+    at = select_ranks(chunks, sorted(ranks), low, high)
+    quartiles = {}
+    for q, pos in positions.items():
+        lo = int(pos)
+        quartiles[q] = at[lo] + (at[min(lo + 1, last)] - at[lo]) * (pos - lo)
+    median = (at[last // 2] + at[count // 2]) / 2
+
+    iqr = quartiles[75] - quartiles[25]
+    low_limit = quartiles[25] - WHISKER_IQR * iqr
+    high_limit = quartiles[75] + WHISKER_IQR * iqr
+    lowerfence, upperfence = high, low
+    outliers_low = outliers_high = 0
+    histogram = np.zeros(len(edges) - 1, dtype=np.int64)
+    for values in iter_chunks(chunks):
+        below = values < low_limit
+        above = values > high_limit
+        outliers_low += int(below.sum())
+        outliers_high += int(above.sum())
+        inside = values[~(below | above)]
+        if len(inside):
+            lowerfence = min(lowerfence, int(inside.min()))
+            upperfence = max(upperfence, int(inside.max()))
+        buckets = np.searchsorted(edges, values, side="right") - 1
+        histogram += np.bincount(np.clip(buckets, 0, len(histogram) - 1), minlength=len(histogram))
+
+    box = [
+        count,
+        total / count,
+        low,
+        quartiles[25],
+        median,
+        quartiles[75],
+        lowerfence,
+        upperfence,
+        high,
+        outliers_low,
+        outliers_high,
+    ]
+    return [float(value) for value in box], histogram
+
+
+def write_distributions(
+    samples: Mapping[str, Mapping[str, Sequence[int]]],
+    out_path: Path,
+    versions: List[str] | None = None,
+) -> int:
+    """Write one distribution summary per (version, service) to an .npz file.
+
+    All histograms share the dataset's histogram_edges, so their rows line
+    up across versions and services. Each version also gets the box
+    statistics of all its services but EXCLUDED_SERVICES. Returns the
+    number of (version, service) summaries written.
+    """
+    versions = list(versions) if versions is not None else sorted(samples)
+    high = max(
+        (
+            int(np.max(vals))
+            for by_service in samples.values()
+            for vals in by_service.values()
+            if len(vals)
+        ),
+        default=0,
+    )
+    edges = histogram_edges(high)
+    service_ids: Dict[str, int] = {}
+    keys: List[Tuple[int, int]] = []
+    boxes: List[List[float]] = []
+    histograms: List[np.ndarray] = []
+    for version_id, version in enumerate(versions):
+        for service, vals in samples.get(version, {}).items():
+            summary = summarize([vals], edges)
+            if summary is None:
+                continue
+            keys.append((version_id, service_ids.setdefault(service, len(service_ids))))
+            boxes.append(summary[0])
+            histograms.append(summary[1])
+
+    # Each version over all services but EXCLUDED_SERVICES, like summary_stats.csv
+    version_boxes: List[List[float]] = []
+    for version in versions:
+        chunks = [
+            vals
+            for service, vals in samples.get(version, {}).items()
+            if service not in EXCLUDED_SERVICES
+        ]
+        summary = summarize(chunks, edges)
+        version_boxes.append(summary[0] if summary else [np.nan] * len(BOX_COLUMNS))
+
+    fields = {
+        "format": np.array(DISTRIBUTIONS_FORMAT),
+        "versions": np.array(versions, dtype=str),
+        "services": np.array(list(service_ids), dtype=str),
+        "keys": np.array(keys, dtype=np.int32).reshape(-1, 2),
+        "box": np.array(boxes, dtype=np.float64).reshape(-1, len(BOX_COLUMNS)),
+        "edges": edges,
+        "histograms": np.array(histograms, dtype=np.int64).reshape(-1, len(edges) - 1),
+        "version_box": np.array(version_boxes, dtype=np.float64).reshape(-1, len(BOX_COLUMNS)),
+    }
+    tmp_path = out_path.with_name(out_path.name + ".tmp.npz")
+    np.savez(tmp_path, **fields)
+    os.replace(tmp_path, out_path)
+    return len(keys)
+
+
+def load_distributions(
+    src: Path,
+) -> Tuple[np.ndarray, Dict[Tuple[str, str], Dict[str, object]]]:
+    """Read a distributions file into (edges, {(version, service): summary}).
+
+    Each summary maps BOX_COLUMNS to numbers (counts as int) plus
+    "histogram" to its bucket counts. Raises ValueError when the file's
+    format is unknown.
+    """
+    with np.load(src, allow_pickle=False) as data:
+        if int(data["format"]) != DISTRIBUTIONS_FORMAT:
+            raise ValueError(f"Unsupported distributions file: {src}")
+        versions = data["versions"].tolist()
+        services = data["services"].tolist()
+        edges = data["edges"]
+        summaries: Dict[Tuple[str, str], Dict[str, object]] = {}
+        for (version_id, service_id), box, histogram in zip(
+            data["keys"].tolist(), data["box"].tolist(), data["histograms"]
+        ):
+            summary: Dict[str, object] = dict(zip(BOX_COLUMNS, box))
+            for column in ("count", "outliers_low", "outliers_high"):
+                summary[column] = int(summary[column])
+            summary["histogram"] = histogram
+            summaries[(versions[version_id], services[service_id])] = summary
+    return edges, summaries
+
+
+def load_version_summaries(src: Path) -> Dict[str, Dict[str, float]]:
+    """Read each version's box statistics over all services but EXCLUDED_SERVICES.
+
+    Returns {version: BOX_COLUMNS values (counts as int)}, leaving out
+    versions without samples; files written before these were stored give
+    {}. Raises ValueError when the file's format is unknown.
+    """
+    with np.load(src, allow_pickle=False) as data:
+        if int(data["format"]) != DISTRIBUTIONS_FORMAT:
+            raise ValueError(f"Unsupported distributions file: {src}")
+        if "version_box" not in data.files:
+            return {}
+        versions = data["versions"].tolist()
+        boxes = data["version_box"].tolist()
+    summaries: Dict[str, Dict[str, float]] = {}
+    for version, box in zip(versions, boxes):
+        if np.isnan(box[0]):
+            continue
+        summary: Dict[str, float] = dict(zip(BOX_COLUMNS, box))
+        for column in ("count", "outliers_low", "outliers_high"):
+            summary[column] = int(summary[column])
+        summaries[version] = summary
+    return summaries
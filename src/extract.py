@@ -1,65 +1,645 @@
 from __future__ import annotations
 
 import argparse
+import bz2
 import csv
+import gzip
+import hashlib
+import json
+import lzma
+from array import array
+import mmap
+import os
 import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, Tuple, TypeVar
 
 
 LOG_PATTERN = re.compile(
-    r"^\d{2}:\d{2}:\d{2}\.\d{3}\s+(.*?)\s+-\s+(?:loading_time|elapsed):\s+(\d+)\s+ms",
+    r"^(\d{2}:\d{2}:\d{2}\.\d{3})\s+(.*?)\s+-\s+(?:loading_time|elapsed):\s+(\d+)\s+ms",
     re.IGNORECASE,
 )
 
+# Bytes form of LOG_PATTERN for scanning a whole memory-mapped file at once.
+# CPython's re engine tries a "^"-anchored multiline pattern at every byte, so
+# the scan is anchored on the literal "-" separator instead (which re can skip
+# to quickly) and the timestamp head is checked at the start of that line.
+# Whitespace classes exclude line breaks so a match never spans two lines.
+LOG_TAIL_BYTES = re.compile(
+    rb"-[^\S\r\n]+(?:loading_time|elapsed):[^\S\r\n]+(\d+)[^\S\r\n]+ms",
+    re.IGNORECASE,
+)
+LOG_HEAD_BYTES = re.compile(rb"\d{2}:\d{2}:\d{2}\.\d{3}([^\S\r\n]+)")
+_INLINE_SPACE = b" \t\x0b\x0c"
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+T = TypeVar("T")
+
+# A parsed sample: (service, loading_time_ms, time of day in ms)
+Entry = Tuple[str, int, int]
+# A sample tagged with the index of its log file (run) in the version
+Row = Tuple[str, int, int, int]
+
+# Bump when the fragment row layout changes; shared fragments are kept per format
+FRAGMENT_FORMAT = 2
+
+# Rows handed to csv.writer per call while streaming summary.csv
+WRITE_BATCH_ROWS = 10_000
+
+SUMMARY_HEADER = ["service", "loading_time_ms", "time_ms", "run"]
+RUNS_FILENAME = "runs.csv"
 
-def parse_log_lines(lines: Iterable[str]) -> List[Tuple[str, int]]:
-    """Parse lines from a log and return list of (service, loading_time_ms)."""
-    entries: List[Tuple[str, int]] = []
+# Bytes hashed at each end of the parsed region to detect rewritten logs
+DIGEST_WINDOW = 64 * 1024
+
+# Compressed logs are decompressed on the fly, never written to disk
+COMPRESSED_OPENERS: Dict[str, Callable[..., BinaryIO]] = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+# Decompressed bytes handed to parse_log_buffer at a time
+STREAM_CHUNK = 1024 * 1024
+
+
+def time_of_day_ms(stamp: str | bytes) -> int:
+    """Convert an "HH:MM:SS.mmm" log timestamp to milliseconds since midnight."""
+    return (
+        int(stamp[0:2]) * 3_600_000
+        + int(stamp[3:5]) * 60_000
+        + int(stamp[6:8]) * 1000
+        + int(stamp[9:12])
+    )
+
+
+def parse_log_lines(lines: Iterable[str]) -> List[Entry]:
+    """Parse lines from a log and return list of (service, loading_time_ms, time_ms)."""
+    entries: List[Entry] = []
     for line in lines:
         m = LOG_PATTERN.search(line)
         if not m:
             continue
-        service = m.group(1).strip()
+        service = m.group(2).strip()
         try:
-            ms = int(m.group(2))
+            ms = int(m.group(3))
         except ValueError:
             continue
-        entries.append((service, ms))
+        entries.append((service, ms, time_of_day_ms(m.group(1))))
     return entries
 
 
-def process_dir(dir_path: Path, file_glob: str, out_path: Path | None = None) -> int:
-    """Process a PerformanceLog directory and write summary.csv.
+def parse_log_buffer(
+    buf: bytes | mmap.mmap, pos: int = 0, endpos: int | None = None
+) -> Tuple[List[Entry], int]:
+    """Scan a raw log buffer for (service, loading_time_ms) entries.
 
-    Returns the number of rows written (excluding header).
+    ``pos``/``endpos`` limit the scan to a range that starts and ends on line
+    boundaries.
+
+    Matches the same lines as LOG_PATTERN, but only the captured service names
+    are decoded; lines that cannot match are never turned into ``str``. Only
+    ASCII whitespace counts as a separator (LOG_PATTERN's ``\\s`` also accepts
+    Unicode spaces such as NBSP).
+
+    Entries carry the line's time of day in ms. Returns the entries and the
+    number of matched lines whose service name was not valid UTF-8 (the
+    invalid bytes are dropped from that name).
+    """
+    names: Dict[bytes, str] = {}
+    bad_names: set[bytes] = set()
+    bad_lines = 0
+    entries: List[Entry] = []
+    bom_skip = len(_UTF8_BOM) if buf[: len(_UTF8_BOM)] == _UTF8_BOM else 0
+
+    current_line = -1
+    line_done = True
+    service_start = 0
+    # LOG_PATTERN only settles for an empty service name (separator right after
+    # the timestamp) when no later separator on the same line matches.
+    empty_match: Tuple[str, int] | None = None
+
+    if endpos is None:
+        endpos = len(buf)
+    for m in LOG_TAIL_BYTES.finditer(buf, pos, endpos):
+        dash = m.start()
+        line_start = buf.rfind(b"\n", pos, dash) + 1 or pos
+        # A bare CR also ends a line when logs are read in text mode
+        line_start = buf.rfind(b"\r", line_start, dash) + 1 or line_start
+        if line_start != current_line:
+            if empty_match is not None:
+                entries.append(empty_match)
+                empty_match = None
+            current_line = line_start
+            head = LOG_HEAD_BYTES.match(buf, line_start or bom_skip)
+            line_done = head is None
+            if head is not None:
+                head_gap = head.end(1) - head.start(1)
+                service_start = head.end()
+                stamp = time_of_day_ms(buf[head.start():head.start(1)])
+        if line_done:
+            continue
+
+        gap = dash - 1
+        if gap >= service_start and buf[gap] in _INLINE_SPACE:
+            raw = buf[service_start:gap]
+            service = names.get(raw)
+            if service is None:
+                try:
+                    service = raw.decode("utf-8").strip()
+                except UnicodeDecodeError:
+                    service = raw.decode("utf-8", errors="ignore").strip()
+                    bad_names.add(raw)
+                names[raw] = service
+            if raw in bad_names:
+                bad_lines += 1
+            entries.append((service, int(m.group(1)), stamp))
+            empty_match = None
+            line_done = True
+        elif dash == service_start and head_gap >= 2 and empty_match is None:
+            empty_match = ("", int(m.group(1)), stamp)
+
+    if empty_match is not None:
+        entries.append(empty_match)
+    return entries, bad_lines
+
+
+def _parse_log_text(fp: Path) -> Tuple[List[Entry], int]:
+    """Line-by-line parser used when a file cannot be memory-mapped.
+
+    The file is read once: a leading BOM is stripped and every line is decoded
+    on its own, dropping undecodable bytes from that line only. Returns the
+    entries and the number of lines that needed recovery.
+    """
+    bad_lines = 0
+
+    def decoded_lines() -> Iterator[str]:
+        nonlocal bad_lines
+        with fp.open("rb") as f:
+            for index, raw in enumerate(f):
+                if index == 0:
+                    raw = raw.removeprefix(_UTF8_BOM)
+                try:
+                    text = raw.decode("utf-8")
+                except UnicodeDecodeError:
+                    text = raw.decode("utf-8", errors="ignore")
+                    bad_lines += 1
+                # Text mode also treats a bare CR as a line break
+                yield from text.split("\r")
+
+    entries = parse_log_lines(decoded_lines())
+    return entries, bad_lines
+
+
+def is_compressed(fp: Path) -> bool:
+    return fp.suffix.lower() in COMPRESSED_OPENERS
+
+
+def _parse_log_stream(stream: BinaryIO) -> Tuple[List[Entry], int]:
+    """Scan a decompressing stream chunk by chunk with parse_log_buffer.
+
+    Each chunk is cut after its last newline and the partial line is carried
+    into the next one, so every line is scanned whole. Later chunks start
+    with a newline so only the real file start is checked for a BOM.
+    """
+    entries: List[Entry] = []
+    bad_lines = 0
+    carry = b""
+    while True:
+        chunk = stream.read(STREAM_CHUNK)
+        if not chunk:
+            break
+        buf = carry + chunk
+        cut = buf.rfind(b"\n") + 1
+        if cut:
+            found, bad = parse_log_buffer(buf, 0, cut)
+            entries.extend(found)
+            bad_lines += bad
+            carry = b"\n" + buf[cut:]
+        else:
+            carry = buf
+    if carry.strip(b"\n"):
+        found, bad = parse_log_buffer(carry)
+        entries.extend(found)
+        bad_lines += bad
+    return entries, bad_lines
+
+
+def parse_log_file(fp: Path) -> Tuple[List[Entry], int]:
+    """Parse one log file for its (service, loading_time_ms) entries.
+
+    The file is memory-mapped and scanned with parse_log_buffer; the line
+    parser is used for files that cannot be mapped. .gz/.bz2/.xz logs are
+    decompressed in memory while being scanned. Either way the file is read
+    once. Returns the entries and the count of undecodable lines.
     """
-    files = sorted(dir_path.glob(file_glob))
-    all_entries: List[Tuple[str, int]] = []
-    for fp in files:
+    opener = COMPRESSED_OPENERS.get(fp.suffix.lower())
+    if opener is not None:
         try:
-            # Use utf-8-sig to strip BOM so the first line matches the pattern
-            try:
-                with fp.open("r", encoding="utf-8-sig", errors="strict") as f:
-                    all_entries.extend(parse_log_lines(f))
-            except UnicodeError:
-                # Fallback to utf-8 with ignore if encoding is inconsistent
-                with fp.open("r", encoding="utf-8", errors="ignore") as f:
-                    all_entries.extend(parse_log_lines(f))
+            with opener(fp, "rb") as stream:
+                return _parse_log_stream(stream)
         except FileNotFoundError:
-            continue
+            return [], 0
+    try:
+        with fp.open("rb") as f:
+            try:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped and hold no entries
+                return [], 0
+            except OSError:
+                return _parse_log_text(fp)
+            with buf:
+                return parse_log_buffer(buf)
+    except FileNotFoundError:
+        return [], 0
 
-    if not all_entries:
-        return 0
 
-    out_path = out_path or (dir_path / "summary.csv")
+def _region_digest(buf: bytes | mmap.mmap, end: int) -> str:
+    """Hash the first and last DIGEST_WINDOW bytes of ``buf[:end]``."""
+    digest = hashlib.sha1(str(end).encode("ascii"))
+    digest.update(buf[: min(end, DIGEST_WINDOW)])
+    digest.update(buf[max(0, end - DIGEST_WINDOW):end])
+    return digest.hexdigest()
+
+
+def _read_fragment(fragment: Path) -> List[Entry]:
+    with fragment.open("r", encoding="utf-8", newline="") as fh:
+        return [(row[0], int(row[1]), int(row[2])) for row in csv.reader(fh)]
+
+
+def parse_log_cached(
+    fp: Path, entry: Dict[str, object] | None, fragment: Path
+) -> Tuple[List[Entry], int, Dict[str, object] | None]:
+    """Parse one log file, reusing a previously cached parse when possible.
+
+    Rows from complete lines are kept in the ``fragment`` CSV and described by
+    the manifest ``entry`` (size, mtime, parsed offset and a digest of the
+    parsed bytes). An unchanged file is served from the fragment without being
+    opened; a file that only grew is parsed from the cached offset. The last
+    line is re-parsed on every change since a writer may still be extending
+    it. Returns the entries, the undecodable line count and the new entry
+    (None when the file cannot be cached).
+    """
+    try:
+        st = fp.stat()
+    except FileNotFoundError:
+        return [], 0, None
+
+    if (
+        entry is not None
+        and entry.get("size") == st.st_size
+        and entry.get("mtime_ns") == st.st_mtime_ns
+        and fragment.exists()
+    ):
+        tail = [tuple(row) for row in entry["tail"]]
+        bad_lines = int(entry["bad_lines"]) + int(entry["tail_bad"])
+        return _read_fragment(fragment) + tail, bad_lines, entry
+
+    if is_compressed(fp):
+        # A compressed log cannot be resumed at an offset: parse it whole
+        entries, bad_lines = parse_log_file(fp)
+        fragment.parent.mkdir(parents=True, exist_ok=True)
+        with fragment.open("w", encoding="utf-8", newline="") as fh:
+            csv.writer(fh).writerows(entries)
+        return entries, bad_lines, {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "offset": st.st_size,
+            "digest": "",
+            "bad_lines": bad_lines,
+            "tail": [],
+            "tail_bad": 0,
+        }
+
+    with fp.open("rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file: nothing parsed yet, nothing to keep
+            buf = b""
+        except OSError:
+            entries, bad_lines = parse_log_file(fp)
+            return entries, bad_lines, None
+        try:
+            start = 0
+            entries: List[Entry] = []
+            bad_lines = 0
+            if (
+                entry is not None
+                and fragment.exists()
+                and int(entry["offset"]) <= len(buf)
+                and _region_digest(buf, int(entry["offset"])) == entry["digest"]
+            ):
+                # Append-only growth: keep what was parsed and resume
+                start = int(entry["offset"])
+                entries = _read_fragment(fragment)
+                bad_lines = int(entry["bad_lines"])
+
+            tail_start = max(start, buf.rfind(b"\n", start) + 1)
+            new_entries, new_bad = parse_log_buffer(buf, start, tail_start)
+            tail, tail_bad = parse_log_buffer(buf, tail_start)
+
+            fragment.parent.mkdir(parents=True, exist_ok=True)
+            with fragment.open("a" if start else "w", encoding="utf-8", newline="") as fh:
+                csv.writer(fh).writerows(new_entries)
+
+            new_entry: Dict[str, object] = {
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "offset": tail_start,
+                "digest": _region_digest(buf, tail_start),
+                "bad_lines": bad_lines + new_bad,
+                "tail": [list(row) for row in tail],
+                "tail_bad": tail_bad,
+            }
+        finally:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+    entries.extend(new_entries)
+    entries.extend(tail)
+    return entries, bad_lines + new_bad + tail_bad, new_entry
+
+
+def parse_log_shared(
+    fp: Path, fragment: Path
+) -> Tuple[List[Entry], int, Dict[str, object] | None]:
+    """Parse a log stored in the blob store, sharing the result by content.
+
+    ``fragment`` is named after the content digest, so once any data folder
+    has parsed the blob every other one reads the rows from it. Blobs are
+    immutable, so the whole file (last line included) goes in the fragment;
+    a sidecar .json holds the undecodable line count and marks it complete.
+    """
+    try:
+        st = fp.stat()
+    except FileNotFoundError:
+        return [], 0, None
+    meta_path = fragment.with_suffix(".json")
+    try:
+        with meta_path.open("r", encoding="utf-8") as fh:
+            bad_lines = int(json.load(fh)["bad_lines"])
+        entries = _read_fragment(fragment)
+    except (FileNotFoundError, ValueError, KeyError):
+        entries, bad_lines = parse_log_file(fp)
+        fragment.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = fragment.with_name(f"{fragment.name}.{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8", newline="") as fh:
+            csv.writer(fh).writerows(entries)
+        os.replace(tmp_path, fragment)
+        tmp_path = meta_path.with_name(f"{meta_path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as fh:
+            json.dump({"bad_lines": bad_lines}, fh)
+        os.replace(tmp_path, meta_path)
+    entry: Dict[str, object] = {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "blob": fragment.stem,
+        "bad_lines": bad_lines,
+    }
+    return entries, bad_lines, entry
+
+
+def _parse_task(
+    fp: Path, entry: Dict[str, object] | None, fragment: Path, shared: bool
+) -> Tuple[List[Entry], int, Dict[str, object] | None]:
+    if shared:
+        return parse_log_shared(fp, fragment)
+    return parse_log_cached(fp, entry, fragment)
+
+
+class ParseCache:
+    """Per-dataset cache of parsed log files, kept in the dataset manifest.
+
+    ``entries`` maps a log path to its manifest entry; fragments with the
+    parsed rows live under ``fragment_dir``. Files with a known content
+    digest in ``blobs`` use the fragments under ``shared_dir`` instead (see
+    parse_log_shared); ``shared`` counts files served from another data
+    folder's parse.
+    """
+
+    def __init__(
+        self,
+        fragment_dir: Path,
+        entries: Dict[str, Dict[str, object]],
+        shared_dir: Path | None = None,
+        blobs: Dict[Path, str] | None = None,
+    ):
+        self.fragment_dir = fragment_dir
+        self.previous = entries
+        self.entries: Dict[str, Dict[str, object]] = {}
+        self.shared_dir = shared_dir / f"v{FRAGMENT_FORMAT}" if shared_dir else None
+        self.blobs = blobs or {}
+        self.shared = 0
+
+    @staticmethod
+    def key(fp: Path) -> str:
+        return fp.resolve().as_posix()
+
+    def fragment_for(self, key: str) -> Path:
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+        return self.fragment_dir / f"{name}.frag"
+
+    def task(self, fp: Path) -> Tuple[Path, Dict[str, object] | None, Path, bool]:
+        key = self.key(fp)
+        previous = self.previous.get(key)
+        digest = self.blobs.get(fp)
+        if digest is None or self.shared_dir is None:
+            return fp, previous, self.fragment_for(key), False
+        fragment = self.shared_dir / digest[:2] / f"{digest}.frag"
+        if (previous is None or previous.get("blob") != digest) and fragment.with_suffix(
+            ".json"
+        ).exists():
+            self.shared += 1
+        return fp, previous, fragment, True
+
+    def record(self, fp: Path, entry: Dict[str, object] | None) -> bool:
+        """Keep the entry for this run; returns True when it was unchanged."""
+        if entry is None:
+            return False
+        key = self.key(fp)
+        self.entries[key] = entry
+        return entry == self.previous.get(key)
+
+    def prune(self) -> None:
+        """Drop fragments of files not seen in this run or now kept as blobs."""
+        stale = set(self.previous) - set(self.entries)
+        stale.update(key for key, entry in self.entries.items() if "blob" in entry)
+        for key in stale:
+            self.fragment_for(key).unlink(missing_ok=True)
+
+
+def resolve_jobs(jobs: int | None) -> int:
+    """Return the worker count to use; None means one worker per CPU."""
+    if jobs is None:
+        return os.cpu_count() or 1
+    return max(1, jobs)
+
+
+def _ordered_map(func: Callable[..., T], tasks: List[Tuple], jobs: int | None) -> Iterator[T]:
+    """Run ``func(*task)`` for each task, yielding results in task order.
+
+    With more than one job the tasks are fanned out to a process pool. Only a
+    small window of tasks is in flight at once, which keeps memory bounded
+    regardless of how many tasks there are.
+    """
+    workers = min(resolve_jobs(jobs), len(tasks))
+    if workers <= 1:
+        for task in tasks:
+            yield func(*task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future] = deque()
+        remaining = iter(tasks)
+        for task in islice(remaining, workers * 2):
+            pending.append(pool.submit(func, *task))
+        while pending:
+            result = pending.popleft().result()
+            next_task = next(remaining, None)
+            if next_task is not None:
+                pending.append(pool.submit(func, *next_task))
+            yield result
+
+
+def parse_files(
+    files: List[Path], jobs: int | None = None
+) -> Iterator[Tuple[List[Entry], int]]:
+    """Yield ``parse_log_file`` results per file, in the order of ``files``.
+
+    Results keep input order even when parsed in a process pool, so output
+    stays identical to a serial run.
+    """
+    yield from _ordered_map(parse_log_file, [(fp,) for fp in files], jobs)
+
+
+def iter_entries(
+    files: List[Path],
+    jobs: int | None = None,
+    stats: Dict[str, int] | None = None,
+    cache: ParseCache | None = None,
+) -> Iterator[Row]:
+    """Stream (service, loading_time_ms, time_ms, run) rows from all files in order.
+
+    ``run`` is the index of the row's file in ``files``. When ``stats`` is
+    given, "files", "bad_lines" and "cached" counters are added to it. With
+    a ``cache``, unchanged files are served from their cached fragments and
+    grown files are parsed from their last offset.
+    """
+    if cache is None:
+        results = (
+            (entries, bad_lines, None) for entries, bad_lines in parse_files(files, jobs)
+        )
+    else:
+        results = _ordered_map(_parse_task, [cache.task(fp) for fp in files], jobs)
+    for run, (fp, (entries, bad_lines, entry)) in enumerate(zip(files, results)):
+        unchanged = cache is not None and cache.record(fp, entry)
+        if stats is not None:
+            stats["cached"] = stats.get("cached", 0) + int(unchanged)
+            stats["files"] = stats.get("files", 0) + 1
+            stats["bad_lines"] = stats.get("bad_lines", 0) + bad_lines
+        yield from ((service, ms, stamp, run) for service, ms, stamp in entries)
+
+
+def collect_samples(
+    rows: Iterable[Row],
+    samples: Dict[str, array],
+    detail: Dict[str, Tuple[array, array]] | None = None,
+) -> Iterator[Row]:
+    """Pass rows through while appending each value to ``samples[service]``.
+
+    Values are kept in compact int64 arrays, in order of first appearance.
+    ``detail`` optionally receives the matching (time_ms, run) int32 arrays.
+    """
+    for row in rows:
+        service, ms, stamp, run = row
+        values = samples.get(service)
+        if values is None:
+            values = samples[service] = array("q")
+            if detail is not None:
+                detail[service] = (array("i"), array("i"))
+        values.append(ms)
+        if detail is not None:
+            times, runs = detail[service]
+            times.append(stamp)
+            runs.append(run)
+        yield row
+
+
+def write_summary(rows: Iterable[Row], out_path: Path) -> int:
+    """Stream rows into a summary CSV in bounded batches.
+
+    Columns are service, loading_time_ms, time_ms (ms since midnight from the
+    log timestamp) and run (index into runs.csv). The file is written next to
+    ``out_path`` and moved into place when done; nothing is left behind when
+    there are no rows. Returns the row count.
+    """
     out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    count = 0
+    rows = iter(rows)
+    with tmp_path.open("w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(SUMMARY_HEADER)
+        while True:
+            batch = list(islice(rows, WRITE_BATCH_ROWS))
+            if not batch:
+                break
+            writer.writerows(batch)
+            count += len(batch)
+
+    if count == 0:
+        tmp_path.unlink()
+        return 0
+    os.replace(tmp_path, out_path)
+    return count
+
+
+def write_runs(files: List[Path], out_path: Path) -> None:
+    """Write the run index (run, file) that summary.csv rows refer to."""
     with out_path.open("w", newline="", encoding="utf-8") as csvfile:
         writer = csv.writer(csvfile)
-        writer.writerow(["service", "loading_time_ms"])
-        writer.writerows(all_entries)
+        writer.writerow(["run", "file"])
+        writer.writerows(enumerate(fp.name for fp in files))
+
 
-    return len(all_entries)
+def process_dir(
+    dir_path: Path,
+    file_glob: str,
+    out_path: Path | None = None,
+    jobs: int | None = None,
+    stats: Dict[str, int] | None = None,
+    cache: ParseCache | None = None,
+    files: List[Path] | None = None,
+    samples: Dict[str, array] | None = None,
+    detail: Dict[str, Tuple[array, array]] | None = None,
+) -> int:
+    """Process a PerformanceLog directory and write summary.csv.
+
+    Rows are streamed from the parser straight into the CSV, so memory stays
+    flat however large the input is. ``jobs`` sets the number of parser
+    processes (default: CPU count); ``stats`` collects file and undecodable
+    line counts; ``cache`` enables incremental parsing (see ParseCache).
+    ``files`` may supply the already-listed log files instead of globbing;
+    ``samples`` and ``detail`` receive the parsed values per service (see
+    collect_samples). The runs.csv index is written next to ``out_path``.
+    Returns the number of rows written (excluding header).
+    """
+    if files is None:
+        files = sorted(dir_path.glob(file_glob))
+    out_path = out_path or (dir_path / "summary.csv")
+    rows = iter_entries(files, jobs, stats, cache)
+    if samples is not None:
+        rows = collect_samples(rows, samples, detail)
+    count = write_summary(rows, out_path)
+    runs_path = out_path.with_name(RUNS_FILENAME)
+    if count:
+        write_runs(files, runs_path)
+    else:
+        runs_path.unlink(missing_ok=True)
+    return count
 
 
 def main() -> int:
@@ -80,6 +660,12 @@ def main() -> int:
         action="store_true",
         help="Combine the three generated summaries into result/summary.csv with version headers",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of parser processes (default: CPU count)",
+    )
     args = parser.parse_args()
 
     if args.combine:
@@ -157,7 +743,7 @@ def main() -> int:
                 out_path = Path("result") / args.single_dir.parent.name / "summary.csv"
         except Exception:
             out_path = None
-        rows = process_dir(args.single_dir, args.pattern, out_path=out_path)
+        rows = process_dir(args.single_dir, args.pattern, out_path=out_path, jobs=args.jobs)
         if rows <= 0:
             print(f"No matching entries found in {args.single_dir} (pattern {args.pattern})")
         else:
@@ -176,7 +762,7 @@ def main() -> int:
     for d, pattern, outp in configs:
         if not d.exists():
             continue
-        rows = process_dir(d, pattern, out_path=outp)
+        rows = process_dir(d, pattern, out_path=outp, jobs=args.jobs)
         if rows > 0:
             print(f"Wrote {rows} data rows to {outp}")
             total_written += rows
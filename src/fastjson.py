@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional, the json module is the fallback
+    orjson = None
+
+
+def _default(value: object) -> object:
+    """Plain Python form of values neither encoder handles itself."""
+    if isinstance(value, (pd.Series, pd.Index)):
+        return value.to_numpy()
+    if isinstance(value, np.ndarray):
+        # Object and other dtypes orjson does not encode natively
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is pd.NA or value is pd.NaT:
+        return None
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _plain(value: object) -> object:
+    """Recursively convert value for the json module, NaN and infinities as None."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, (str, int, bool)) or value is None:
+        return value
+    return _plain(_default(value))
+
+
+def dumps(value: object) -> bytes:
+    """Encode value as compact UTF-8 JSON with sorted keys.
+
+    NumPy arrays and scalars and pandas Series/Index are encoded as lists
+    and numbers; NaN and infinities become null. Uses orjson when it is
+    installed and the json module otherwise.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            value,
+            default=_default,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(
+        _plain(value), separators=(",", ":"), sort_keys=True, ensure_ascii=False, allow_nan=False
+    ).encode("utf-8")
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Dict
+
+
+# Bump when the manifest layout changes; older manifests are then ignored
+MANIFEST_VERSION = 2
+MANIFEST_DIRNAME = ".spm"
+MANIFEST_FILENAME = "manifest.json"
+
+
+def cache_root(result_root: Path) -> Path:
+    """Return the hidden folder that holds the manifest and cached fragments."""
+    return result_root / MANIFEST_DIRNAME
+
+
+def load_manifest(result_root: Path) -> Dict[str, object]:
+    """Load the dataset manifest, or return an empty one when missing or stale."""
+    path = cache_root(result_root) / MANIFEST_FILENAME
+    try:
+        with path.open("r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (FileNotFoundError, ValueError):
+        return {"version": MANIFEST_VERSION}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION}
+    return data
+
+
+def save_manifest(result_root: Path, manifest: Dict[str, object]) -> None:
+    """Write the dataset manifest atomically."""
+    root = cache_root(result_root)
+    root.mkdir(parents=True, exist_ok=True)
+    path = root / MANIFEST_FILENAME
+    tmp_path = path.with_name(path.name + ".tmp")
+    manifest["version"] = MANIFEST_VERSION
+    with tmp_path.open("w", encoding="utf-8") as fh:
+        json.dump(manifest, fh)
+    os.replace(tmp_path, path)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Generic, Hashable, List, Tuple, TypeVar
+
+V = TypeVar("V")
+
+# Files under a dataset folder that a fingerprint covers
+FINGERPRINT_SUFFIXES = {".csv", ".parquet", ".npy", ".npz", ".json", ".db"}
+
+
+def tree_fingerprint(root: Path) -> Tuple[Tuple[str, int, int], ...]:
+    """(relative path, mtime_ns, size) of the data files under root, sorted.
+
+    Hidden entries (the .spm manifest and cache) and *.tmp/*.old folders
+    left by interrupted writers are skipped. A missing root has an empty
+    fingerprint.
+    """
+    found: List[Tuple[str, int, int]] = []
+    pending = [root]
+    while pending:
+        folder = pending.pop()
+        try:
+            entries = list(os.scandir(folder))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            if entry.name.startswith(".") or entry.name.endswith((".tmp", ".old")):
+                continue
+            if entry.is_dir():
+                pending.append(Path(entry.path))
+            elif Path(entry.name).suffix in FINGERPRINT_SUFFIXES:
+                stat = entry.stat()
+                found.append(
+                    (Path(entry.path).relative_to(root).as_posix(), stat.st_mtime_ns, stat.st_size)
+                )
+    return tuple(sorted(found))
+
+
+def json_size(value: object) -> int:
+    """Approximate the memory of a JSON-like value by its serialized length."""
+    return len(json.dumps(value, separators=(",", ":"), default=str))
+
+
+class ModelCache(Generic[V]):
+    """Thread-safe LRU cache of values built from files on disk.
+
+    Each key holds one value with the fingerprint of the files it was built
+    from. ``get`` with the same fingerprint is a hit. A changed fingerprint
+    is served stale while one background thread rebuilds the value
+    (stale-while-revalidate); a key never seen is built in the caller. The
+    least recently used values are evicted to keep the summed ``sizeof``
+    within ``budget`` bytes; a value larger than the budget is not kept.
+    """
+
+    def __init__(self, budget: int, sizeof: Callable[[V], int] = json_size):
+        self.budget = budget
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, Tuple[object, V, int]]" = OrderedDict()
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0, "errors": 0}
+
+    def get(
+        self,
+        key: Hashable,
+        fingerprint: object,
+        build: Callable[[], V],
+        allow_stale: bool = True,
+    ) -> Tuple[V, str]:
+        """Return (value, "hit" | "stale" | "miss") for key.
+
+        With ``allow_stale`` False an outdated value is rebuilt in the
+        caller, as a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry[0] == fingerprint:
+                    self._counts["hits"] += 1
+                    return entry[1], "hit"
+            if entry is not None and allow_stale:
+                self._counts["stale"] += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    threading.Thread(
+                        target=self._refresh, args=(key, fingerprint, build), daemon=True
+                    ).start()
+                return entry[1], "stale"
+            self._counts["misses"] += 1
+        value = build()
+        self._store(key, fingerprint, value)
+        return value, "miss"
+
+    def _refresh(self, key: Hashable, fingerprint: object, build: Callable[[], V]) -> None:
+        try:
+            value = build()
+        except Exception:
+            # Drop the stale value so the next request rebuilds and reports the error
+            with self._lock:
+                self._counts["errors"] += 1
+                self._entries.pop(key, None)
+            return
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+        self._store(key, fingerprint, value)
+
+    def _store(self, key: Hashable, fingerprint: object, value: V) -> None:
+        size = self._sizeof(value)
+        with self._lock:
+            self._entries.pop(key, None)
+            if size > self.budget:
+                return
+            self._entries[key] = (fingerprint, value, size)
+            used = sum(item[2] for item in self._entries.values())
+            while used > self.budget:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                used -= evicted
+                self._counts["evictions"] += 1
+
+    def discard(self, key: Hashable) -> None:
+        """Drop key and every tuple key whose first item is key."""
+        with self._lock:
+            for stored in list(self._entries):
+                if stored == key or (isinstance(stored, tuple) and stored[:1] == (key,)):
+                    del self._entries[stored]
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/stale/eviction/error counts plus current entries and bytes."""
+        with self._lock:
+            return {
+                **self._counts,
+                "entries": len(self._entries),
+                "bytes": sum(item[2] for item in self._entries.values()),
+                "budget": self.budget,
+            }
@@ -2,17 +2,31 @@ from __future__ import annotations
 
 import csv
 import os
+import sys
+from itertools import groupby
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ModuleNotFoundError:  # pragma: no cover - optional, CSV outputs only
+    pa = pq = None
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 DEFAULT_RESULT_ROOT = BASE_DIR / "result"
-RESULT_ROOT = (
-    Path(os.environ["SPM_RESULT_ROOT"])
-    if "SPM_RESULT_ROOT" in os.environ
-    else DEFAULT_RESULT_ROOT
-)
+
+# Allow imports from src.* when run as a script (python src/report.py)
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from src.samplearrays import SAMPLE_ARRAYS_DIR, load_sample_arrays
+
+# Long-format samples (dataset, version, service, loading_time_ms) in Parquet
+SAMPLES_TABLE = "samples.parquet"
 
 EXCLUDED_SERVICES = {
     "EIP2",
@@ -31,67 +45,442 @@ def _to_int(s: str) -> int | None:
         return None
 
 
-def _avg(vals: List[int]) -> int:
-    return round(sum(vals) / len(vals)) if vals else 0
+# Tail percentiles reported next to avg/max/min/median
+PERCENTILES = (90, 95, 99)
+STAT_METRICS = ["avg", "max", "min", "median", *(f"p{q}" for q in PERCENTILES)]
+STAT_LABELS = ["Average", "Max", "Min", "Median", *(f"P{q}" for q in PERCENTILES)]
 
 
-def _min(vals: List[int]) -> int:
-    return min(vals) if vals else 0
+def _sort_within_groups(values: np.ndarray, group_ids: np.ndarray) -> np.ndarray:
+    """Sort every contiguous group of values in one pass, keeping group order."""
+    low = int(values.min())
+    span = int(values.max()) - low + 1
+    if span * (int(group_ids[-1]) + 1) < 2**62:
+        # (group, value) packed into one int64 key: a single radix-friendly sort
+        keys = group_ids * span + (values - low)
+        keys.sort()
+        return keys - group_ids * span + low
+    return values[np.lexsort((values, group_ids))]
 
 
-def _max(vals: List[int]) -> int:
-    return max(vals) if vals else 0
+def group_stats(values: Sequence[int], offsets: Sequence[int]) -> Dict[str, np.ndarray]:
+    """Stats of the contiguous groups ``values[offsets[i]:offsets[i + 1]]``.
 
+    Returns int64 "count" and "total" arrays plus unrounded float arrays
+    keyed by STAT_METRICS: "avg" is the mean, "median" the middle rank (the
+    mean of the two middle ranks for an even count) and percentile q
+    interpolates linearly between the ranks around (n - 1) * q / 100.
+    Empty groups get 0. All groups are sorted at once and each statistic
+    is an index gather.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    counts = np.diff(offsets)
+    stats: Dict[str, np.ndarray] = {"count": counts}
+    if not len(values):
+        stats["total"] = np.zeros(len(counts), dtype=np.int64)
+        stats.update({metric: np.zeros(len(counts)) for metric in STAT_METRICS})
+        return stats
 
-def _median(vals: List[int]) -> int:
-    if not vals:
-        return 0
-    s = sorted(vals)
-    n = len(s)
-    mid = n // 2
-    if n % 2 == 1:
-        return s[mid]
-    return round((s[mid - 1] + s[mid]) / 2)
+    group_ids = np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+    ordered = _sort_within_groups(values, group_ids)
+    totals = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(ordered, out=totals[1:])
+    filled = counts > 0
+    starts = offsets[:-1]
+    last = np.maximum(counts - 1, 0)
 
+    def at(index: np.ndarray) -> np.ndarray:
+        return ordered[np.minimum(starts + index, len(values) - 1)]
+
+    def where_filled(result: np.ndarray) -> np.ndarray:
+        return np.where(filled, result, 0.0)
+
+    stats["total"] = totals[offsets[1:]] - totals[starts]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        stats["avg"] = where_filled(stats["total"] / counts)
+    stats["max"] = where_filled(at(last))
+    stats["min"] = where_filled(at(np.zeros_like(counts)))
+    stats["median"] = where_filled((at(last // 2) + at(counts // 2)) / 2)
+    for q in PERCENTILES:
+        pos = last * q / 100
+        lo = pos.astype(np.int64)
+        below = at(lo)
+        stats[f"p{q}"] = where_filled(below + (at(np.minimum(lo + 1, last)) - below) * (pos - lo))
+    return stats
+
+
+def _rounded(column: np.ndarray) -> List[int]:
+    """Round half to even (like round()) into plain ints for CSV output."""
+    return np.rint(column).astype(np.int64).tolist()
+
+
+def concat_groups(groups: List[List[Sequence[int]]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatenate groups, each a list of sample chunks, into (values, offsets)."""
+    lengths = np.array([sum(len(vals) for vals in chunks) for chunks in groups], dtype=np.int64)
+    offsets = np.zeros(len(groups) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    arrays = [np.asarray(vals, dtype=np.int64) for chunks in groups for vals in chunks if len(vals)]
+    values = np.concatenate(arrays) if arrays else np.empty(0, dtype=np.int64)
+    return values, offsets
+
+
+# Groups with more samples than this get exact stats from streaming_stats
+# instead of being copied and sorted in memory
+STREAMING_THRESHOLD = 10_000_000
+# Samples read (as int64) per step while streaming a group
+STREAM_CHUNK = 1 << 22
+# Counting bins per value interval and pass of select_ranks
+RADIX_BINS = 1 << 16
+
+
+def iter_chunks(chunks: List[Sequence[int]]):
+    """Yield a group's samples as int64 arrays of at most STREAM_CHUNK values."""
+    for vals in chunks:
+        for start in range(0, len(vals), STREAM_CHUNK):
+            yield np.asarray(vals[start : start + STREAM_CHUNK], dtype=np.int64)
+
+
+def select_ranks(
+    chunks: List[Sequence[int]], ranks: Sequence[int], low: int, high: int
+) -> Dict[int, int]:
+    """Return {rank: value} of 0-based ranks in the sorted samples, exactly.
+
+    ``low``/``high`` are the samples' min and max. Each pass counts the
+    samples inside every unresolved rank's value interval into RADIX_BINS
+    bins and narrows the interval to the bin holding the rank, until bins
+    are one value wide. Memory is RADIX_BINS counts per interval whatever
+    the sample count; a span of up to RADIX_BINS values (65 s of
+    milliseconds) takes a single pass, any int32 span two.
+    """
+    pending = {rank: (low, high, rank) for rank in ranks}
+    found: Dict[int, int] = {}
+    while pending:
+        widths = {(lo, hi): -(-(hi - lo + 1) // RADIX_BINS) for lo, hi, _ in pending.values()}
+        hists = {interval: np.zeros(RADIX_BINS, dtype=np.int64) for interval in widths}
+        for values in iter_chunks(chunks):
+            for (lo, hi), hist in hists.items():
+                inside = values[(values >= lo) & (values <= hi)]
+                hist += np.bincount((inside - lo) // widths[(lo, hi)], minlength=RADIX_BINS)
+        for rank, (lo, hi, offset) in list(pending.items()):
+            cumulative = np.cumsum(hists[(lo, hi)])
+            idx = int(np.searchsorted(cumulative, offset, side="right"))
+            if idx:
+                offset -= int(cumulative[idx - 1])
+            width = widths[(lo, hi)]
+            lo += idx * width
+            hi = min(lo + width - 1, hi)
+            if lo == hi:
+                found[rank] = lo
+                del pending[rank]
+            else:
+                pending[rank] = (lo, hi, offset)
+    return found
+
+
+def streaming_stats(chunks: List[Sequence[int]]) -> Dict[str, float]:
+    """Exact group_stats of one group of sample chunks, read piecewise.
+
+    Chunks are read STREAM_CHUNK values at a time (memory-mapped arrays are
+    never loaded whole) and order statistics come from select_ranks, so
+    memory is bounded by the counting bins rather than the sample count.
+    Results equal group_stats for the concatenated chunks.
+    """
+    count = total = 0
+    low = high = 0
+    for values in iter_chunks(chunks):
+        if not len(values):
+            continue
+        low = int(values.min()) if not count else min(low, int(values.min()))
+        high = int(values.max()) if not count else max(high, int(values.max()))
+        count += len(values)
+        total += int(values.sum())
+    stats: Dict[str, float] = {"count": count, "total": total}
+    if not count:
+        stats.update({metric: 0.0 for metric in STAT_METRICS})
+        return stats
+
+    last = count - 1
+    positions = {q: last * q / 100 for q in PERCENTILES}
+    ranks = {last // 2, count // 2}
+    for pos in positions.values():
+        ranks.update((int(pos), min(int(pos) + 1, last)))
+    at = select_ranks(chunks, sorted(ranks), low, high)
+
+    stats["avg"] = total / count
+    stats["max"] = float(high)
+    stats["min"] = float(low)
+    stats["median"] = (at[last // 2] + at[count // 2]) / 2
+    for q, pos in positions.items():
+        lo = int(pos)
+        below = at[lo]
+        stats[f"p{q}"] = below + (at[min(lo + 1, last)] - below) * (pos - lo)
+    return stats
+
+
+def stats_of_groups(
+    groups: List[List[Sequence[int]]], threshold: int = STREAMING_THRESHOLD
+) -> Dict[str, np.ndarray]:
+    """group_stats of groups given as lists of sample chunks.
+
+    Groups of up to ``threshold`` samples are concatenated and sorted
+    together; larger ones go through streaming_stats straight from their
+    chunks, so a service too big to copy and sort in RAM still gets exact
+    stats.
+    """
+    sizes = [sum(len(vals) for vals in chunks) for chunks in groups]
+    large = [idx for idx, size in enumerate(sizes) if size > threshold]
+    if not large:
+        return group_stats(*concat_groups(groups))
+    skipped = set(large)
+    stats = group_stats(
+        *concat_groups([[] if idx in skipped else chunks for idx, chunks in enumerate(groups)])
+    )
+    for idx in large:
+        for key, value in streaming_stats(groups[idx]).items():
+            stats[key][idx] = value
+    return stats
+
+
+# Width of the time windows in rollup_5min.csv
+ROLLUP_BUCKET_MS = 5 * 60 * 1000
+ROLLUP_COLUMNS = ["count", "avg", "min", "max", "median", "p95"]
+ALL_SERVICES = "*"
+
+
+def _rollup_groups(
+    keys: np.ndarray, codes: np.ndarray, values: np.ndarray, code_count: int
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """group_stats of values grouped by (key, service code).
+
+    Returns the keys and codes of the groups, sorted by key then code, and
+    their stats. One stable argsort of the packed (key, code) makes every
+    group contiguous for group_stats.
+    """
+    packed = keys * code_count + codes
+    if packed.min() >= 0 and packed.max() < 1 << 16:
+        # Stable argsort of 16-bit keys is a linear-time radix sort
+        order = np.argsort(packed.astype(np.uint16), kind="stable")
+    else:
+        order = np.argsort(packed, kind="stable")
+    packed = packed[order]
+    starts = np.flatnonzero(np.diff(packed, prepend=packed[0] - 1))
+    groups = packed[starts]
+    stats = group_stats(values[order], np.append(starts, len(packed)))
+    return groups // code_count, groups % code_count, stats
 
-def main() -> int:
-    src = RESULT_ROOT / "summary.csv"
-    if not src.exists():
-        print(f"Missing input: {src}")
-        return 1
 
-    # Read combined summary and gather raw values per version and per service
-    versions: List[str] = []
-    per_version_values: Dict[str, List[int]] = {}
-    per_service_values: Dict[str, Dict[str, List[int]]] = {}
+def _rollup_rows(
+    keys: np.ndarray, codes: np.ndarray, stats: Dict[str, np.ndarray], names: List[str]
+) -> Iterator[Tuple[int, str, List[int]]]:
+    """Yield (key, service, ROLLUP_COLUMNS values) of _rollup_groups output.
 
+    ``names`` maps codes to services, the last one being ALL_SERVICES.
+    Within a key, services keep their order in the samples and the "*" row
+    follows the first service it covers.
+    """
+    rows = list(zip(*(_rounded(stats[column]) for column in ROLLUP_COLUMNS)))
+    key_list, code_list = keys.tolist(), codes.tolist()
+    star = len(names) - 1
+    for key, members in groupby(range(len(key_list)), key=key_list.__getitem__):
+        members = list(members)
+        if code_list[members[-1]] == star:
+            *members, star_idx = members
+            first = next(
+                pos
+                for pos, idx in enumerate(members)
+                if names[code_list[idx]] not in EXCLUDED_SERVICES
+            )
+            members.insert(first + 1, star_idx)
+        for idx in members:
+            yield key, names[code_list[idx]], list(rows[idx])
+
+
+def write_rollups(
+    out_dir: Path,
+    samples: Mapping[str, Sequence[int]],
+    detail: Mapping[str, Tuple[Sequence[int], Sequence[int]]],
+    run_names: Sequence[str],
+) -> None:
+    """Write per-run and per-5-minute rollups of one version's samples.
+
+    ``detail`` holds the (time_ms, run) of each value in ``samples``. Each
+    file has one row per service and group plus a "*" row over all services
+    except EXCLUDED_SERVICES, matching summary_stats.csv. Samples are
+    grouped with integer (run or window, service) keys and summarized by
+    group_stats.
+    """
+    names = [*samples, ALL_SERVICES]
+    star = len(names) - 1
+    parts: List[Tuple[np.ndarray, ...]] = []
+    for code, (service, vals) in enumerate(samples.items()):
+        values = np.asarray(vals, dtype=np.int64)
+        if not len(values):
+            continue
+        times, runs = (np.asarray(column, dtype=np.int64) for column in detail[service])
+        parts.append((values, times, runs, np.full(len(values), code, dtype=np.int64)))
+        if service not in EXCLUDED_SERVICES:
+            parts.append((values, times, runs, np.full(len(values), star, dtype=np.int64)))
+
+    run_rows: Iterable[Tuple[int, str, List[int]]] = []
+    bucket_rows: Iterable[Tuple[int, str, List[int]]] = []
+    if parts:
+        values, times, runs, codes = (np.concatenate(column) for column in zip(*parts))
+        run_rows = _rollup_rows(*_rollup_groups(runs, codes, values, len(names)), names)
+        buckets = times // ROLLUP_BUCKET_MS
+        bucket_rows = _rollup_rows(*_rollup_groups(buckets, codes, values, len(names)), names)
+
+    with (out_dir / "rollup_runs.csv").open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["run", "file", "service", *ROLLUP_COLUMNS])
+        for run, service, row in run_rows:
+            writer.writerow([run, run_names[run], service, *row])
+
+    with (out_dir / "rollup_5min.csv").open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["window_start", "service", *ROLLUP_COLUMNS])
+        for bucket, service, row in bucket_rows:
+            start = bucket * ROLLUP_BUCKET_MS // 60_000
+            label = f"{start // 60:02d}:{start % 60:02d}"
+            writer.writerow([label, service, *row])
+
+
+def _resolve_result_root() -> Path:
+    env_value = os.environ.get("SPM_RESULT_ROOT")
+    if env_value:
+        return Path(env_value)
+    return DEFAULT_RESULT_ROOT
+
+
+def load_summary(src: Path) -> Tuple[List[str], Dict[str, Dict[str, List[int]]]]:
+    """Read a combined summary.csv into (versions, {version: {service: values}}).
+
+    Raises ValueError when the header is not a combined summary header.
+    """
     with src.open("r", encoding="utf-8", newline="") as f:
         reader = csv.reader(f)
         header = next(reader, None)
         if not header or header[0] != "service":
-            print("Invalid header: expected first column to be 'service'")
-            return 1
+            raise ValueError("Invalid header: expected first column to be 'service'")
         versions = header[1:]
-        per_version_values = {v: [] for v in versions}
+        samples: Dict[str, Dict[str, List[int]]] = {v: {} for v in versions}
 
         for row in reader:
             if not row:
                 continue
             service = row[0].strip()
-            if service in EXCLUDED_SERVICES:
-                continue
-            if service not in per_service_values:
-                per_service_values[service] = {v: [] for v in versions}
             for i, v in enumerate(versions, start=1):
                 if i >= len(row):
                     continue
                 val = _to_int(row[i])
                 if val is None:
                     continue
-                per_version_values[v].append(val)
-                per_service_values[service][v].append(val)
+                samples[v].setdefault(service, []).append(val)
+    return versions, samples
+
+
+def write_samples_table(
+    samples: Mapping[str, Mapping[str, Sequence[int]]],
+    out_path: Path,
+    dataset: str,
+    versions: List[str] | None = None,
+) -> bool:
+    """Write samples as a long-format Parquet table next to summary.csv.
+
+    dataset, version and service are dictionary-encoded and loading_time_ms
+    is int32, so the table loads far faster than the ragged wide CSV.
+    Services are coded in order of first appearance across ``versions``.
+    Returns False (writing nothing) when pyarrow is not installed.
+    """
+    if pa is None:
+        return False
+    versions = list(versions) if versions is not None else sorted(samples)
+    service_codes: Dict[str, int] = {}
+    chunks: List[np.ndarray] = []
+    service_ids: List[int] = []
+    version_ids: List[int] = []
+    lengths: List[int] = []
+    for version_id, version in enumerate(versions):
+        for service, vals in samples.get(version, {}).items():
+            if not len(vals):
+                continue
+            chunks.append(np.asarray(vals, dtype=np.int64))
+            service_ids.append(service_codes.setdefault(service, len(service_codes)))
+            version_ids.append(version_id)
+            lengths.append(len(vals))
+
+    values = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+    total = len(values)
+    table = pa.table(
+        {
+            "dataset": pa.DictionaryArray.from_arrays(
+                pa.array(np.zeros(total, dtype=np.int32)), pa.array([dataset])
+            ),
+            "version": pa.DictionaryArray.from_arrays(
+                pa.array(np.repeat(np.array(version_ids, dtype=np.int32), lengths)),
+                pa.array(versions, type=pa.string()),
+            ),
+            "service": pa.DictionaryArray.from_arrays(
+                pa.array(np.repeat(np.array(service_ids, dtype=np.int32), lengths)),
+                pa.array(list(service_codes), type=pa.string()),
+            ),
+            # Safe cast: fails loudly instead of wrapping values past int32
+            "loading_time_ms": pa.array(values).cast(pa.int32()),
+        }
+    )
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, out_path)
+    return True
+
+
+def load_samples_table(src: Path) -> Tuple[List[str], Dict[str, Dict[str, np.ndarray]]]:
+    """Read samples.parquet into (versions, {version: {service: value array}})."""
+    if pq is None:
+        raise ValueError(f"pyarrow is required to read {src.name}")
+    table = pq.read_table(src, columns=["version", "service", "loading_time_ms"])
+    column = table.unify_dictionaries().column("version")
+    versions = column.chunk(0).dictionary.to_pylist() if column.num_chunks else []
+    samples: Dict[str, Dict[str, np.ndarray]] = {v: {} for v in versions}
+    frame = table.to_pandas()
+    for (version, service), vals in frame.groupby(
+        ["version", "service"], observed=True, sort=False
+    )["loading_time_ms"]:
+        samples[version][service] = vals.to_numpy()
+    return versions, samples
+
+
+def main(
+    samples: Mapping[str, Mapping[str, Sequence[int]]],
+    out_dir: Path,
+    versions: List[str] | None = None,
+) -> int:
+    """Write summary_stats.csv and service_stats.csv from in-memory samples.
+
+    ``samples`` maps version -> service -> loading times; services keep their
+    order of first appearance across ``versions`` (default: sorted keys).
+    Stats of every (service, version) and every version are computed by
+    stats_of_groups: one vectorized pass each, with groups past
+    STREAMING_THRESHOLD samples streamed instead of sorted.
+    """
+    versions = list(versions) if versions is not None else sorted(samples)
+
+    services = list(
+        dict.fromkeys(
+            service
+            for v in versions
+            for service in samples.get(v, {})
+            if service not in EXCLUDED_SERVICES
+        )
+    )
+    per_version = [samples.get(v, {}) for v in versions]
+    service_stats = stats_of_groups(
+        [[by_service.get(s, ())] for s in services for by_service in per_version]
+    )
+    version_stats = stats_of_groups(
+        [[by_service.get(s, ()) for s in services] for by_service in per_version]
+    )
 
-    out_dir = RESULT_ROOT
     out_dir.mkdir(parents=True, exist_ok=True)
 
     # Overall per-version stats
@@ -99,10 +488,8 @@ def main() -> int:
     with overall_path.open("w", encoding="utf-8", newline="") as f:
         writer = csv.writer(f)
         writer.writerow(["metric", *versions])
-        writer.writerow(["Average", *[_avg(per_version_values[v]) for v in versions]])
-        writer.writerow(["Max", *[_max(per_version_values[v]) for v in versions]])
-        writer.writerow(["Min", *[_min(per_version_values[v]) for v in versions]])
-        writer.writerow(["Median", *[_median(per_version_values[v]) for v in versions]])
+        for label, metric in zip(STAT_LABELS, STAT_METRICS):
+            writer.writerow([label, *_rounded(version_stats[metric])])
 
     # Per-service stats
     service_stats_path = out_dir / "service_stats.csv"
@@ -110,15 +497,15 @@ def main() -> int:
         writer = csv.writer(f)
         cols: List[str] = ["service"]
         for v in versions:
-            cols += [f"{v}_avg", f"{v}_max", f"{v}_min", f"{v}_median"]
+            cols += [f"{v}_{metric}" for metric in STAT_METRICS]
         writer.writerow(cols)
 
-        # Preserve service appearance order by iterating over input dict
-        for service, per_ver in per_service_values.items():
+        # Groups run service-major, so each service's versions are contiguous
+        columns = [_rounded(service_stats[metric]) for metric in STAT_METRICS]
+        for idx, service in enumerate(services):
             row: List[object] = [service]
-            for v in versions:
-                vals = per_ver.get(v, [])
-                row += [_avg(vals), _max(vals), _min(vals), _median(vals)]
+            for group in range(idx * len(versions), (idx + 1) * len(versions)):
+                row += [column[group] for column in columns]
             writer.writerow(row)
 
     print(f"Wrote overall stats to {overall_path}")
@@ -126,5 +513,43 @@ def main() -> int:
     return 0
 
 
+def cli() -> int:
+    """Compute stats from result/ (or $SPM_RESULT_ROOT) samples.
+
+    Reads the memory-mapped sample arrays when present, so groups past
+    STREAMING_THRESHOLD are streamed from disk; else samples.parquet when
+    readable, else summary.csv.
+    """
+    result_root = _resolve_result_root()
+    table = result_root / SAMPLES_TABLE
+    src = result_root / "summary.csv"
+    try:
+        arrays = load_sample_arrays(result_root / SAMPLE_ARRAYS_DIR)
+    except (FileNotFoundError, ValueError):
+        arrays = None
+    if arrays is not None:
+        samples = {
+            version: {
+                service: arrays.group(service_id, version_id)
+                for service_id, service in enumerate(arrays.services)
+                if arrays.group(service_id, version_id).size
+            }
+            for version_id, version in enumerate(arrays.versions)
+        }
+        return main(samples, result_root, arrays.versions)
+    if table.exists() and pq is not None:
+        versions, samples = load_samples_table(table)
+        return main(samples, result_root, versions)
+    if not src.exists():
+        print(f"Missing input: {src}")
+        return 1
+    try:
+        versions, samples = load_summary(src)
+    except ValueError as exc:
+        print(exc)
+        return 1
+    return main(samples, result_root, versions)
+
+
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(cli())
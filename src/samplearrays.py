@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+
+# Folder of .npy sample arrays next to summary.csv (see write_sample_arrays)
+SAMPLE_ARRAYS_DIR = "arrays"
+ARRAYS_FORMAT = 1
+NAMES_FILENAME = "names.json"
+
+# Codes are stored as int16
+MAX_CODES = int(np.iinfo(np.int16).max) + 1
+
+
+class SampleArrays:
+    """A dataset's samples as flat arrays sorted by (service, version).
+
+    ``values`` (int32), ``service_codes`` and ``version_codes`` (int16) have
+    one entry per sample. The samples of service s and version v are
+    ``values[offsets[s * len(versions) + v]:offsets[s * len(versions) + v + 1]]``.
+    Loaded with mmap_mode="r", the arrays are read-only views of the files,
+    so server processes share one page-cache copy instead of private frames.
+    """
+
+    def __init__(
+        self,
+        versions: List[str],
+        services: List[str],
+        values: np.ndarray,
+        service_codes: np.ndarray,
+        version_codes: np.ndarray,
+        offsets: np.ndarray,
+    ):
+        self.versions = versions
+        self.services = services
+        self.values = values
+        self.service_codes = service_codes
+        self.version_codes = version_codes
+        self.offsets = offsets
+
+    def group_bounds(self, service_id: int, version_id: int) -> Tuple[int, int]:
+        idx = service_id * len(self.versions) + version_id
+        return int(self.offsets[idx]), int(self.offsets[idx + 1])
+
+    def group(self, service_id: int, version_id: int) -> np.ndarray:
+        start, stop = self.group_bounds(service_id, version_id)
+        return self.values[start:stop]
+
+    def counts(self) -> np.ndarray:
+        """Return samples per group as a (services, versions) array."""
+        return np.diff(self.offsets).reshape(len(self.services), len(self.versions))
+
+    def sums(self) -> np.ndarray:
+        """Return the int64 sum of each group as a (services, versions) array.
+
+        Each group is summed where it lies (NumPy accumulates in int64
+        through a small buffer), so no sample-sized array is allocated.
+        """
+        bounds = self.offsets.tolist()
+        sums = np.array(
+            [
+                self.values[start:stop].sum(dtype=np.int64)
+                for start, stop in zip(bounds, bounds[1:])
+            ],
+            dtype=np.int64,
+        )
+        return sums.reshape(len(self.services), len(self.versions))
+
+
+def write_sample_arrays(
+    samples: Mapping[str, Mapping[str, Sequence[int]]],
+    out_dir: Path,
+    versions: List[str] | None = None,
+) -> None:
+    """Write samples as .npy arrays under out_dir, replacing any previous set.
+
+    Services are coded in order of first appearance across ``versions``
+    (default: sorted keys), versions in list order. Raises ValueError when
+    there are more codes than int16 holds or a value does not fit in int32.
+    """
+    versions = list(versions) if versions is not None else sorted(samples)
+    service_ids: Dict[str, int] = {}
+    for version in versions:
+        for service in samples.get(version, {}):
+            service_ids.setdefault(service, len(service_ids))
+    if len(service_ids) > MAX_CODES or len(versions) > MAX_CODES:
+        raise ValueError("Too many services or versions for int16 sample codes")
+
+    chunks: List[np.ndarray] = []
+    lengths: List[int] = []
+    for service in service_ids:
+        for version in versions:
+            vals = np.asarray(samples.get(version, {}).get(service, ()), dtype=np.int64)
+            chunks.append(vals)
+            lengths.append(len(vals))
+    values = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+    info = np.iinfo(np.int32)
+    if len(values) and (values.min() < info.min or values.max() > info.max):
+        raise ValueError("Sample values do not fit in int32")
+    counts = np.array(lengths, dtype=np.int64)
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    groups = np.arange(len(counts))
+    arrays = {
+        "values": values.astype(np.int32),
+        "service_codes": np.repeat((groups // max(len(versions), 1)).astype(np.int16), counts),
+        "version_codes": np.repeat((groups % max(len(versions), 1)).astype(np.int16), counts),
+        "offsets": offsets,
+    }
+
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    for name, array in arrays.items():
+        np.save(tmp_dir / f"{name}.npy", array)
+    with (tmp_dir / NAMES_FILENAME).open("w", encoding="utf-8") as fh:
+        json.dump(
+            {"format": ARRAYS_FORMAT, "versions": versions, "services": list(service_ids)}, fh
+        )
+    # Readers keep mapping the old files until they reopen the folder
+    old_dir = out_dir.with_name(out_dir.name + ".old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if out_dir.exists():
+        os.replace(out_dir, old_dir)
+    os.replace(tmp_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def load_sample_arrays(src_dir: Path, mmap_mode: str | None = "r") -> SampleArrays:
+    """Open the arrays written by write_sample_arrays (memory-mapped by default).
+
+    Raises FileNotFoundError when the folder is incomplete and ValueError
+    when its format is unknown.
+    """
+    with (src_dir / NAMES_FILENAME).open("r", encoding="utf-8") as fh:
+        names = json.load(fh)
+    if names.get("format") != ARRAYS_FORMAT:
+        raise ValueError(f"Unsupported sample arrays: {src_dir}")
+    loaded = {
+        name: np.load(src_dir / f"{name}.npy", mmap_mode=mmap_mode)
+        for name in ("values", "service_codes", "version_codes", "offsets")
+    }
+    arrays = SampleArrays(names["versions"], names["services"], **loaded)
+    if len(arrays.offsets) != len(arrays.services) * len(arrays.versions) + 1:
+        raise ValueError(f"Sample arrays offsets do not match their names: {src_dir}")
+    return arrays
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from src.report import EXCLUDED_SERVICES, PERCENTILES, stats_of_groups
+
+
+# Optional indexed copy of a dataset's samples, next to summary.csv
+SAMPLES_DB = "samples.db"
+SCHEMA_VERSION = 2
+
+# Stats columns of service_stats and version_stats, after the group key
+STATS_COLUMNS = ["count", "total", "min", "max", "median", *(f"p{q}" for q in PERCENTILES)]
+
+_SCHEMA = """
+CREATE TABLE versions (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE services (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE samples (
+    service_id INTEGER NOT NULL,
+    version_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    loading_time_ms INTEGER NOT NULL,
+    PRIMARY KEY (service_id, version_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE service_stats (
+    service_id INTEGER NOT NULL,
+    version_id INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    min INTEGER NOT NULL,
+    max INTEGER NOT NULL,
+    median REAL NOT NULL,
+    p90 REAL NOT NULL,
+    p95 REAL NOT NULL,
+    p99 REAL NOT NULL,
+    PRIMARY KEY (service_id, version_id)
+) WITHOUT ROWID;
+CREATE TABLE version_stats (
+    version_id INTEGER PRIMARY KEY,
+    count INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    min INTEGER NOT NULL,
+    max INTEGER NOT NULL,
+    median REAL NOT NULL,
+    p90 REAL NOT NULL,
+    p95 REAL NOT NULL,
+    p99 REAL NOT NULL
+);
+"""
+
+
+def _insert_stats(
+    conn: sqlite3.Connection,
+    table: str,
+    keys: List[Tuple[int, ...]],
+    groups: List[List[Sequence[int]]],
+) -> None:
+    """Insert key + STATS_COLUMNS rows for groups of sample chunks."""
+    stats = stats_of_groups(groups)
+    columns = [
+        stats[column].astype(int).tolist() if column in ("min", "max") else stats[column].tolist()
+        for column in STATS_COLUMNS
+    ]
+    width = len(keys[0]) + len(columns) if keys else 0
+    conn.executemany(
+        f"INSERT INTO {table} VALUES ({', '.join('?' * width)})",
+        [(*key, *values) for key, *values in zip(keys, *columns)],
+    )
+
+
+def write_samples_db(
+    samples: Mapping[str, Mapping[str, Sequence[int]]],
+    out_path: Path,
+    versions: List[str] | None = None,
+) -> None:
+    """Write samples and their per-group stats to an SQLite database.
+
+    Samples are clustered on (service_id, version_id), so every lookup of
+    one service, or one service and version, is an index range scan. The
+    service_stats table holds STATS_COLUMNS per service and version, as
+    computed (unrounded) by report.stats_of_groups; version_stats the same per
+    version over all services except EXCLUDED_SERVICES. Service ids follow
+    first appearance across ``versions`` (default: sorted keys), like the
+    combined summary.csv.
+    """
+    versions = list(versions) if versions is not None else sorted(samples)
+    service_ids: Dict[str, int] = {}
+    for version in versions:
+        for service in samples.get(version, {}):
+            service_ids.setdefault(service, len(service_ids))
+
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + _SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.executemany("INSERT INTO versions VALUES (?, ?)", enumerate(versions))
+        conn.executemany(
+            "INSERT INTO services VALUES (?, ?)", ((i, s) for s, i in service_ids.items())
+        )
+        group_keys: List[Tuple[int, ...]] = []
+        groups: List[List[Sequence[int]]] = []
+        per_version: Dict[int, List[Sequence[int]]] = {}
+        for service, service_id in service_ids.items():
+            for version_id, version in enumerate(versions):
+                vals = samples.get(version, {}).get(service)
+                if vals is None or not len(vals):
+                    continue
+                conn.executemany(
+                    "INSERT INTO samples VALUES (?, ?, ?, ?)",
+                    ((service_id, version_id, seq, int(val)) for seq, val in enumerate(vals)),
+                )
+                group_keys.append((service_id, version_id))
+                groups.append([vals])
+                if service not in EXCLUDED_SERVICES:
+                    per_version.setdefault(version_id, []).append(vals)
+        _insert_stats(conn, "service_stats", group_keys, groups)
+        version_ids = sorted(per_version)
+        _insert_stats(
+            conn,
+            "version_stats",
+            [(version_id,) for version_id in version_ids],
+            [per_version[version_id] for version_id in version_ids],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, out_path)
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open a samples database read-only; ValueError if its schema is unknown."""
+    conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        conn.close()
+        raise ValueError(f"Unsupported samples database: {path}")
+    return conn
+
+
+def _stats_select(alias: str) -> str:
+    return ", ".join(f"{alias}.{column}" for column in STATS_COLUMNS)
+
+
+def versions(conn: sqlite3.Connection) -> List[str]:
+    return [name for (name,) in conn.execute("SELECT name FROM versions ORDER BY id")]
+
+
+def services(conn: sqlite3.Connection) -> List[str]:
+    """Return service names in order of first appearance."""
+    return [name for (name,) in conn.execute("SELECT name FROM services ORDER BY id")]
+
+
+def service_version_stats(
+    conn: sqlite3.Connection, service: str | None = None
+) -> List[Tuple[object, ...]]:
+    """Return (service, version, *STATS_COLUMNS) rows.
+
+    Rows follow service id then version order; ``service`` limits them to
+    one service.
+    """
+    query = (
+        f"SELECT s.name, v.name, {_stats_select('st')} "
+        "FROM service_stats AS st "
+        "JOIN services AS s ON s.id = st.service_id "
+        "JOIN versions AS v ON v.id = st.version_id"
+    )
+    params: Tuple[str, ...] = ()
+    if service is not None:
+        query += " WHERE s.name = ?"
+        params = (service,)
+    return conn.execute(query + " ORDER BY st.service_id, st.version_id", params).fetchall()
+
+
+def version_stats(conn: sqlite3.Connection) -> List[Tuple[object, ...]]:
+    """Return (version, *STATS_COLUMNS) rows in version order."""
+    return conn.execute(
+        f"SELECT v.name, {_stats_select('st')} "
+        "FROM version_stats AS st JOIN versions AS v ON v.id = st.version_id "
+        "ORDER BY st.version_id"
+    ).fetchall()
+
+
+def service_samples(conn: sqlite3.Connection, service: str) -> Dict[str, List[int]]:
+    """Return {version: loading times} of one service, in sample order."""
+    result: Dict[str, List[int]] = {}
+    rows: Iterable[Tuple[str, int]] = conn.execute(
+        "SELECT v.name, sm.loading_time_ms FROM samples AS sm "
+        "JOIN versions AS v ON v.id = sm.version_id "
+        "WHERE sm.service_id = (SELECT id FROM services WHERE name = ?) "
+        "ORDER BY sm.version_id, sm.seq",
+        (service,),
+    )
+    for version, value in rows:
+        result.setdefault(version, []).append(value)
+    return result
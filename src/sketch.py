@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import math
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+
+# Per (version, service) sketches of a dataset, next to summary.csv
+SKETCHES_FILENAME = "sketches.npz"
+SKETCH_FORMAT = 1
+
+# Quantile estimates are within 1% of the true sample value
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+
+class QuantileSketch:
+    """DDSketch-style quantile sketch with bounded relative error.
+
+    A positive value x is counted in bucket ceil(log_gamma(x)) with
+    gamma = (1 + a) / (1 - a); the bucket's estimate is within relative
+    accuracy a of every value it holds, so any quantile is too. Values of
+    zero or less (no loading time) are counted apart, as zero. Sketches
+    with the same accuracy merge by adding their bucket counts, without the
+    raw samples. Count, total, min and max are exact.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.key_offset = 0
+        self.buckets = np.zeros(0, dtype=np.int64)
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def _cover(self, low: int, high: int) -> None:
+        """Grow buckets so keys low..high are addressable."""
+        if not len(self.buckets):
+            self.key_offset = low
+            self.buckets = np.zeros(high - low + 1, dtype=np.int64)
+            return
+        start = min(low, self.key_offset)
+        stop = max(high, self.key_offset + len(self.buckets) - 1)
+        if start == self.key_offset and stop == self.key_offset + len(self.buckets) - 1:
+            return
+        grown = np.zeros(stop - start + 1, dtype=np.int64)
+        grown[self.key_offset - start : self.key_offset - start + len(self.buckets)] = self.buckets
+        self.key_offset = start
+        self.buckets = grown
+
+    def _update_totals(self, count: int, total: int, low: int, high: int) -> None:
+        if not count:
+            return
+        self.min = low if not self.count else min(self.min, low)
+        self.max = high if not self.count else max(self.max, high)
+        self.count += count
+        self.total += total
+
+    def add(self, values: Sequence[int]) -> "QuantileSketch":
+        """Count a batch of values; returns self."""
+        values = np.asarray(values, dtype=np.int64)
+        if not len(values):
+            return self
+        positive = values[values > 0]
+        self.zero_count += len(values) - len(positive)
+        if len(positive):
+            keys = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+            low, high = int(keys.min()), int(keys.max())
+            self._cover(low, high)
+            start = low - self.key_offset
+            self.buckets[start : start + high - low + 1] += np.bincount(keys - low)
+        self._update_totals(len(values), int(values.sum()), int(values.min()), int(values.max()))
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Add another sketch's counts into this one; returns self."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        if len(other.buckets):
+            high = other.key_offset + len(other.buckets) - 1
+            self._cover(other.key_offset, high)
+            start = other.key_offset - self.key_offset
+            self.buckets[start : start + len(other.buckets)] += other.buckets
+        self.zero_count += other.zero_count
+        self._update_totals(other.count, other.total, other.min, other.max)
+        return self
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the q-th percentile (0..100); None when the sketch is empty."""
+        if not self.count:
+            return None
+        rank = q / 100 * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        cumulative = np.cumsum(self.buckets)
+        idx = int(np.searchsorted(cumulative, rank - self.zero_count, side="right"))
+        idx = min(idx, len(self.buckets) - 1)
+        estimate = 2 * self.gamma ** (self.key_offset + idx) / (self.gamma + 1)
+        return float(min(max(estimate, self.min), self.max))
+
+
+def merge_sketches(sketches: Iterable[QuantileSketch]) -> QuantileSketch | None:
+    """Merge sketches into a new one; None when there are none."""
+    merged: QuantileSketch | None = None
+    for item in sketches:
+        if merged is None:
+            merged = QuantileSketch(item.relative_accuracy)
+        merged.merge(item)
+    return merged
+
+
+def write_sketches(
+    samples: Mapping[str, Mapping[str, Sequence[int]]],
+    out_path: Path,
+    versions: List[str] | None = None,
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+) -> int:
+    """Write one sketch per (version, service) to an .npz file.
+
+    Bucket counts of all sketches are concatenated into one array with
+    per-sketch offsets. Returns the number of sketches written.
+    """
+    versions = list(versions) if versions is not None else sorted(samples)
+    service_ids: Dict[str, int] = {}
+    keys: List[Tuple[int, int]] = []
+    sketches: List[QuantileSketch] = []
+    for version_id, version in enumerate(versions):
+        for service, vals in samples.get(version, {}).items():
+            if not len(vals):
+                continue
+            keys.append((version_id, service_ids.setdefault(service, len(service_ids))))
+            sketches.append(QuantileSketch(relative_accuracy).add(vals))
+
+    bucket_offsets = np.zeros(len(sketches) + 1, dtype=np.int64)
+    np.cumsum([len(s.buckets) for s in sketches], out=bucket_offsets[1:])
+    fields = {
+        "format": np.array(SKETCH_FORMAT),
+        "relative_accuracy": np.array(relative_accuracy),
+        "versions": np.array(versions, dtype=str),
+        "services": np.array(list(service_ids), dtype=str),
+        "keys": np.array(keys, dtype=np.int32).reshape(-1, 2),
+        "key_offsets": np.array([s.key_offset for s in sketches], dtype=np.int64),
+        "bucket_offsets": bucket_offsets,
+        "buckets": (
+            np.concatenate([s.buckets for s in sketches])
+            if sketches
+            else np.zeros(0, dtype=np.int64)
+        ),
+        "totals": np.array(
+            [[s.zero_count, s.count, s.total, s.min, s.max] for s in sketches], dtype=np.int64
+        ).reshape(-1, 5),
+    }
+    tmp_path = out_path.with_name(out_path.name + ".tmp.npz")
+    np.savez(tmp_path, **fields)
+    os.replace(tmp_path, out_path)
+    return len(sketches)
+
+
+def load_sketches(src: Path) -> Dict[Tuple[str, str], QuantileSketch]:
+    """Read a sketches file into {(version, service): sketch}.
+
+    Raises ValueError when the file's format is unknown.
+    """
+    with np.load(src, allow_pickle=False) as data:
+        if int(data["format"]) != SKETCH_FORMAT:
+            raise ValueError(f"Unsupported sketches file: {src}")
+        relative_accuracy = float(data["relative_accuracy"])
+        versions = data["versions"].tolist()
+        services = data["services"].tolist()
+        bucket_offsets = data["bucket_offsets"]
+        buckets = data["buckets"]
+        sketches: Dict[Tuple[str, str], QuantileSketch] = {}
+        for idx, ((version_id, service_id), key_offset, totals) in enumerate(
+            zip(data["keys"].tolist(), data["key_offsets"].tolist(), data["totals"].tolist())
+        ):
+            item = QuantileSketch(relative_accuracy)
+            item.key_offset = key_offset
+            item.buckets = buckets[bucket_offsets[idx] : bucket_offsets[idx + 1]].copy()
+            item.zero_count, item.count, item.total, item.min, item.max = totals
+            sketches[(versions[version_id], services[service_id])] = item
+    return sketches
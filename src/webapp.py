@@ -2,16 +2,20 @@ from __future__ import annotations
 
 import argparse
 import csv
+import functools
 import json
 import os
 import re
 import shutil
+import sqlite3
 import tempfile
+from contextlib import closing
 from html import escape
 from pathlib import Path
 from typing import Dict, List, Tuple
 import zipfile
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from flask import (
@@ -29,7 +33,11 @@ from flask import (
 
 from werkzeug.utils import secure_filename
 
-from spm import DEFAULT_DATA_DIR, generate_reports
+from spm import DEFAULT_DATA_DIR, generate_reports, store_data_folder
+from src import distributions, fastjson, modelcache, samplearrays, sampledb, sketch
+from src.report import SAMPLES_TABLE, STAT_METRICS, select_ranks
+from src.samplearrays import SAMPLE_ARRAYS_DIR
+from src.sampledb import SAMPLES_DB
 
 
 # Cached HTML for backend API docs
@@ -78,6 +86,12 @@ RESULT_DIR = _resolve_result_dir()
 DEFAULT_DATASET_NAME = os.environ.get("SPM_DEFAULT_DATASET")
 SUMMARY_FILE = RESULT_DIR / "summary.csv"
 
+# Memoized dashboard models per result folder (see _dataset_model)
+DASHBOARD_CACHE_MB = int(os.environ.get("SPM_DASHBOARD_CACHE_MB", "256"))
+_DATASET_MODELS: modelcache.ModelCache[Dict[str, object]] = modelcache.ModelCache(
+    DASHBOARD_CACHE_MB * 1024 * 1024
+)
+
 
 def configure_result_dirs(result_dir: Path, base_dir: Path, dataset_name: str | None) -> None:
     """Update the module-level paths when the CLI provides overrides."""
@@ -323,6 +337,7 @@ def delete_dataset() -> Response:
         result_recycle_base = RECYCLE_DIR / "result"
         result_dest = _unique_recycle_path(result_recycle_base, dataset_name)
         result_dest.parent.mkdir(parents=True, exist_ok=True)
+        _DATASET_MODELS.discard(str(result_src.resolve()))
         shutil.move(str(result_src), str(result_dest))
         moved["result"] = str(result_dest)
 
@@ -547,6 +562,8 @@ def import_dataset() -> Tuple[Response, int]:
         abort(500, "Failed to process uploaded dataset.")
 
     try:
+        # Logs already imported under another dataset are stored and parsed once
+        store_data_folder(data_root)
         generate_reports(data_root, result_root)
     except Exception as exc:  # pragma: no cover - defensive cleanup
         if data_root and data_root.exists():
@@ -582,249 +599,64 @@ def index() -> str:
         "selectedDataset": active_dataset or "",
         "datasetOptions": dataset_options,
         "apiDocsHtml": _load_backend_api_html(),
-        "endpoints": {
-            "csv": url_for("api_csv"),
-            "download": url_for("download_csv"),
-            "dashboard": url_for("api_dashboard"),
-            "analyticsBar": url_for("analytics_bardata"),
-            "importDataset": url_for("import_dataset"),
-            "deleteDataset": url_for("delete_dataset"),
-        },
+        "endpoints": _dashboard_endpoints(),
     }
 
     return render_template("index.html", initial_state=minimal_state)
 
 
-@app.get("/api/dashboard")
-def api_dashboard():
+def _json_response(payload: object) -> Response:
+    """JSON response encoded with fastjson: NumPy-aware, NaN as null, bytes directly."""
+    return Response(fastjson.dumps(payload), mimetype="application/json")
+
+
+def _dashboard_response(fields: List[str] | None):
     view_param = request.args.get("view", "analytics")
     try:
-        state = _build_dashboard_state(view_param, request.args.to_dict(flat=True))
+        state, cache_status = _build_dashboard_state(
+            view_param, request.args.to_dict(flat=True), fields
+        )
     except ValueError as exc:
         abort(400, str(exc))
     except FileNotFoundError as exc:
         abort(404, str(exc))
-    return jsonify(state)
-
-
-def _load_summary(result_dir: Path) -> Tuple[pd.DataFrame, List[str]]:
-    summary_path = result_dir / "summary.csv"
-    if not summary_path.exists():
-        raise FileNotFoundError("summary.csv not found. Generate it with extract.py --combine")
-
-    df = pd.read_csv(summary_path)
-    if "service" not in df.columns:
-        raise ValueError("summary.csv must contain a 'service' column")
-
-    df["service"] = df["service"].astype(str)
-    df = df[~df["service"].isin(EXCLUDED_SERVICES)]
-
-    numeric_cols = [c for c in df.columns if c != "service"]
-    if not numeric_cols:
-        raise ValueError("summary.csv must contain at least one version column")
-
-    df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce")
-    return df, numeric_cols
-
-
-def _prepare_summary(result_dir: Path) -> Tuple[pd.DataFrame, List[str], pd.DataFrame, List[str]]:
-    df, version_cols = _load_summary(result_dir)
-
-    melted = df.melt(
-        id_vars="service",
-        value_vars=version_cols,
-        var_name="version",
-        value_name="loading_time",
-    ).dropna(subset=["loading_time"])
-
-    if melted.empty:
-        raise ValueError("summary.csv does not contain numeric data")
-
-    service_order = (
-        df["service"]
-        .dropna()
-        .drop_duplicates()
-        .sort_values(key=lambda col: col.str.casefold())
-        .tolist()
-    )
-    return df, version_cols, melted, service_order
-
-
-def _load_service_stats(result_dir: Path) -> Tuple[pd.DataFrame, List[str]]:
-    stats_path = result_dir / "service_stats.csv"
-    if not stats_path.exists():
-        raise FileNotFoundError("service_stats.csv not found. Generate it with report.py")
-
-    stats_df = pd.read_csv(stats_path)
-    if "service" not in stats_df.columns:
-        raise ValueError("service_stats.csv must contain a 'service' column")
-
-    version_set = set()
-    for col in stats_df.columns:
-        if col == "service" or "_" not in col:
-            continue
-        version, metric = col.rsplit("_", 1)
-        if metric in {"avg", "min", "max", "median"}:
-            version_set.add(version)
-
-    versions = sorted(version_set)
-    stats_df = stats_df.set_index("service")
-    stats_df.index = stats_df.index.astype(str)
-    stats_df = stats_df[~stats_df.index.isin(EXCLUDED_SERVICES)]
-    return stats_df, versions
-
-
-def _build_bar_figure_from_wide(wide: pd.DataFrame, version_cols: List[str]) -> go.Figure:
-    fig = go.Figure()
-    y_max = 0.0
-    x_labels = wide.index.tolist()
-    for version in version_cols:
-        if version not in wide.columns:
-            continue
-        column = wide[version]
-        if column.isna().all():
-            continue
-        values = column.tolist()
-        fig.add_trace(
-            go.Bar(
-                x=x_labels,
-                y=values,
-                name=version,
-                text=[f"{v:.0f}" if pd.notna(v) else "" for v in values],
-                textposition="outside",
-            )
-        )
-        current_max = max([v for v in values if pd.notna(v)] or [0])
-        y_max = max(y_max, current_max)
-
-    if not fig.data:
-        return fig
-
-    y_buffer = y_max * 0.1 if y_max else 0
-    fig.update_yaxes(range=[0, y_max + y_buffer])
-    fig.update_layout(
-        title="Average Loading Time per Service (Grouped Bar)",
-        xaxis_title="Service",
-        yaxis_title="Average Loading Time (ms)",
-        margin=dict(l=30, r=20, t=60, b=80),
-        barmode="group",
-        legend_title="Version",
-    )
-    return fig
-
-
-def _validate_dataset_requirements(melted: pd.DataFrame) -> Tuple[List[str], str | None]:
-    warnings: List[str] = []
-    error: str | None = None
-
-    if melted.empty:
-        return warnings, error
-
-    cleaned = melted.copy()
-    cleaned["service"] = cleaned["service"].astype(str).str.strip()
+    response = _json_response(state)
+    if cache_status:
+        response.headers["X-Model-Cache"] = cache_status
+    return response
 
-    unique_services = sorted(cleaned["service"].dropna().unique())
-    service_count = len(unique_services)
-    if service_count != 24:
-        warnings.append(f"Warning: dataset must include 24 services, found {service_count}.")
-
-    service_counts = cleaned.groupby("service")["loading_time"].count()
-
-    auto_service = None
-    for service_name in service_counts.index:
-        if service_name.upper() == "AUTO TEST":
-            auto_service = service_name
-            break
 
-    if auto_service is None:
-        error = "Error: dataset is missing required 'AUTO TEST' service."
-        return warnings, error
+@app.get("/api/dashboard")
+def api_dashboard():
+    fields_param = request.args.get("fields")
+    fields = [f.strip() for f in fields_param.split(",") if f.strip()] if fields_param else None
+    return _dashboard_response(fields)
 
-    baseline = int(service_counts.get(auto_service, 0))
-    mismatched: List[str] = []
-    for service_name, count in service_counts.items():
-        count = int(count)
-        if service_name == auto_service:
-            continue
-        if count != baseline:
-            mismatched.append(f"{service_name} ({count} samples)")
 
-    if mismatched:
-        mismatch_list = ", ".join(mismatched)
-        warnings.append(
-            f"Warning: sample counts differ from AUTO TEST ({baseline} samples): {mismatch_list}."
-        )
+@app.get("/api/dashboard/overview")
+def api_dashboard_overview():
+    return _dashboard_response(OVERVIEW_FIELDS)
 
-    return warnings, error
 
+@app.get("/api/dashboard/box")
+def api_dashboard_box():
+    return _dashboard_response(BOX_FIELDS)
 
-    return warnings, error
 
+@app.get("/api/dashboard/compare")
+def api_dashboard_compare():
+    return _dashboard_response(COMPARE_FIELDS)
 
-def _build_box_from_stats(
-    stats_df: pd.DataFrame,
-    version: str,
-    service_order: List[str],
-) -> go.Figure | None:
-    required_cols = [f"{version}_" + metric for metric in ("min", "median", "avg", "max")]
-    if not all(col in stats_df.columns for col in required_cols):
-        return None
 
-    fig = go.Figure()
-    targets = service_order if service_order else stats_df.index.tolist()
-    if not service_order:
-        targets = sorted(stats_df.index.tolist(), key=lambda s: str(s).casefold())
-    for service in targets:
-        if service not in stats_df.index:
-            continue
-        row = stats_df.loc[service]
-        values = [row.get(col) for col in required_cols]
-        cleaned = [float(v) for v in values if pd.notna(v)]
-        if not cleaned:
-            continue
-        stats_tuple = (
-            row.get(required_cols[0]),
-            row.get(required_cols[1]),
-            row.get(required_cols[2]),
-            row.get(required_cols[3]),
-        )
-        customdata = [
-            [
-                stats_tuple[0],
-                stats_tuple[1],
-                stats_tuple[2],
-                stats_tuple[3],
-            ]
-        ] * len(cleaned)
-        fig.add_trace(
-            go.Box(
-                y=cleaned,
-                name=service,
-                boxpoints=False,
-                boxmean=True,
-                customdata=customdata,
-                hovertemplate=(
-                    "Service: %{x}<br>"
-                    "Min: %{customdata[0]:.0f} ms<br>"
-                    "Median: %{customdata[1]:.0f} ms<br>"
-                    "Average: %{customdata[2]:.0f} ms<br>"
-                    "Max: %{customdata[3]:.0f} ms"
-                    "<extra></extra>"
-                ),
-            )
-        )
+@app.get("/api/dashboard/reports")
+def api_dashboard_reports():
+    return _dashboard_response(REPORTS_FIELDS)
 
-    if not fig.data:
-        return None
 
-    fig.update_layout(
-        title=f"Service Loading Time Distribution ({version})",
-        yaxis_title="Loading Time (ms)",
-        xaxis_title="Service",
-        margin=dict(l=30, r=20, t=60, b=80),
-        showlegend=False,
-    )
-    return fig
+@app.get("/api/cache")
+def api_cache():
+    """Hit/miss counts and memory use of the dashboard model cache."""
+    return jsonify(_DATASET_MODELS.stats())
 
 
 @app.route("/view")
@@ -936,19 +768,59 @@ def api_csv():
     except FileNotFoundError:
         abort(404, "CSV not found")
 
-    rows = _read_csv_rows(target)
+    service_param = request.args.get("service")
+    if service_param is not None:
+        rows = _service_csv_rows(target, result_root, service_param)
+    else:
+        rows = _read_csv_rows(target)
     headers = rows[0] if rows else []
     data_rows = rows[1:] if len(rows) > 1 else []
-    return jsonify(
+    return _json_response(
         {
             "file": rel_path,
             "dataset": dataset_param or "",
+            "service": service_param or "",
             "headers": headers,
             "rows": data_rows,
         }
     )
 
 
+def _open_samples_db(result_dir: Path) -> sqlite3.Connection | None:
+    """Open result_dir's samples.db read-only, or None when absent or unreadable."""
+    db_path = result_dir / SAMPLES_DB
+    if not db_path.exists():
+        return None
+    try:
+        return sampledb.connect(db_path)
+    except (sqlite3.Error, ValueError):
+        return None
+
+
+def _service_csv_rows(target: Path, result_dir: Path, service: str) -> List[List[str]]:
+    """Return the header and the rows of one service (first column) of a CSV.
+
+    The combined summary.csv is answered from samples.db when present, an
+    indexed lookup instead of a scan of the whole file.
+    """
+    conn = None
+    if target == (result_dir / "summary.csv").resolve():
+        conn = _open_samples_db(result_dir)
+    if conn is None:
+        rows = _read_csv_rows(target)
+        return rows[:1] + [row for row in rows[1:] if row and row[0] == service]
+
+    with closing(conn):
+        versions = sampledb.versions(conn)
+        per_version = sampledb.service_samples(conn, service)
+    columns = [per_version.get(version, []) for version in versions]
+    depth = max((len(vals) for vals in columns), default=0)
+    rows = [["service", *versions]]
+    for idx in range(depth):
+        rows.append([service, *(str(vals[idx]) if idx < len(vals) else "" for vals in columns)])
+    return rows
+
+
 def _load_summary(result_dir: Path) -> Tuple[pd.DataFrame, List[str]]:
     summary_path = result_dir / "summary.csv"
     if not summary_path.exists():
@@ -969,30 +841,218 @@ def _load_summary(result_dir: Path) -> Tuple[pd.DataFrame, List[str]]:
     return df, numeric_cols
 
 
-def _prepare_summary(result_dir: Path) -> Tuple[pd.DataFrame, List[str], pd.DataFrame, List[str]]:
-    df, version_cols = _load_summary(result_dir)
+def _load_samples_table(result_dir: Path) -> Tuple[pd.DataFrame, List[str]] | None:
+    """Load samples.parquet as long (service, version, loading_time) rows.
+
+    Returns None when the table is missing or pyarrow is not installed, so
+    callers fall back to summary.csv.
+    """
+    table_path = result_dir / SAMPLES_TABLE
+    if not table_path.exists():
+        return None
+    try:
+        samples = pd.read_parquet(table_path, columns=["service", "version", "loading_time_ms"])
+    except ImportError:
+        return None
+    samples = samples.rename(columns={"loading_time_ms": "loading_time"})
+    version_cols = [str(v) for v in samples["version"].cat.categories]
+    samples = samples[~samples["service"].isin(EXCLUDED_SERVICES)]
+    return samples, version_cols
+
+
+def _summary_from_db(
+    conn: sqlite3.Connection,
+) -> Tuple[List[str], pd.DataFrame, pd.DataFrame, pd.Series]:
+    """Read _prepare_summary's aggregates from samples.db's stats tables."""
+    version_cols = sampledb.versions(conn)
+    groups = pd.DataFrame(
+        sampledb.service_version_stats(conn),
+        columns=["service", "version", *sampledb.STATS_COLUMNS],
+    )
+    groups = groups[~groups["service"].isin(EXCLUDED_SERVICES)]
+    groups["mean"] = groups["total"] / groups["count"]
+    version_stats = pd.DataFrame(
+        sampledb.version_stats(conn),
+        columns=["version", *sampledb.STATS_COLUMNS],
+    ).set_index("version")
+    version_stats["mean"] = version_stats["total"] / version_stats["count"]
+    services = pd.Series(
+        [s for s in sampledb.services(conn) if s not in EXCLUDED_SERVICES], dtype=object
+    )
+    return (
+        version_cols,
+        groups[["service", "version", "count", "mean"]].reset_index(drop=True),
+        version_stats[["mean", "max", "min", "median"]],
+        services,
+    )
+
+
+def _summary_from_arrays(
+    arrays: samplearrays.SampleArrays,
+    version_summaries: Dict[str, Dict[str, float]],
+) -> Tuple[List[str], pd.DataFrame, pd.DataFrame, pd.Series]:
+    """Compute _prepare_summary's aggregates from memory-mapped sample arrays.
+
+    Group counts and sums are read from the mapped arrays without copying
+    them. Version min, max and median come from ``version_summaries``
+    (distributions.npz); a version missing there, or whose count disagrees,
+    gets them by a streaming selection over its groups.
+    """
+    kept = [i for i, service in enumerate(arrays.services) if service not in EXCLUDED_SERVICES]
+    counts = arrays.counts()[kept]
+    sums = arrays.sums()[kept]
+    service_idx, version_idx = np.nonzero(counts)
+    group_counts = counts[service_idx, version_idx]
+    groups = pd.DataFrame(
+        {
+            "service": np.array(arrays.services, dtype=object)[kept][service_idx],
+            "version": np.array(arrays.versions, dtype=object)[version_idx],
+            "count": group_counts,
+            "mean": sums[service_idx, version_idx] / group_counts,
+        }
+    )
+
+    version_counts = counts.sum(axis=0).tolist()
+    version_totals = sums.sum(axis=0).tolist()
+    rows: Dict[str, Dict[str, float]] = {}
+    for version_id, version in enumerate(arrays.versions):
+        count = version_counts[version_id]
+        if not count:
+            continue
+        summary = version_summaries.get(version)
+        if summary is None or summary["count"] != count:
+            chunks = [arrays.group(service_id, version_id) for service_id in kept]
+            summary = _streamed_version_summary([vals for vals in chunks if len(vals)], count)
+        rows[version] = {
+            "mean": version_totals[version_id] / count,
+            "max": float(summary["max"]),
+            "min": float(summary["min"]),
+            "median": float(summary["median"]),
+        }
+    version_stats = pd.DataFrame.from_dict(
+        rows, orient="index", columns=["mean", "max", "min", "median"]
+    )
+    services = pd.Series([arrays.services[i] for i in kept], dtype=object)
+    return list(arrays.versions), groups, version_stats, services
+
+
+def _streamed_version_summary(chunks: List[np.ndarray], count: int) -> Dict[str, float]:
+    """Min, max and median of count samples in chunks, without concatenating them."""
+    low = min(int(vals.min()) for vals in chunks)
+    high = max(int(vals.max()) for vals in chunks)
+    middle = sorted({(count - 1) // 2, count // 2})
+    at = select_ranks(chunks, middle, low, high)
+    return {"min": low, "max": high, "median": (at[middle[0]] + at[middle[-1]]) / 2}
+
+
+def _load_version_summaries(result_dir: Path) -> Dict[str, Dict[str, float]]:
+    """Per-version summaries from distributions.npz; {} when unavailable."""
+    path = result_dir / distributions.DISTRIBUTIONS_FILENAME
+    if not path.exists():
+        return {}
+    try:
+        return distributions.load_version_summaries(path)
+    except ValueError:
+        return {}
+
+
+def _open_sample_arrays(result_dir: Path) -> samplearrays.SampleArrays | None:
+    """Memory-map result_dir's sample arrays, or None when absent or unreadable."""
+    arrays_dir = result_dir / SAMPLE_ARRAYS_DIR
+    if not arrays_dir.is_dir():
+        return None
+    try:
+        return samplearrays.load_sample_arrays(arrays_dir)
+    except (OSError, ValueError):
+        return None
+
 
-    melted = df.melt(
-        id_vars="service",
-        value_vars=version_cols,
-        var_name="version",
-        value_name="loading_time",
-    ).dropna(subset=["loading_time"])
+def _prepare_summary(
+    result_dir: Path,
+) -> Tuple[List[str], pd.DataFrame, pd.DataFrame, List[str]]:
+    """Return (versions, service/version groups, version stats, service order).
+
+    groups is long (service, version, count, mean); version stats has mean,
+    max, min and median per version over all services. Both leave out
+    EXCLUDED_SERVICES, and services are sorted case-insensitively. The
+    aggregates come from samples.db when present, else from the memory-mapped
+    sample arrays, else from samples.parquet or summary.csv.
+    """
+    conn = _open_samples_db(result_dir)
+    arrays = _open_sample_arrays(result_dir) if conn is None else None
+    if conn is not None or arrays is not None:
+        if conn is not None:
+            with closing(conn):
+                version_cols, groups, version_stats, services = _summary_from_db(conn)
+        else:
+            version_cols, groups, version_stats, services = _summary_from_arrays(
+                arrays, _load_version_summaries(result_dir)
+            )
+        if groups.empty:
+            raise ValueError("summary.csv does not contain numeric data")
+        service_order = services.sort_values(key=lambda col: col.str.casefold()).tolist()
+        return version_cols, groups, version_stats, service_order
+
+    loaded = _load_samples_table(result_dir)
+    if loaded is not None:
+        melted, version_cols = loaded
+        services = pd.Series([str(s) for s in melted["service"].unique()], dtype=object)
+    else:
+        df, version_cols = _load_summary(result_dir)
+        melted = df.melt(
+            id_vars="service",
+            value_vars=version_cols,
+            var_name="version",
+            value_name="loading_time",
+        ).dropna(subset=["loading_time"])
+        services = df["service"].dropna().drop_duplicates()
 
     if melted.empty:
         raise ValueError("summary.csv does not contain numeric data")
 
-    service_order = (
-        df["service"]
-        .dropna()
-        .drop_duplicates()
-        .sort_values(key=lambda col: col.str.casefold())
-        .tolist()
+    groups = (
+        melted.groupby(["service", "version"], observed=True)["loading_time"]
+        .agg(["count", "mean"])
+        .reset_index()
+    )
+    by_version = melted.groupby("version", observed=True)["loading_time"]
+    version_stats = pd.DataFrame(
+        {
+            "mean": by_version.mean(),
+            "max": by_version.max(),
+            "min": by_version.min(),
+            "median": by_version.median(),
+        }
     )
-    return df, version_cols, melted, service_order
+    version_stats.index = version_stats.index.astype(str)
+    service_order = services.sort_values(key=lambda col: col.str.casefold()).tolist()
+    return version_cols, groups, version_stats, service_order
+
+
+def _service_stats_from_db(conn: sqlite3.Connection) -> Tuple[pd.DataFrame, List[str]]:
+    """Build the service_stats.csv table (rounded like report.py) from samples.db."""
+    versions = sampledb.versions(conn)
+    columns = [f"{v}_{metric}" for v in versions for metric in STAT_METRICS]
+    rows: Dict[str, Dict[str, int]] = {}
+    for service, version, *values in sampledb.service_version_stats(conn):
+        if service in EXCLUDED_SERVICES:
+            continue
+        stats = dict(zip(sampledb.STATS_COLUMNS, values))
+        stats["avg"] = stats["total"] / stats["count"]
+        row = rows.setdefault(service, dict.fromkeys(columns, 0))
+        for metric in STAT_METRICS:
+            row[f"{version}_{metric}"] = round(stats[metric])
+    stats_df = pd.DataFrame.from_dict(rows, orient="index", columns=columns)
+    stats_df.index.name = "service"
+    return stats_df, sorted(versions)
 
 
 def _load_service_stats(result_dir: Path) -> Tuple[pd.DataFrame, List[str]]:
+    conn = _open_samples_db(result_dir)
+    if conn is not None:
+        with closing(conn):
+            return _service_stats_from_db(conn)
+
     stats_path = result_dir / "service_stats.csv"
     if not stats_path.exists():
         raise FileNotFoundError("service_stats.csv not found. Generate it with report.py")
@@ -1016,53 +1076,84 @@ def _load_service_stats(result_dir: Path) -> Tuple[pd.DataFrame, List[str]]:
     return stats_df, versions
 
 
-def _build_bar_figure_from_wide(wide: pd.DataFrame, version_cols: List[str]) -> go.Figure:
-    fig = go.Figure()
-    y_max = 0.0
-    x_labels = wide.index.tolist()
-    for version in version_cols:
-        if version not in wide.columns:
-            continue
-        column = wide[version]
-        if column.isna().all():
-            continue
-        values = column.tolist()
-        fig.add_trace(
-            go.Bar(
-                x=x_labels,
-                y=values,
-                name=version,
-                text=[f"{v:.0f}" if pd.notna(v) else "" for v in values],
-                textposition="outside",
-            )
-        )
-        current_max = max([v for v in values if pd.notna(v)] or [0])
-        y_max = max(y_max, current_max)
+@functools.lru_cache(maxsize=1)
+def _default_template() -> Dict[str, object]:
+    """The layout template plotly embeds in every figure it serializes."""
+    return json.loads(go.Figure().to_json())["layout"]["template"]
+
+
+def _figure_payload(
+    traces: List[Dict[str, object]], layout: Dict[str, object]
+) -> Dict[str, object]:
+    """Plotly figure JSON, as go.Figure(...).to_json() would produce it.
 
-    if not fig.data:
-        return fig
+    Figures are assembled as plain dicts, so no trace goes through plotly's
+    per-property validation or a to_json/json.loads round trip.
+    """
+    return {"data": traces, "layout": {**layout, "template": _default_template()}}
+
+
+def _json_rows(frame: pd.DataFrame) -> List[List[object]]:
+    """Rows of a frame as plain Python numbers, with NaN as None."""
+    return frame.astype(object).where(frame.notna(), None).values.tolist()
+
+
+def _plotted_versions(wide: pd.DataFrame, version_cols: List[str]) -> List[str]:
+    """Versions with at least one value in a service x version frame, in order."""
+    present = set(wide.columns[wide.notna().any()])
+    return [version for version in version_cols if version in present]
+
+
+def _layout_titles(title: str, xaxis_title: str, yaxis_title: str) -> Dict[str, object]:
+    return {
+        "title": {"text": title},
+        "xaxis": {"title": {"text": xaxis_title}},
+        "yaxis": {"title": {"text": yaxis_title}},
+        "margin": {"l": 30, "r": 20, "t": 60, "b": 80},
+    }
+
+
+def _build_bar_figure_from_wide(
+    wide: pd.DataFrame, version_cols: List[str]
+) -> Dict[str, object] | None:
+    columns = _plotted_versions(wide, version_cols)
+    if not columns:
+        return None
+
+    x_labels = wide.index.tolist()
+    traces = [
+        {
+            "name": version,
+            "text": [f"{v:.0f}" if v is not None else "" for v in values],
+            "textposition": "outside",
+            "type": "bar",
+            "x": x_labels,
+            "y": values,
+        }
+        for version, values in zip(columns, _json_rows(wide[columns].T))
+    ]
+    y_max = max(float(wide[columns].max().max()), 0.0)
 
     y_buffer = y_max * 0.1 if y_max else 0
-    fig.update_yaxes(range=[0, y_max + y_buffer])
-    fig.update_layout(
-        title="Average Loading Time per Service (Grouped Bar)",
-        xaxis_title="Service",
-        yaxis_title="Average Loading Time (ms)",
-        margin=dict(l=30, r=20, t=60, b=80),
-        barmode="group",
-        legend_title="Version",
+    layout = _layout_titles(
+        "Average Loading Time per Service (Grouped Bar)",
+        "Service",
+        "Average Loading Time (ms)",
     )
-    return fig
+    layout["yaxis"]["range"] = [0, y_max + y_buffer]
+    layout["barmode"] = "group"
+    layout["legend"] = {"title": {"text": "Version"}}
+    return _figure_payload(traces, layout)
 
 
-def _validate_dataset_requirements(melted: pd.DataFrame) -> Tuple[List[str], str | None]:
+def _validate_dataset_requirements(groups: pd.DataFrame) -> Tuple[List[str], str | None]:
     warnings: List[str] = []
     error: str | None = None
 
-    if melted.empty:
+    if groups.empty:
         return warnings, error
 
-    cleaned = melted.copy()
+    cleaned = groups.copy()
     cleaned["service"] = cleaned["service"].astype(str).str.strip()
 
     unique_services = sorted(cleaned["service"].dropna().unique())
@@ -1070,7 +1161,7 @@ def _validate_dataset_requirements(melted: pd.DataFrame) -> Tuple[List[str], str
     if service_count != 24:
         warnings.append(f"Warning: dataset must include 24 services, found {service_count}.")
 
-    service_counts = cleaned.groupby("service")["loading_time"].count()
+    service_counts = cleaned.groupby("service")["count"].sum()
 
     auto_service = None
     for service_name in service_counts.index:
@@ -1107,45 +1198,31 @@ def _build_box_from_stats(
     stats_df: pd.DataFrame,
     version: str,
     service_order: List[str],
-) -> go.Figure | None:
+) -> Dict[str, object] | None:
     required_cols = [f"{version}_" + metric for metric in ("min", "median", "avg", "max")]
     if not all(col in stats_df.columns for col in required_cols):
         return None
 
-    fig = go.Figure()
     targets = service_order if service_order else stats_df.index.tolist()
     if not service_order:
         targets = sorted(stats_df.index.tolist(), key=lambda s: str(s).casefold())
+    rows = stats_df[required_cols]
+    # min/median/avg/max of every service as plain numbers, NaN as None
+    by_service = dict(zip(rows.index, _json_rows(rows)))
+    traces: List[Dict[str, object]] = []
     for service in targets:
-        if service not in stats_df.index:
+        stats_tuple = by_service.get(service)
+        if stats_tuple is None:
             continue
-        row = stats_df.loc[service]
-        values = [row.get(col) for col in required_cols]
-        cleaned = [float(v) for v in values if pd.notna(v)]
+        cleaned = [float(v) for v in stats_tuple if v is not None]
         if not cleaned:
             continue
-        stats_tuple = (
-            row.get(required_cols[0]),
-            row.get(required_cols[1]),
-            row.get(required_cols[2]),
-            row.get(required_cols[3]),
-        )
-        customdata = [
-            [
-                stats_tuple[0],
-                stats_tuple[1],
-                stats_tuple[2],
-                stats_tuple[3],
-            ]
-        ] * len(cleaned)
-        fig.add_trace(
-            go.Box(
-                y=cleaned,
-                name=service,
-                boxpoints=False,
-                boxmean=True,
-                customdata=customdata,
-                hovertemplate=(
+        traces.append(
+            {
+                "boxmean": True,
+                "boxpoints": False,
+                "customdata": [stats_tuple] * len(cleaned),
+                "hovertemplate": (
                     "Service: %{x}<br>"
                     "Min: %{customdata[0]:.0f} ms<br>"
                     "Median: %{customdata[1]:.0f} ms<br>"
@@ -1153,108 +1230,115 @@ def _build_box_from_stats(
                     "Max: %{customdata[3]:.0f} ms"
                     "<extra></extra>"
                 ),
-            )
+                "name": service,
+                "type": "box",
+                "y": cleaned,
+            }
         )
 
-    if not fig.data:
+    if not traces:
         return None
 
-    fig.update_layout(
-        title=f"Service Loading Time Distribution ({version})",
-        yaxis_title="Loading Time (ms)",
-        xaxis_title="Service",
-        margin=dict(l=30, r=20, t=60, b=80),
-        showlegend=False,
+    layout = _layout_titles(
+        f"Service Loading Time Distribution ({version})", "Service", "Loading Time (ms)"
     )
-    return fig
+    layout["showlegend"] = False
+    return _figure_payload(traces, layout)
 
 
-def _build_dashboard_state(active_view: str, query_params: Dict[str, str]) -> Dict[str, object]:
-    view_mode = active_view if active_view in {"analytics", "reports", "compare", "api"} else "analytics"
-    dataset_param = query_params.get("dataset")
-    dataset_options = _available_datasets()
-    active_dataset = dataset_param or DEFAULT_DATASET_NAME
-    if not active_dataset and dataset_options:
-        active_dataset = dataset_options[0]
+def _load_distributions(
+    result_dir: Path,
+) -> Tuple[List[float], Dict[Tuple[str, str], Dict[str, object]]] | None:
+    """Return (histogram edges, summaries) of a dataset; None before they are generated."""
+    path = result_dir / distributions.DISTRIBUTIONS_FILENAME
+    if not path.exists():
+        return None
+    try:
+        edges, summaries = distributions.load_distributions(path)
+    except ValueError:
+        return None
+    return edges.tolist(), summaries
 
-    active_result_dir = _result_dir_for_dataset(active_dataset)
 
-    if active_dataset and active_dataset not in dataset_options:
-        dataset_options = sorted(set(dataset_options + [active_dataset]))
+def _build_box_from_distributions(
+    summaries: Dict[Tuple[str, str], Dict[str, object]],
+    version: str,
+    service_order: List[str],
+) -> Dict[str, object] | None:
+    """Box plot of one version drawn from precomputed quartiles and fences."""
+    by_service = {
+        service: summary
+        for (summary_version, service), summary in summaries.items()
+        if summary_version == version and service not in EXCLUDED_SERVICES
+    }
+    targets = service_order or sorted(by_service, key=lambda s: str(s).casefold())
 
-    selected_dataset = active_dataset or ""
+    traces: List[Dict[str, object]] = []
+    for service in targets:
+        summary = by_service.get(service)
+        if summary is None:
+            continue
+        trace: Dict[str, object] = {
+            "boxpoints": False,
+            "hovertext": [
+                f"{summary['count']} samples, min {summary['min']:.0f} ms, "
+                f"max {summary['max']:.0f} ms<br>"
+                f"Outliers: {summary['outliers_low']} low, {summary['outliers_high']} high"
+            ],
+            "name": service,
+            "orientation": "v",
+            "type": "box",
+            "x": [service],
+        }
+        for column in ("q1", "median", "q3", "lowerfence", "upperfence", "mean"):
+            trace[column] = [summary[column]]
+        traces.append(trace)
 
-    dataset_label = selected_dataset or "Current Dataset"
+    if not traces:
+        return None
 
-    report_paths = _list_csv_files_under(active_result_dir)
-    report_files = [p.relative_to(active_result_dir).as_posix() for p in report_paths]
+    layout = _layout_titles(
+        f"Service Loading Time Distribution ({version})", "Service", "Loading Time (ms)"
+    )
+    layout["showlegend"] = False
+    return _figure_payload(traces, layout)
 
-    # Group all CSVs under the selected dataset name as the single group label.
-    report_groups: Dict[str, List[str]] = {
-        dataset_label: sorted(report_files)
-    }
 
-    selected_report_param = query_params.get("report")
-    initial_report = (
-        selected_report_param
-        if selected_report_param and selected_report_param in report_files
-        else (report_files[0] if report_files else "")
-    )
+def _build_dataset_summary(result_dir: Path) -> Dict[str, object]:
+    """Aggregates of one dataset that every dashboard view starts from.
 
-    df, version_cols, melted, service_order = _prepare_summary(active_result_dir)
-    stats_df, stats_versions = _load_service_stats(active_result_dir)
+    Holds the versions, service order, data quality messages, version stats
+    and per-service mean loading times (the compare matrix, also the source
+    of the line and bar figures).
+    """
+    version_cols, groups, version_stats, service_order = _prepare_summary(result_dir)
+    loaded_distributions = _load_distributions(result_dir)
+    if loaded_distributions is not None:
+        stats_versions = sorted({version for version, _ in loaded_distributions[1]})
+    else:
+        _, stats_versions = _load_service_stats(result_dir)
 
     available_box_versions = [v for v in version_cols if v in stats_versions]
     dropdown_versions = available_box_versions if available_box_versions else version_cols
 
-    dataset_warnings, dataset_error = _validate_dataset_requirements(melted)
+    dataset_warnings, dataset_error = _validate_dataset_requirements(groups)
     bar_alerts: List[str] = list(dataset_warnings)
     if dataset_error:
         bar_alerts.append(dataset_error)
 
-    compare_version_a = query_params.get("compareA")
-    compare_version_b = query_params.get("compareB")
-    compare_filter = query_params.get("filter", "all")
-    if compare_filter not in {"positive", "negative"}:
-        compare_filter = "all"
-    if compare_version_a not in version_cols:
-        compare_version_a = version_cols[0] if version_cols else ""
-    if compare_version_b not in version_cols:
-        compare_version_b = version_cols[1] if len(version_cols) > 1 else compare_version_a
-
-    selected_version = query_params.get("version")
-    if not selected_version or selected_version not in dropdown_versions:
-        selected_version = dropdown_versions[0] if dropdown_versions else ""
-
     metrics = ["Average", "Max", "Min", "Median"]
-    version_stats_df = pd.DataFrame(
-        {
-            "Average": df[version_cols].mean(skipna=True),
-            "Max": df[version_cols].max(skipna=True),
-            "Min": df[version_cols].min(skipna=True),
-            "Median": df[version_cols].median(skipna=True),
-        }
+    version_stats_df = version_stats.rename(
+        columns={"mean": "Average", "max": "Max", "min": "Min", "median": "Median"}
     )
-    version_stats_df = version_stats_df[metrics].round(2)
-
-    version_stats_rows: List[Dict[str, object]] = []
-    for metric in metrics:
-        metric_values: Dict[str, float | None] = {}
-        for version in version_cols:
-            if version in version_stats_df.index:
-                value = version_stats_df.at[version, metric]
-                metric_values[version] = float(value) if pd.notna(value) else None
-            else:
-                metric_values[version] = None
-        version_stats_rows.append({"metric": metric, "values": metric_values})
+    version_stats_df = version_stats_df.reindex(version_cols)[metrics].astype(float).round(2)
 
-    box_figures: Dict[str, Dict[str, object]] = {}
-    for ver in dropdown_versions:
-        fig = _build_box_from_stats(stats_df, ver, service_order)
-        box_figures[ver] = json.loads(fig.to_json()) if fig else {"data": [], "layout": {}}
+    # Missing stats stay NaN; the JSON responses encode them as null
+    version_stats_rows: List[Dict[str, object]] = [
+        {"metric": metric, "values": version_stats_df[metric].to_dict()} for metric in metrics
+    ]
 
-    service_avg_multi = (
-        melted.groupby(["service", "version"])["loading_time"].mean().reset_index()
+    service_avg_multi = groups[["service", "version", "mean"]].rename(
+        columns={"mean": "loading_time"}
     )
     if service_order:
         service_avg_multi["service"] = pd.Categorical(
@@ -1266,43 +1350,6 @@ def _build_dashboard_state(active_view: str, query_params: Dict[str, str]) -> Di
             "service", key=lambda col: col.astype(str).str.casefold()
         )
 
-    wide = pd.DataFrame()
-    if not service_avg_multi.empty:
-        wide = service_avg_multi.pivot(index="service", columns="version", values="loading_time")
-        if service_order:
-            wide = wide.reindex(service_order)
-        wide = wide.dropna(how="all")
-
-    line_fig_payload: Dict[str, object] = {"data": [], "layout": {}}
-    bar_fig_payload: Dict[str, object] = {"data": [], "layout": {}}
-
-    if not wide.empty:
-        fig_line = go.Figure()
-        for version in version_cols:
-            if version in wide.columns and not wide[version].dropna().empty:
-                fig_line.add_trace(
-                    go.Scatter(
-                        x=wide.index.tolist(),
-                        y=wide[version].tolist(),
-                        mode="lines+markers",
-                        name=version,
-                    )
-                )
-        if fig_line.data:
-            fig_line.update_layout(
-                title="Average Loading Time per Service (by Version)",
-                xaxis_title="Service",
-                yaxis_title="Average Loading Time (ms)",
-                margin=dict(l=30, r=20, t=60, b=80),
-                legend_title="Version",
-            )
-            line_fig_payload = json.loads(fig_line.to_json())
-
-        if not dataset_error:
-            fig_bar = _build_bar_figure_from_wide(wide, version_cols)
-            if fig_bar.data:
-                bar_fig_payload = json.loads(fig_bar.to_json())
-
     compare_data: Dict[str, Dict[str, float]] = {}
     compare_services: List[str] = []
     if not service_avg_multi.empty:
@@ -1314,64 +1361,303 @@ def _build_dashboard_state(active_view: str, query_params: Dict[str, str]) -> Di
         compare_services = [
             svc for svc in pivot.index.tolist() if isinstance(svc, str)
         ]
-        for svc in compare_services:
-            row = pivot.loc[svc]
-            svc_values: Dict[str, float] = {}
-            for ver in version_cols:
-                val = row.get(ver)
-                if pd.notna(val):
-                    try:
-                        svc_values[ver] = float(val)
-                    except Exception:
-                        continue
+        means = pivot.reindex(index=compare_services, columns=version_cols).to_numpy(dtype=float)
+        for svc, row, present in zip(
+            compare_services, means.tolist(), (~np.isnan(means)).tolist()
+        ):
+            svc_values = {ver: val for ver, val, ok in zip(version_cols, row, present) if ok}
             if svc_values:
                 compare_data[svc] = svc_values
 
-    state: Dict[str, object] = {
-        "activeView": view_mode,
-        "views": ["analytics", "reports", "compare", "api"],
-        "datasetOptions": dataset_options,
-        "selectedDataset": selected_dataset,
+    return {
         "datasetWarnings": dataset_warnings,
         "datasetError": dataset_error,
         "barAlerts": bar_alerts,
         "versions": version_cols,
         "boxVersions": dropdown_versions,
-        "selectedVersion": selected_version,
         "versionStats": {
             "metrics": metrics,
             "versions": version_stats_df.index.tolist(),
             "rows": version_stats_rows,
         },
-        "boxFigures": box_figures,
-        "lineFigure": line_fig_payload,
-        "barFigure": bar_fig_payload,
-        "reports": {
+        "compareServices": compare_services,
+        "compareData": compare_data,
+        "serviceOrder": service_order,
+    }
+
+
+def _build_dataset_figures(summary: Dict[str, object]) -> Dict[str, object]:
+    """Line and bar figures of per-service mean loading times by version."""
+    version_cols: List[str] = summary["versions"]
+    # Services with at least one mean, in service order
+    wide = pd.DataFrame.from_dict(summary["compareData"], orient="index")
+
+    line_fig_payload: Dict[str, object] = {"data": [], "layout": {}}
+    bar_fig_payload: Dict[str, object] = {"data": [], "layout": {}}
+
+    if not wide.empty:
+        x_labels = wide.index.tolist()
+        columns = _plotted_versions(wide, version_cols)
+        traces = [
+            {
+                "mode": "lines+markers",
+                "name": version,
+                "type": "scatter",
+                "x": x_labels,
+                "y": values,
+            }
+            for version, values in zip(columns, _json_rows(wide[columns].T))
+        ]
+        if traces:
+            layout = _layout_titles(
+                "Average Loading Time per Service (by Version)",
+                "Service",
+                "Average Loading Time (ms)",
+            )
+            layout["legend"] = {"title": {"text": "Version"}}
+            line_fig_payload = _figure_payload(traces, layout)
+
+        if not summary["datasetError"]:
+            bar_fig_payload = _build_bar_figure_from_wide(wide, version_cols) or bar_fig_payload
+
+    return {"lineFigure": line_fig_payload, "barFigure": bar_fig_payload}
+
+
+def _build_dataset_box(
+    result_dir: Path, summary: Dict[str, object], version: str
+) -> Dict[str, object]:
+    """Box figure of one version, from distributions.npz or service_stats."""
+    loaded_distributions = _load_distributions(result_dir)
+    if loaded_distributions is not None:
+        fig = _build_box_from_distributions(
+            loaded_distributions[1], version, summary["serviceOrder"]
+        )
+    else:
+        stats_df, _ = _load_service_stats(result_dir)
+        fig = _build_box_from_stats(stats_df, version, summary["serviceOrder"])
+    return fig or {"data": [], "layout": {}}
+
+
+def _dataset_report_files(result_dir: Path) -> List[str]:
+    return [p.relative_to(result_dir).as_posix() for p in _list_csv_files_under(result_dir)]
+
+
+def _model_part(
+    result_dir: Path,
+    fingerprint: object,
+    part: str,
+    *args: str,
+    allow_stale: bool = True,
+) -> Tuple[object, str]:
+    """Return (value, cache status) of one memoized part of a dataset's model.
+
+    Parts: "summary", "figures", "reports" and ("box", version). Each is
+    built on first use and kept in _DATASET_MODELS until the folder's files
+    change. Parts derived from the summary never build from a stale one.
+    """
+
+    def build() -> object:
+        if part == "summary":
+            return _build_dataset_summary(result_dir)
+        if part == "reports":
+            return _dataset_report_files(result_dir)
+        summary, _ = _model_part(result_dir, fingerprint, "summary", allow_stale=False)
+        if part == "figures":
+            return _build_dataset_figures(summary)
+        return _build_dataset_box(result_dir, summary, *args)
+
+    return _DATASET_MODELS.get(
+        (str(result_dir.resolve()), part, *args), fingerprint, build, allow_stale=allow_stale
+    )
+
+
+def _combined_status(statuses: List[str]) -> str:
+    """Overall cache status of a response: any miss, else any stale, else hit."""
+    for status in ("miss", "stale", "hit"):
+        if status in statuses:
+            return status
+    return ""
+
+
+# Fields of the dashboard state, in response order. "selectedBoxFigure" is
+# the box figure of "selectedVersion" alone; "boxFigures" has every version.
+DASHBOARD_FIELDS = [
+    "activeView",
+    "views",
+    "datasetOptions",
+    "selectedDataset",
+    "datasetWarnings",
+    "datasetError",
+    "barAlerts",
+    "versions",
+    "boxVersions",
+    "selectedVersion",
+    "versionStats",
+    "boxFigures",
+    "selectedBoxFigure",
+    "lineFigure",
+    "barFigure",
+    "reports",
+    "compare",
+    "serviceOrder",
+    "apiDocsHtml",
+    "endpoints",
+]
+# Fields served by the per-view endpoints
+OVERVIEW_FIELDS = [
+    "selectedDataset",
+    "datasetWarnings",
+    "datasetError",
+    "barAlerts",
+    "versions",
+    "boxVersions",
+    "selectedVersion",
+    "versionStats",
+    "selectedBoxFigure",
+    "lineFigure",
+    "barFigure",
+    "serviceOrder",
+]
+BOX_FIELDS = ["selectedDataset", "selectedVersion", "selectedBoxFigure"]
+COMPARE_FIELDS = ["selectedDataset", "versions", "compare"]
+REPORTS_FIELDS = ["selectedDataset", "reports"]
+
+
+def _build_dashboard_state(
+    active_view: str, query_params: Dict[str, str], fields: List[str] | None = None
+) -> Tuple[Dict[str, object], str]:
+    """Return (dashboard state, dataset model cache status) for one request.
+
+    ``fields`` limits the state to those DASHBOARD_FIELDS (default: all but
+    selectedBoxFigure); only the model parts they need are built or read
+    from the cache.
+    Raises ValueError for an unknown field.
+    """
+    unknown = sorted(set(fields or ()) - set(DASHBOARD_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown dashboard fields: {', '.join(unknown)}")
+    if fields is None:
+        # The full state already has every box figure
+        fields = [field for field in DASHBOARD_FIELDS if field != "selectedBoxFigure"]
+    wanted = [field for field in DASHBOARD_FIELDS if field in fields]
+
+    view_mode = active_view if active_view in {"analytics", "reports", "compare", "api"} else "analytics"
+    dataset_param = query_params.get("dataset")
+    dataset_options = _available_datasets()
+    active_dataset = dataset_param or DEFAULT_DATASET_NAME
+    if not active_dataset and dataset_options:
+        active_dataset = dataset_options[0]
+
+    active_result_dir = _result_dir_for_dataset(active_dataset)
+
+    if active_dataset and active_dataset not in dataset_options:
+        dataset_options = sorted(set(dataset_options + [active_dataset]))
+
+    selected_dataset = active_dataset or ""
+
+    dataset_label = selected_dataset or "Current Dataset"
+
+    fingerprint = modelcache.tree_fingerprint(active_result_dir)
+    statuses: List[str] = []
+
+    def part(name: str, *args: str) -> object:
+        value, status = _model_part(active_result_dir, fingerprint, name, *args)
+        statuses.append(status)
+        return value
+
+    def selected_version() -> str:
+        dropdown_versions = part("summary")["boxVersions"]
+        version = query_params.get("version")
+        if not version or version not in dropdown_versions:
+            version = dropdown_versions[0] if dropdown_versions else ""
+        return version
+
+    def box_figure(version: str) -> Dict[str, object]:
+        if version not in part("summary")["boxVersions"]:
+            return {"data": [], "layout": {}}
+        return part("box", version)
+
+    def reports() -> Dict[str, object]:
+        report_files: List[str] = part("reports")
+        selected_report_param = query_params.get("report")
+        initial_report = (
+            selected_report_param
+            if selected_report_param and selected_report_param in report_files
+            else (report_files[0] if report_files else "")
+        )
+        return {
             "files": report_files,
-            "groups": report_groups,
+            # Group all CSVs under the selected dataset name as the single group label.
+            "groups": {dataset_label: sorted(report_files)},
             "initial": initial_report,
-        },
-        "compare": {
-            "services": compare_services,
-            "data": compare_data,
+        }
+
+    def compare() -> Dict[str, object]:
+        summary = part("summary")
+        version_cols: List[str] = summary["versions"]
+        compare_version_a = query_params.get("compareA")
+        compare_version_b = query_params.get("compareB")
+        compare_filter = query_params.get("filter", "all")
+        if compare_filter not in {"positive", "negative"}:
+            compare_filter = "all"
+        if compare_version_a not in version_cols:
+            compare_version_a = version_cols[0] if version_cols else ""
+        if compare_version_b not in version_cols:
+            compare_version_b = version_cols[1] if len(version_cols) > 1 else compare_version_a
+        return {
+            "services": summary["compareServices"],
+            "data": summary["compareData"],
             "defaults": {
                 "versionA": compare_version_a,
                 "versionB": compare_version_b,
                 "filter": compare_filter,
             },
+        }
+
+    producers = {
+        "activeView": lambda: view_mode,
+        "views": lambda: ["analytics", "reports", "compare", "api"],
+        "datasetOptions": lambda: dataset_options,
+        "selectedDataset": lambda: selected_dataset,
+        "datasetWarnings": lambda: part("summary")["datasetWarnings"],
+        "datasetError": lambda: part("summary")["datasetError"],
+        "barAlerts": lambda: part("summary")["barAlerts"],
+        "versions": lambda: part("summary")["versions"],
+        "boxVersions": lambda: part("summary")["boxVersions"],
+        "selectedVersion": selected_version,
+        "versionStats": lambda: part("summary")["versionStats"],
+        "boxFigures": lambda: {
+            version: box_figure(version) for version in part("summary")["boxVersions"]
         },
-        "serviceOrder": service_order,
-        "apiDocsHtml": _load_backend_api_html(),
-        "endpoints": {
-            "csv": url_for("api_csv"),
-            "download": url_for("download_csv"),
-            "dashboard": url_for("api_dashboard"),
-            "analyticsBar": url_for("analytics_bardata"),
-            "importDataset": url_for("import_dataset"),
-            "deleteDataset": url_for("delete_dataset"),
-        },
+        "selectedBoxFigure": lambda: box_figure(selected_version()),
+        "lineFigure": lambda: part("figures")["lineFigure"],
+        "barFigure": lambda: part("figures")["barFigure"],
+        "reports": reports,
+        "compare": compare,
+        "serviceOrder": lambda: part("summary")["serviceOrder"],
+        "apiDocsHtml": _load_backend_api_html,
+        "endpoints": _dashboard_endpoints,
+    }
+    state: Dict[str, object] = {field: producers[field]() for field in wanted}
+    return state, _combined_status(statuses)
+
+
+def _dashboard_endpoints() -> Dict[str, str]:
+    return {
+        "csv": url_for("api_csv"),
+        "download": url_for("download_csv"),
+        "dashboard": url_for("api_dashboard"),
+        "dashboardOverview": url_for("api_dashboard_overview"),
+        "dashboardBox": url_for("api_dashboard_box"),
+        "dashboardCompare": url_for("api_dashboard_compare"),
+        "dashboardReports": url_for("api_dashboard_reports"),
+        "analyticsBar": url_for("analytics_bardata"),
+        "quantiles": url_for("api_quantiles"),
+        "distributions": url_for("api_distributions"),
+        "cache": url_for("api_cache"),
+        "importDataset": url_for("import_dataset"),
+        "deleteDataset": url_for("delete_dataset"),
     }
-    return state
 
 
 @app.route("/analytics")
@@ -1391,46 +1677,112 @@ def analytics_bardata():
 
     try:
         result_dir = _result_dir_for_dataset(dataset)
-        df, version_cols, melted, service_order = _prepare_summary(result_dir)
+        fingerprint = modelcache.tree_fingerprint(result_dir)
+        summary, summary_status = _model_part(result_dir, fingerprint, "summary")
+        figures, figures_status = _model_part(result_dir, fingerprint, "figures")
     except (ValueError, FileNotFoundError) as exc:
         abort(404, str(exc))
 
-    dataset_warnings, dataset_error = _validate_dataset_requirements(melted)
-    response_payload = {
-        "dataset": dataset or "",
-        "warnings": dataset_warnings,
-        "error": dataset_error,
-        "figure": {"data": [], "layout": {}},
-    }
-    if dataset_error:
-        return jsonify(response_payload)
-
-    service_avg_multi = (
-        melted.groupby(["service", "version"])["loading_time"].mean().reset_index()
+    response = _json_response(
+        {
+            "dataset": dataset or "",
+            "warnings": summary["datasetWarnings"],
+            "error": summary["datasetError"],
+            "figure": figures["barFigure"],
+        }
+    )
+    response.headers["X-Model-Cache"] = _combined_status([summary_status, figures_status])
+    return response
+
+
+@app.get("/api/quantiles")
+def api_quantiles():
+    """Percentiles of any datasets/versions/services, merged from sketches."""
+    datasets = request.args.getlist("dataset")
+    if not datasets:
+        dataset_options = _available_datasets()
+        default = DEFAULT_DATASET_NAME or (dataset_options[0] if dataset_options else "")
+        datasets = [default]
+    versions = set(request.args.getlist("version"))
+    services = set(request.args.getlist("service"))
+    try:
+        quantiles = [float(q) for q in request.args.getlist("q")] or [50.0, 90.0, 95.0, 99.0]
+    except ValueError:
+        abort(400, "q must be a number between 0 and 100")
+    if any(not 0 <= q <= 100 for q in quantiles):
+        abort(400, "q must be a number between 0 and 100")
+
+    selected: List[sketch.QuantileSketch] = []
+    for dataset in datasets:
+        try:
+            result_dir = _result_dir_for_dataset(dataset)
+        except (ValueError, FileNotFoundError) as exc:
+            abort(404, str(exc))
+        sketches_path = result_dir / sketch.SKETCHES_FILENAME
+        if not sketches_path.exists():
+            abort(404, f"{sketch.SKETCHES_FILENAME} not found. Generate it with spm.py generate")
+        for (version, service), item in sketch.load_sketches(sketches_path).items():
+            if versions and version not in versions:
+                continue
+            if services and service not in services:
+                continue
+            if not services and service in EXCLUDED_SERVICES:
+                continue
+            selected.append(item)
+
+    merged = sketch.merge_sketches(selected)
+    return jsonify(
+        {
+            "datasets": datasets,
+            "versions": sorted(versions),
+            "services": sorted(services),
+            "sketches": len(selected),
+            "relativeAccuracy": merged.relative_accuracy if merged else None,
+            "count": merged.count if merged else 0,
+            "min": merged.min if merged and merged.count else None,
+            "max": merged.max if merged and merged.count else None,
+            "mean": merged.total / merged.count if merged and merged.count else None,
+            "quantiles": {f"{q:g}": merged.quantile(q) if merged else None for q in quantiles},
+        }
     )
-    if service_order:
-        service_avg_multi["service"] = pd.Categorical(
-            service_avg_multi["service"], categories=service_order, ordered=True
-        )
-        service_avg_multi = service_avg_multi.sort_values("service")
-    else:
-        service_avg_multi = service_avg_multi.sort_values(
-            "service", key=lambda col: col.astype(str).str.casefold()
-        )
-    if service_avg_multi.empty:
-        return jsonify(response_payload)
 
-    wide = service_avg_multi.pivot(index="service", columns="version", values="loading_time")
-    if service_order:
-        wide = wide.reindex(service_order)
-    wide = wide.dropna(how="all")
 
-    if wide.empty:
-        return jsonify(response_payload)
+@app.get("/api/distributions")
+def api_distributions():
+    """Precomputed box statistics and histograms per version and service."""
+    dataset_param = request.args.get("dataset")
+    dataset_options = _available_datasets()
+    dataset = dataset_param or DEFAULT_DATASET_NAME
+    if not dataset and dataset_options:
+        dataset = dataset_options[0]
+    versions = set(request.args.getlist("version"))
+    services = set(request.args.getlist("service"))
+
+    try:
+        result_dir = _result_dir_for_dataset(dataset)
+    except (ValueError, FileNotFoundError) as exc:
+        abort(404, str(exc))
+    loaded = _load_distributions(result_dir)
+    if loaded is None:
+        abort(
+            404,
+            f"{distributions.DISTRIBUTIONS_FILENAME} not found. Generate it with spm.py generate",
+        )
+    edges, summaries = loaded
 
-    fig_bar = _build_bar_figure_from_wide(wide, version_cols)
-    response_payload["figure"] = json.loads(fig_bar.to_json())
-    return jsonify(response_payload)
+    rows: List[Dict[str, object]] = []
+    for (version, service), summary in summaries.items():
+        if versions and version not in versions:
+            continue
+        if services and service not in services:
+            continue
+        if not services and service in EXCLUDED_SERVICES:
+            continue
+        row: Dict[str, object] = {"version": version, "service": service}
+        row.update({column: summary[column] for column in distributions.BOX_COLUMNS})
+        row["histogram"] = summary["histogram"].tolist()
+        rows.append(row)
+    return jsonify({"dataset": dataset or "", "edges": edges, "summaries": rows})
 
 
 def main(argv: List[str] | None = None) -> int:
@@ -19,6 +19,29 @@
     { id: "api", label: "API", icon: "\u{1F4D6}" },
   ];
 
+  // Dashboard state fields each view needs (requested with ?fields=)
+  const COMMON_FIELDS = ["activeView", "datasetOptions", "selectedDataset"];
+  const VIEW_FIELDS = {
+    analytics: [
+      "datasetWarnings",
+      "datasetError",
+      "barAlerts",
+      "versions",
+      "boxVersions",
+      "selectedVersion",
+      "versionStats",
+      "selectedBoxFigure",
+      "lineFigure",
+      "barFigure",
+    ],
+    reports: ["reports"],
+    compare: ["versions", "compare"],
+    api: [],
+  };
+
+  const hasViewFields = (state, view) =>
+    (VIEW_FIELDS[view] || []).every((field) => field in state);
+
   const MISSING_VALUE = "N/A";
 
   const formatNumber = (value, digits = 1) => {
@@ -370,6 +393,7 @@ const AnalyticsPanel = ({ state, version, onVersionChange }) => {
 
     const endpoints = state.endpoints || initial.endpoints || {};
     const dashboardEndpoint = endpoints.dashboard || "/api/dashboard";
+    const dashboardBoxEndpoint = endpoints.dashboardBox || "/api/dashboard/box";
     const csvEndpoint = endpoints.csv || "/api/csv";
     const downloadEndpoint = endpoints.download || "/download";
     const importEndpoint = endpoints.importDataset || "/api/datasets/import";
@@ -407,16 +431,28 @@ const AnalyticsPanel = ({ state, version, onVersionChange }) => {
 
     const loadState = useCallback(
       async (overrides = {}) => {
+        // merge: add the fields of another view to the current dataset's state;
+        // otherwise the state is replaced (dataset change, import, delete).
+        const merge = Boolean(overrides.merge);
         const params = new URLSearchParams();
         const datasetValue =
           overrides.dataset !== undefined ? overrides.dataset : dataset;
         const viewValue = overrides.view || view;
+        const versionValue = overrides.version || (merge ? version : "");
+        const compareValue = merge ? compare : {};
+        const compareA = overrides.compareA || compareValue.versionA;
+        const compareB = overrides.compareB || compareValue.versionB;
+        const filterValue = overrides.filter || compareValue.filter;
         if (datasetValue) params.set("dataset", datasetValue);
         if (viewValue) params.set("view", viewValue);
-        if (overrides.version) params.set("version", overrides.version);
-        if (overrides.compareA) params.set("compareA", overrides.compareA);
-        if (overrides.compareB) params.set("compareB", overrides.compareB);
-        if (overrides.filter) params.set("filter", overrides.filter);
+        if (versionValue) params.set("version", versionValue);
+        if (compareA) params.set("compareA", compareA);
+        if (compareB) params.set("compareB", compareB);
+        if (filterValue) params.set("filter", filterValue);
+        params.set(
+          "fields",
+          [...COMMON_FIELDS, ...(VIEW_FIELDS[viewValue] || [])].join(",")
+        );
 
         setLoading(true);
         setLoadError("");
@@ -430,44 +466,92 @@ const AnalyticsPanel = ({ state, version, onVersionChange }) => {
             );
           }
           const payload = await response.json();
-          setState(payload);
-          const defaults = payload.compare?.defaults || {};
-          const first = payload.versions?.[0] || "";
-          const second = payload.versions?.[1] || first;
-          const chosenVersion =
-            payload.selectedVersion ||
-            payload.boxVersions?.[0] ||
-            payload.versions?.[0] ||
-            "";
-          setDataset(payload.selectedDataset || "");
-          setView(payload.activeView || viewValue);
-          setVersion(chosenVersion);
-          setCompare({
-            versionA: defaults.versionA || first,
-            versionB: defaults.versionB || second,
-            filter: defaults.filter || "all",
-          });
-          setReport(payload.reports?.initial || "");
-          setReportContent({ headers: [], rows: [], loading: false, error: "" });
-          updateUrl({
+          const boxFigures =
+            payload.selectedBoxFigure && payload.selectedVersion
+              ? { [payload.selectedVersion]: payload.selectedBoxFigure }
+              : {};
+          setState((prev) =>
+            merge
+              ? {
+                  ...prev,
+                  ...payload,
+                  boxFigures: { ...(prev.boxFigures || {}), ...boxFigures },
+                }
+              : { ...payload, boxFigures }
+          );
+          const urlChanges = {
             dataset: payload.selectedDataset || "",
             view: payload.activeView || viewValue,
-            version: chosenVersion || null,
-            compareA: defaults.versionA || null,
-            compareB: defaults.versionB || null,
-            filter:
+          };
+          setDataset(payload.selectedDataset || "");
+          setView(payload.activeView || viewValue);
+          if ("selectedVersion" in payload) {
+            const chosenVersion =
+              payload.selectedVersion ||
+              payload.boxVersions?.[0] ||
+              payload.versions?.[0] ||
+              "";
+            setVersion(chosenVersion);
+            urlChanges.version = chosenVersion || null;
+          }
+          if ("compare" in payload) {
+            const defaults = payload.compare?.defaults || {};
+            const first = payload.versions?.[0] || "";
+            const second = payload.versions?.[1] || first;
+            setCompare({
+              versionA: defaults.versionA || first,
+              versionB: defaults.versionB || second,
+              filter: defaults.filter || "all",
+            });
+            urlChanges.compareA = defaults.versionA || null;
+            urlChanges.compareB = defaults.versionB || null;
+            urlChanges.filter =
               defaults.filter && defaults.filter !== "all"
                 ? defaults.filter
-                : null,
-            report: payload.reports?.initial || null,
-          });
+                : null;
+          }
+          if ("reports" in payload) {
+            setReport(payload.reports?.initial || "");
+            setReportContent({ headers: [], rows: [], loading: false, error: "" });
+            urlChanges.report = payload.reports?.initial || null;
+          }
+          updateUrl(urlChanges);
         } catch (error) {
           setLoadError(error.message || "Unable to refresh dashboard data.");
         } finally {
           setLoading(false);
         }
       },
-      [dashboardEndpoint, dataset, updateUrl, view]
+      [compare, dashboardEndpoint, dataset, updateUrl, version, view]
+    );
+
+    const loadBoxFigure = useCallback(
+      async (versionValue) => {
+        const params = new URLSearchParams();
+        if (dataset) params.set("dataset", dataset);
+        params.set("version", versionValue);
+        try {
+          const response = await fetch(
+            `${dashboardBoxEndpoint}?${params.toString()}`
+          );
+          if (!response.ok) {
+            throw new Error(
+              `Distribution request failed (status ${response.status}).`
+            );
+          }
+          const payload = await response.json();
+          setState((prev) => ({
+            ...prev,
+            boxFigures: {
+              ...(prev.boxFigures || {}),
+              [payload.selectedVersion]: payload.selectedBoxFigure,
+            },
+          }));
+        } catch (error) {
+          setLoadError(error.message || "Unable to load the distribution chart.");
+        }
+      },
+      [dashboardBoxEndpoint, dataset]
     );
 
     useEffect(() => {
@@ -796,6 +880,9 @@ const AnalyticsPanel = ({ state, version, onVersionChange }) => {
       onVersionChange=${(next) => {
         setVersion(next);
         updateUrl({ version: next || null });
+        if (next && !state.boxFigures?.[next]) {
+          loadBoxFigure(next);
+        }
       }}
     />`;
 
@@ -1274,6 +1361,9 @@ const AnalyticsPanel = ({ state, version, onVersionChange }) => {
             onClick=${() => {
               setView(item.id);
               updateUrl({ view: item.id });
+              if (!hasViewFields(state, item.id)) {
+                loadState({ view: item.id, merge: true });
+              }
             }}
           >
             <span className="text-xl">${item.icon}</span>
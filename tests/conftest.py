@@ -0,0 +1,7 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Allow imports from spm and src.* when pytest runs from any folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from src import blobstore
+
+
+def test_stored_log_stays_writable(tmp_path: Path) -> None:
+    store = blobstore.BlobStore(tmp_path / "store")
+    log = tmp_path / "data" / "run.log"
+    log.parent.mkdir()
+    log.write_bytes(b"10:00:00.000 A - elapsed: 5 ms\n")
+
+    digest, outcome = store.add(log)
+
+    assert outcome == "stored"
+    assert os.access(log, os.W_OK)
+    with log.open("ab") as fh:
+        fh.write(b"10:00:01.000 A - elapsed: 6 ms\n")
+    st = log.stat()
+    # The grown file no longer matches its reference, so its digest is not trusted
+    blobstore.save_refs(log.parent, {"run.log": [digest, st.st_size - 1, st.st_mtime_ns]})
+    assert blobstore.known_digests(log.parent, [(log, st.st_size, st.st_mtime_ns)]) == {}
+
+
+def test_changed_blob_is_not_linked_again(tmp_path: Path) -> None:
+    store = blobstore.BlobStore(tmp_path / "store")
+    first = tmp_path / "a.log"
+    second = tmp_path / "b.log"
+    content = b"10:00:00.000 A - elapsed: 5 ms\n"
+    first.write_bytes(content)
+    second.write_bytes(content)
+
+    digest, _ = store.add(first)
+    with first.open("ab") as fh:  # grows the blob through its hardlink
+        fh.write(b"10:00:01.000 A - elapsed: 6 ms\n")
+
+    assert store.add(second) == (digest, "stored")
+    assert second.read_bytes() == content
+    assert store.blob_path(digest).read_bytes() == content
+    assert os.path.samefile(second, store.blob_path(digest))
+    assert not os.path.samefile(first, store.blob_path(digest))
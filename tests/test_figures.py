@@ -0,0 +1,224 @@
+"""Golden test: the dashboard's figure dicts match plotly's go.Figure(...).to_json().
+
+The reference builders below are the go.Figure implementations the
+dashboard used before it assembled figure dicts directly.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from array import array
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from spm import _combine_summaries
+from src import distributions, fastjson, report, webapp
+
+VERSIONS = ["InQuire_1.0.0", "InQuire_1.0.1", "InQuire_1.0.2"]
+SERVICES = ["AUTO TEST", "Service A", "Service B", "service c", "Outlook"]
+LAYOUT_MARGIN = dict(l=30, r=20, t=60, b=80)
+
+
+@pytest.fixture(scope="module")
+def result_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A generated result folder: summary.csv, stats CSVs and distributions.npz.
+
+    "Service B" has no samples in the second version, so the line and bar
+    figures have gaps.
+    """
+    rng = random.Random(7)
+    samples: Dict[str, Dict[str, array]] = {}
+    for idx, version in enumerate(VERSIONS):
+        samples[version] = {
+            service: array("q", (rng.randint(10, 5000) for _ in range(rng.randint(5, 40))))
+            for service in SERVICES
+            if not (service == "Service B" and idx == 1)
+        }
+    root = tmp_path_factory.mktemp("result") / "data"
+    root.mkdir()
+    _combine_summaries(samples, root / "summary.csv")
+    report.main(samples, root, VERSIONS)
+    distributions.write_distributions(
+        samples, root / distributions.DISTRIBUTIONS_FILENAME, VERSIONS
+    )
+    return root
+
+
+def _parsed(payload: Dict[str, object]) -> Dict[str, object]:
+    """The figure as the API serves it, parsed back."""
+    return json.loads(fastjson.dumps(payload))
+
+
+def _plotly(fig: go.Figure) -> Dict[str, object]:
+    return json.loads(fig.to_json())
+
+
+def _reference_line(wide: pd.DataFrame, version_cols: List[str]) -> go.Figure:
+    fig = go.Figure()
+    for version in version_cols:
+        if version in wide.columns and not wide[version].dropna().empty:
+            fig.add_trace(
+                go.Scatter(
+                    x=wide.index.tolist(),
+                    y=wide[version].tolist(),
+                    mode="lines+markers",
+                    name=version,
+                )
+            )
+    fig.update_layout(
+        title="Average Loading Time per Service (by Version)",
+        xaxis_title="Service",
+        yaxis_title="Average Loading Time (ms)",
+        margin=LAYOUT_MARGIN,
+        legend_title="Version",
+    )
+    return fig
+
+
+def _reference_bar(wide: pd.DataFrame, version_cols: List[str]) -> go.Figure:
+    fig = go.Figure()
+    y_max = 0.0
+    for version in version_cols:
+        if version not in wide.columns or wide[version].isna().all():
+            continue
+        values = wide[version].tolist()
+        fig.add_trace(
+            go.Bar(
+                x=wide.index.tolist(),
+                y=values,
+                name=version,
+                text=[f"{v:.0f}" if pd.notna(v) else "" for v in values],
+                textposition="outside",
+            )
+        )
+        y_max = max(y_max, max([v for v in values if pd.notna(v)] or [0]))
+    fig.update_yaxes(range=[0, y_max + (y_max * 0.1 if y_max else 0)])
+    fig.update_layout(
+        title="Average Loading Time per Service (Grouped Bar)",
+        xaxis_title="Service",
+        yaxis_title="Average Loading Time (ms)",
+        margin=LAYOUT_MARGIN,
+        barmode="group",
+        legend_title="Version",
+    )
+    return fig
+
+
+def _reference_box_layout(fig: go.Figure, version: str) -> go.Figure:
+    fig.update_layout(
+        title=f"Service Loading Time Distribution ({version})",
+        yaxis_title="Loading Time (ms)",
+        xaxis_title="Service",
+        margin=LAYOUT_MARGIN,
+        showlegend=False,
+    )
+    return fig
+
+
+def _reference_box_from_stats(
+    stats_df: pd.DataFrame, version: str, service_order: List[str]
+) -> go.Figure:
+    required_cols = [f"{version}_" + metric for metric in ("min", "median", "avg", "max")]
+    fig = go.Figure()
+    for service in service_order:
+        if service not in stats_df.index:
+            continue
+        row = stats_df.loc[service]
+        stats_tuple = [row.get(col) for col in required_cols]
+        cleaned = [float(v) for v in stats_tuple if pd.notna(v)]
+        if not cleaned:
+            continue
+        fig.add_trace(
+            go.Box(
+                y=cleaned,
+                name=service,
+                boxpoints=False,
+                boxmean=True,
+                customdata=[stats_tuple] * len(cleaned),
+                hovertemplate=(
+                    "Service: %{x}<br>"
+                    "Min: %{customdata[0]:.0f} ms<br>"
+                    "Median: %{customdata[1]:.0f} ms<br>"
+                    "Average: %{customdata[2]:.0f} ms<br>"
+                    "Max: %{customdata[3]:.0f} ms"
+                    "<extra></extra>"
+                ),
+            )
+        )
+    return _reference_box_layout(fig, version)
+
+
+def _reference_box_from_distributions(
+    summaries: Dict[Tuple[str, str], Dict[str, object]],
+    version: str,
+    service_order: List[str],
+) -> go.Figure:
+    fig = go.Figure()
+    for service in service_order:
+        summary = summaries.get((version, service))
+        if summary is None:
+            continue
+        fig.add_trace(
+            go.Box(
+                name=service,
+                x=[service],
+                q1=[summary["q1"]],
+                median=[summary["median"]],
+                q3=[summary["q3"]],
+                lowerfence=[summary["lowerfence"]],
+                upperfence=[summary["upperfence"]],
+                mean=[summary["mean"]],
+                orientation="v",
+                boxpoints=False,
+                hovertext=[
+                    f"{summary['count']} samples, min {summary['min']:.0f} ms, "
+                    f"max {summary['max']:.0f} ms<br>"
+                    f"Outliers: {summary['outliers_low']} low, {summary['outliers_high']} high"
+                ],
+            )
+        )
+    return _reference_box_layout(fig, version)
+
+
+def test_line_and_bar_figures_match_plotly(result_dir: Path) -> None:
+    summary = webapp._build_dataset_summary(result_dir)
+    figures = webapp._build_dataset_figures(summary)
+    wide = pd.DataFrame.from_dict(summary["compareData"], orient="index")
+    assert wide.isna().any().any()
+
+    assert _parsed(figures["lineFigure"]) == _plotly(_reference_line(wide, summary["versions"]))
+    assert _parsed(figures["barFigure"]) == _plotly(_reference_bar(wide, summary["versions"]))
+
+
+@pytest.mark.parametrize("version", VERSIONS)
+def test_box_from_distributions_matches_plotly(result_dir: Path, version: str) -> None:
+    service_order = webapp._build_dataset_summary(result_dir)["serviceOrder"]
+    _, summaries = webapp._load_distributions(result_dir)
+
+    built = webapp._build_box_from_distributions(summaries, version, service_order)
+    reference = _reference_box_from_distributions(summaries, version, service_order)
+    assert _parsed(built) == _plotly(reference)
+
+
+@pytest.mark.parametrize("version", VERSIONS)
+def test_box_from_stats_matches_plotly(result_dir: Path, version: str) -> None:
+    service_order = webapp._build_dataset_summary(result_dir)["serviceOrder"]
+    stats_df, _ = webapp._load_service_stats(result_dir)
+
+    built = webapp._build_box_from_stats(stats_df, version, service_order)
+    reference = _reference_box_from_stats(stats_df, version, service_order)
+    assert _parsed(built) == _plotly(reference)
+
+
+def test_empty_figures(result_dir: Path) -> None:
+    summary = dict(webapp._build_dataset_summary(result_dir), compareData={})
+    figures = webapp._build_dataset_figures(summary)
+    assert figures == {
+        "lineFigure": {"data": [], "layout": {}},
+        "barFigure": {"data": [], "layout": {}},
+    }
@@ -0,0 +1,54 @@
+"""A virtual merge reads the same logs a physical merge would copy."""
+
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from spm import merge_data_folders, merge_virtual
+from src import discover
+
+
+def _write_logs(root: Path, version: str, logs: Dict[str, str]) -> None:
+    log_dir = root / version / discover.LOG_DIR_NAME
+    log_dir.mkdir(parents=True, exist_ok=True)
+    for name, text in logs.items():
+        (log_dir / name).write_text(text, encoding="utf-8")
+
+
+def _read_through_index(data_root: Path) -> Dict[str, Dict[str, str]]:
+    """Version -> {log file name: content} as generate would read it."""
+    index, _ = discover.build_index(data_root)
+    contents: Dict[str, Dict[str, str]] = {}
+    for version, record in index["versions"].items():
+        _, _, files, _ = discover.select_inputs(data_root, record)
+        contents[version] = {fp.name: fp.read_text(encoding="utf-8") for fp in files}
+    return contents
+
+
+@pytest.mark.parametrize("overwrite", [False, True])
+def test_virtual_merge_matches_physical_merge(tmp_path: Path, overwrite: bool) -> None:
+    dest = tmp_path / "data"
+    first = tmp_path / "data1"
+    second = tmp_path / "data2"
+    for root, layout in (
+        (dest, {"InQuire_1.0.0": "ab"}),
+        (first, {"InQuire_1.0.0": "ac", "InQuire_1.0.1": "a"}),
+        (second, {"InQuire_1.0.0": "ac", "InQuire_1.0.1": "ad"}),
+    ):
+        for version, letters in layout.items():
+            logs = {f"{c}_loading.log": f"{root.name} {c}\n" for c in letters}
+            _write_logs(root, version, logs)
+
+    physical = tmp_path / "physical"
+    shutil.copytree(dest, physical)
+    merge_data_folders([first, second], physical, overwrite=overwrite)
+    merge_virtual([first, second], dest, overwrite=overwrite)
+
+    merged = _read_through_index(dest)
+    assert merged == _read_through_index(physical)
+    winner = second if overwrite else dest
+    assert merged["InQuire_1.0.0"]["a_loading.log"] == f"{winner.name} a\n"
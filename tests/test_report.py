@@ -0,0 +1,45 @@
+"""group_stats matches the plain-Python definitions of its statistics."""
+
+from __future__ import annotations
+
+import random
+import statistics
+from typing import List
+
+import pytest
+
+from src import report
+
+
+def _percentile(values: List[int], q: float) -> float:
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_group_stats_matches_definitions(seed: int) -> None:
+    rng = random.Random(seed)
+    groups = [[rng.randint(0, 10_000) for _ in range(rng.randint(0, 50))] for _ in range(40)]
+    groups += [[], [7], [3, 4]]
+    values = [value for group in groups for value in group]
+    offsets = [0]
+    for group in groups:
+        offsets.append(offsets[-1] + len(group))
+
+    stats = report.group_stats(values, offsets)
+
+    for i, group in enumerate(groups):
+        assert stats["count"][i] == len(group)
+        assert stats["total"][i] == sum(group)
+        if not group:
+            assert all(stats[metric][i] == 0 for metric in report.STAT_METRICS)
+            continue
+        assert stats["avg"][i] == pytest.approx(statistics.mean(group))
+        assert stats["median"][i] == statistics.median(group)
+        assert stats["min"][i] == min(group)
+        assert stats["max"][i] == max(group)
+        for q in report.PERCENTILES:
+            assert stats[f"p{q}"][i] == pytest.approx(_percentile(group, q))